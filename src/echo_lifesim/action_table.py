@@ -0,0 +1,52 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Sequence, Tuple
+import numpy as np
+import numpy.typing as npt
+from .models import NEED_KEYS, NeedState
+
+NEED_GAP_THRESHOLD = 55  # needs below this pull actions that raise them
+
+def need_vector(needs: NeedState) -> np.ndarray:
+    return np.array(needs.vector(), dtype=np.float64)
+
+class ActionTable:
+    """Action catalog compiled to an (actions x NEED_KEYS) effect matrix + weight vector.
+
+    Score per action = weight + sum over needs of (55 - value) * delta / 10 for every
+    positive delta on a need currently below 55, i.e. the per-entry loop the engine used
+    to run, as one matrix-vector product.
+    """
+    def __init__(self, actions: Sequence[Dict[str, Any]]):
+        self.labels: List[str] = [a.get("label", "") for a in actions]
+        self.durations: List[str] = [a.get("duration", "?") for a in actions]
+        self.effects = np.zeros((len(actions), len(NEED_KEYS)), dtype=np.float64)
+        for row, a in enumerate(actions):
+            for need, delta in a.get("need_effects", {}).items():
+                if need in NEED_KEYS:
+                    self.effects[row, NEED_KEYS.index(need)] = delta
+        self.weights = np.array([float(a.get("weight", 1.0)) for a in actions], dtype=np.float64)
+        self._gain = np.clip(self.effects, 0, None) / 10.0
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def scores(self, needs: np.ndarray) -> npt.NDArray[np.float64]:
+        gap = np.clip(NEED_GAP_THRESHOLD - needs, 0, None)
+        return np.asarray(self.weights + self._gain @ gap, dtype=np.float64)
+
+    def top(self, needs: np.ndarray, n: int = 12) -> List[Tuple[str, str]]:
+        """Best n (label, duration) pairs, best first; ties keep catalog order."""
+        return [(self.labels[i], self.durations[i]) for i in self.top_indices(self.scores(needs), n)]
+
+    @staticmethod
+    def top_indices(scores: np.ndarray, n: int) -> List[int]:
+        if n <= 0 or not len(scores):
+            return []
+        if n < len(scores):
+            kth = np.partition(scores, len(scores) - n)[len(scores) - n]
+            above = np.flatnonzero(scores > kth)
+            ties = np.flatnonzero(scores == kth)[: n - len(above)]
+            sel = np.concatenate([above, ties])
+        else:
+            sel = np.arange(len(scores))
+        return [int(i) for i in sel[np.lexsort((sel, -scores[sel]))]]
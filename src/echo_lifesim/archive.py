@@ -0,0 +1,221 @@
+from __future__ import annotations
+from array import array
+from collections import Counter
+from hashlib import blake2b
+from pathlib import Path
+import mmap
+import os
+import numpy as np
+import orjson
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .indexing import tokenize
+
+Record = Dict[str, Any]
+Segment = Tuple[int, int, int]  # (byte offset in .tok, postings, records covered up to its end)
+
+MAX_SEGMENT = 1 << 20  # postings; bounds the memory a merge needs
+_BACKFILL_CHUNK = 4096  # records per segment when tokenizing an existing archive
+_SEGMENT = np.dtype([("offset", "<u8"), ("count", "<u8"), ("records", "<u8")])
+
+def _token_hash(tok: str) -> int:
+    return int.from_bytes(blake2b(tok.encode("utf-8"), digest_size=8).digest(), "little")
+
+def _segment_bytes(count: int) -> int:
+    # uint64 token hashes, then uint32 records padded to 8 bytes (keeps every block aligned)
+    return 8 * count + (4 * count + 7) // 8 * 8
+
+class EpisodeArchive:
+    """Append-only cold tier for evicted episodes.
+
+    ``<path>`` holds one orjson record per line, ``<path>.idx`` the uint64 start offset of
+    every record. ``<path>.tok`` holds the token postings as segments sorted by token hash
+    (one per appended batch, small neighbours merged like a log-structured tree) and
+    ``<path>.seg`` the segment table. Reads and searches go through read-only memory
+    maps: only the offsets stay resident, and a search binary-searches each segment, so
+    its cost follows the number of matches rather than the archive size.
+    """
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.idx_path = Path(str(self.path) + ".idx")
+        self.tok_path = Path(str(self.path) + ".tok")
+        self.seg_path = Path(str(self.path) + ".seg")
+        self._offsets = array("Q")
+        if self.idx_path.exists():
+            self._offsets.frombytes(self.idx_path.read_bytes())
+        self._end = self.path.stat().st_size if self.path.exists() else 0
+        # drop index entries pointing past the data file (interrupted append)
+        while self._offsets and self._offsets[-1] >= self._end:
+            self._offsets.pop()
+        self._mm: Optional[mmap.mmap] = None
+        self._tok_mm: Optional[mmap.mmap] = None
+        self._segments = self._load_segments()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    # --- postings ------------------------------------------------------
+    def _load_segments(self) -> List[Segment]:
+        segs: List[Segment] = []
+        if self.seg_path.exists():
+            segs = [(int(o), int(c), int(r)) for o, c, r in np.fromfile(self.seg_path, dtype=_SEGMENT).tolist()]
+        # postings of records the index never committed (interrupted append) are dropped
+        while segs and segs[-1][2] > len(self._offsets):
+            segs.pop()
+        size = self.tok_path.stat().st_size if self.tok_path.exists() else 0
+        if segs and self._tok_end(segs) > size:
+            segs = []  # postings file lost or cut short: rebuilt from the records
+        if size != self._tok_end(segs):
+            # unreferenced tail: torn write, interrupted merge or an unsorted older file
+            with self.tok_path.open("ab") as f:
+                f.truncate(self._tok_end(segs))
+        if self.seg_path.exists() or segs:
+            self._save_segments(segs)
+        return segs
+
+    @staticmethod
+    def _tok_end(segs: List[Segment]) -> int:
+        return segs[-1][0] + _segment_bytes(segs[-1][1]) if segs else 0
+
+    @property
+    def _tok_records(self) -> int:
+        return self._segments[-1][2] if self._segments else 0
+
+    def _save_segments(self, segs: List[Segment]) -> None:
+        self._segments = segs
+        tmp = Path(str(self.seg_path) + ".tmp")
+        tmp.write_bytes(np.array(segs, dtype=_SEGMENT).tobytes())
+        os.replace(tmp, self.seg_path)
+
+    def _write_block(self, offset: int, tokens: np.ndarray, records: np.ndarray) -> None:
+        self._close_tok_map()
+        pad = _segment_bytes(len(tokens)) - 12 * len(tokens)
+        with self.tok_path.open("r+b" if self.tok_path.exists() else "wb") as f:
+            f.seek(offset)
+            f.write(tokens.astype("<u8").tobytes() + records.astype("<u4").tobytes() + b"\0" * pad)
+
+    def _read_block(self, seg: Segment) -> Tuple[np.ndarray, np.ndarray]:
+        offset, count, _records = seg
+        tokens = np.fromfile(self.tok_path, dtype="<u8", count=count, offset=offset)
+        records = np.fromfile(self.tok_path, dtype="<u4", count=count, offset=offset + 8 * count)
+        return tokens, records
+
+    def _add_segment(self, start: int, texts: List[str]) -> None:
+        """Postings of records ``start .. start + len(texts)`` as a new sorted segment."""
+        pairs = [(_token_hash(tok), i) for i, text in enumerate(texts, start) for tok in set(tokenize(text))]
+        arr = np.array(pairs, dtype=[("token", "<u8"), ("record", "<u4")])
+        arr.sort(order=["token", "record"])
+        offset = self._tok_end(self._segments)
+        self._write_block(offset, arr["token"], arr["record"])
+        self._save_segments(self._segments + [(offset, len(arr), start + len(texts))])
+
+    def _merge_tail(self) -> None:
+        # merge the newest segment into its neighbour while they are of similar size
+        while len(self._segments) >= 2:
+            a, b = self._segments[-2], self._segments[-1]
+            if not b[1]:
+                self._save_segments(self._segments[:-2] + [(a[0], a[1], b[2])])  # records without tokens
+                continue
+            if a[1] > 2 * b[1] or a[1] + b[1] > MAX_SEGMENT:
+                break
+            (ta, ra), (tb, rb) = self._read_block(a), self._read_block(b)
+            tokens, records = np.concatenate((ta, tb)), np.concatenate((ra, rb))
+            order = np.argsort(tokens, kind="stable")  # records stay ascending per token
+            # forget both first: a crash mid-rewrite leaves their records to be re-tokenized
+            self._save_segments(self._segments[:-2])
+            self._write_block(a[0], tokens[order], records[order])
+            self._save_segments(self._segments + [(a[0], a[1] + b[1], b[2])])
+
+    def _backfill_postings(self) -> None:
+        # archives written before the postings existed (or cut short) are tokenized once
+        while self._tok_records < len(self._offsets):
+            start = self._tok_records
+            stop = min(len(self._offsets), start + _BACKFILL_CHUNK)
+            self._add_segment(start, [str(self.get(i).get("text", "")) for i in range(start, stop)])
+            self._merge_tail()
+
+    def append_many(self, records: Iterable[Record]) -> int:
+        self._backfill_postings()
+        start = len(self._offsets)
+        new_offsets = array("Q")
+        texts: List[str] = []
+        with self.path.open("ab") as f:
+            pos = f.tell()
+            for rec in records:
+                line = orjson.dumps(rec) + b"\n"
+                f.write(line)
+                new_offsets.append(pos)
+                texts.append(str(rec.get("text", "")))
+                pos += len(line)
+        if not new_offsets:
+            return 0
+        # postings before the index: the index entry is what commits a record
+        self._add_segment(start, texts)
+        with self.idx_path.open("ab") as f:
+            f.write(new_offsets.tobytes())
+        self._offsets.extend(new_offsets)
+        self._end = pos
+        self._close_map()
+        self._merge_tail()
+        return len(new_offsets)
+
+    def get(self, i: int) -> Record:
+        mm = self._map()
+        start = self._offsets[i]
+        # every record is exactly one line; bytes after it may be a torn append
+        end = mm.find(b"\n", start)
+        rec: Record = orjson.loads(mm[start : end if end >= 0 else len(mm)])
+        return rec
+
+    def get_many(self, ids: Iterable[int]) -> List[Record]:
+        return [self.get(i) for i in ids]
+
+    def search(self, tokens: List[str]) -> Dict[int, int]:
+        """Archive position -> query token hits (duplicate query tokens count twice)."""
+        if not self._offsets or not tokens:
+            return {}
+        self._backfill_postings()
+        weights = Counter(_token_hash(tok) for tok in tokens)
+        query = np.array(sorted(weights), dtype=np.uint64)
+        mm = self._tok_map()
+        counts: Dict[int, int] = {}
+        if mm is None:
+            return counts
+        for offset, count, _records in self._segments:
+            if not count:
+                continue
+            seg_tokens = np.frombuffer(mm, dtype="<u8", count=count, offset=offset)
+            lo = np.searchsorted(seg_tokens, query, "left").tolist()
+            hi = np.searchsorted(seg_tokens, query, "right").tolist()
+            for tok, i, j in zip(query.tolist(), lo, hi):
+                if i < j:
+                    weight = weights[tok]
+                    for rec in np.frombuffer(mm, dtype="<u4", count=j - i, offset=offset + 8 * count + 4 * i).tolist():
+                        counts[rec] = counts.get(rec, 0) + weight
+            del seg_tokens
+        return counts
+
+    def _map(self) -> mmap.mmap:
+        if self._mm is None:
+            with self.path.open("rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mm
+
+    def _close_map(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def _tok_map(self) -> Optional[mmap.mmap]:
+        if self._tok_mm is None and self._tok_end(self._segments):
+            with self.tok_path.open("rb") as f:
+                self._tok_mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._tok_mm
+
+    def _close_tok_map(self) -> None:
+        if self._tok_mm is not None:
+            self._tok_mm.close()
+            self._tok_mm = None
+
+    def close(self) -> None:
+        self._close_map()
+        self._close_tok_map()
@@ -1,10 +1,19 @@
 from __future__ import annotations
 from pathlib import Path
+import time
 import orjson
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from .models import NEED_KEYS
+from .world_assets import SCENARIO_DIR, ITEM_DIR
+from .sampling import AliasSampler, compile_event_sampler
+from .action_table import ActionTable
+from .rules import DEFAULT_RULES, RuleSet
+from .lexicon import DEFAULT_LEXICON, Lexicon, validate_lexicon
 
 ACTION_CATALOG_PATH = Path("actions/catalog.json")
 EVENT_CATALOG_PATH = Path("events/catalog.json")
+RULES_PATH = Path("rules/achievements.json")
+LEXICON_PATH = Path("lexicon/lexicon.json")
 
 class ActionSpec(Dict[str, Any]):
     pass
@@ -13,18 +22,303 @@ class EventSpec(Dict[str, Any]):
     pass
 
 def load_actions() -> List[ActionSpec]:  # pragma: no cover simple IO
-    if not ACTION_CATALOG_PATH.exists():
-        return []
-    try:
-        return orjson.loads(ACTION_CATALOG_PATH.read_bytes())
-    except Exception:
-        return []
+    return list(get_registry().actions)
 
 def load_events() -> Dict[str, EventSpec]:  # pragma: no cover simple IO
-    if not EVENT_CATALOG_PATH.exists():
-        return {}
+    return dict(get_registry().events_by_key)
+
+def _need_effects_ok(effects: Any) -> bool:
+    return isinstance(effects, dict) and all(k in NEED_KEYS and isinstance(v, int) for k, v in effects.items())
+
+def _tags_ok(tags: Any) -> bool:
+    return isinstance(tags, list) and all(isinstance(t, str) for t in tags)
+
+def validate_action(spec: Any) -> Optional[str]:
+    if not isinstance(spec, dict):
+        return "not an object"
+    if not isinstance(spec.get("label"), str) or not spec["label"]:
+        return "missing label"
+    if not isinstance(spec.get("duration", "?"), str):
+        return "duration must be a string"
+    if not _need_effects_ok(spec.get("need_effects", {})):
+        return "need_effects must map need keys to ints"
+    if not isinstance(spec.get("weight", 1.0), (int, float)):
+        return "weight must be a number"
+    if not _tags_ok(spec.get("tags", [])):
+        return "tags must be a list of strings"
+    return None
+
+def validate_event(spec: Any) -> Optional[str]:
+    if not isinstance(spec, dict):
+        return "not an object"
+    if not isinstance(spec.get("key"), str) or not spec["key"]:
+        return "missing key"
+    if not _need_effects_ok(spec.get("need_effects", {})):
+        return "need_effects must map need keys to ints"
+    rarity = spec.get("rarity", 1.0)
+    if not isinstance(rarity, (int, float)) or not 0 < rarity <= 1:
+        return "rarity must be in (0, 1]"
+    if not _tags_ok(spec.get("tags", [])):
+        return "tags must be a list of strings"
+    return None
+
+def validate_item(spec: Any) -> Optional[str]:
+    if not isinstance(spec, dict):
+        return "not an object"
+    if not isinstance(spec.get("name"), str) or not spec["name"]:
+        return "missing name"
+    if not _need_effects_ok(spec.get("passive_need_delta", {})):
+        return "passive_need_delta must map need keys to ints"
+    buffs = spec.get("effect_buffs", {})
+    if not isinstance(buffs, dict) or not all(isinstance(v, int) for v in buffs.values()):
+        return "effect_buffs must map buff names to ints"
+    return None
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+def _read_json(path: Path) -> Any:
     try:
-        data = orjson.loads(EVENT_CATALOG_PATH.read_bytes())
-        return {e["key"]: e for e in data}
+        return orjson.loads(path.read_bytes())
     except Exception:
-        return {}
+        return None
+
+class CatalogRegistry:
+    """Shared, read-only view of the JSON catalogs (actions, events, items, scenarios, rules, lexicon).
+
+    Files are parsed and validated once; lookups are plain dict hits. Before serving,
+    file mtimes are checked (at most every ``check_interval`` seconds) and changed files
+    are reloaded. ``generation`` increases on every reload so derived tables (samplers,
+    score matrices) know when to rebuild. Malformed entries are dropped at load time and
+    listed in ``rejected``.
+    """
+    def __init__(
+        self,
+        action_path: Path = ACTION_CATALOG_PATH,
+        event_path: Path = EVENT_CATALOG_PATH,
+        scenario_dir: Path = SCENARIO_DIR,
+        item_dir: Path = ITEM_DIR,
+        check_interval: float = 1.0,
+        rules_path: Path = RULES_PATH,
+        lexicon_path: Path = LEXICON_PATH,
+    ):
+        self.action_path = action_path
+        self.event_path = event_path
+        self.scenario_dir = scenario_dir
+        self.item_dir = item_dir
+        self.rules_path = rules_path
+        self.lexicon_path = lexicon_path
+        self.check_interval = check_interval
+        self.generation = 0
+        self.rejected: List[str] = []
+        self._last_check = float("-inf")
+        self._mtimes: Dict[Path, Optional[int]] = {}
+        self._actions: List[ActionSpec] = []
+        self._actions_by_label: Dict[str, ActionSpec] = {}
+        self._actions_by_tag: Dict[str, List[ActionSpec]] = {}
+        self._events_by_key: Dict[str, EventSpec] = {}
+        self._events_by_tag: Dict[str, List[EventSpec]] = {}
+        self._scenarios: Dict[str, Tuple[Optional[int], Dict[str, Any]]] = {}
+        self._scenario_checked: Dict[str, float] = {}
+        self._samplers: Dict[str, Tuple[int, Optional[AliasSampler[str]]]] = {}
+        self._action_table: Optional[ActionTable] = None
+        self._items: Dict[str, Tuple[Optional[int], List[Dict[str, Any]]]] = {}
+        self._rules = RuleSet(DEFAULT_RULES)
+        self._lexicon = Lexicon(DEFAULT_LEXICON)
+
+    # --- refresh -------------------------------------------------------
+    def refresh(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        if self._changed(self.action_path):
+            self._load_actions()
+            self.generation += 1
+        if self._changed(self.event_path):
+            self._load_events()
+            self.generation += 1
+        if self._changed(self.rules_path):
+            self._load_rules()
+            self.generation += 1
+        if self._changed(self.lexicon_path):
+            self._load_lexicon()
+            self.generation += 1
+
+    def _changed(self, path: Path) -> bool:
+        mtime = _mtime(path)
+        if path in self._mtimes and self._mtimes[path] == mtime:
+            return False
+        self._mtimes[path] = mtime
+        return True
+
+    def _reject(self, source: Path, idx: int, reason: str) -> None:
+        self.rejected.append(f"{source}[{idx}]: {reason}")
+
+    def _load_actions(self) -> None:
+        self.rejected = [r for r in self.rejected if not r.startswith(str(self.action_path))]
+        data = _read_json(self.action_path)
+        actions: List[ActionSpec] = []
+        for idx, spec in enumerate(data if isinstance(data, list) else []):
+            reason = validate_action(spec)
+            if reason:
+                self._reject(self.action_path, idx, reason)
+                continue
+            actions.append(ActionSpec(spec))
+        self._actions = actions
+        self._action_table = None
+        self._actions_by_label = {a["label"]: a for a in actions}
+        self._actions_by_tag = {}
+        for a in actions:
+            for tag in a.get("tags", []):
+                self._actions_by_tag.setdefault(tag, []).append(a)
+
+    def _load_events(self) -> None:
+        self.rejected = [r for r in self.rejected if not r.startswith(str(self.event_path))]
+        data = _read_json(self.event_path)
+        self._events_by_key = {}
+        self._events_by_tag = {}
+        for idx, spec in enumerate(data if isinstance(data, list) else []):
+            reason = validate_event(spec)
+            if reason:
+                self._reject(self.event_path, idx, reason)
+                continue
+            ev = EventSpec(spec)
+            self._events_by_key[ev["key"]] = ev
+            for tag in ev.get("tags", []):
+                self._events_by_tag.setdefault(tag, []).append(ev)
+
+    def _load_rules(self) -> None:
+        self.rejected = [r for r in self.rejected if not r.startswith(str(self.rules_path))]
+        data = _read_json(self.rules_path)
+        if not isinstance(data, dict):
+            if self.rules_path.exists():
+                self.rejected.append(f"{self.rules_path}: not a rules object, using defaults")
+            data = DEFAULT_RULES
+        self._rules = RuleSet(data)
+        self.rejected.extend(f"{self.rules_path}:{r}" for r in self._rules.rejected)
+
+    def _load_lexicon(self) -> None:
+        self.rejected = [r for r in self.rejected if not r.startswith(str(self.lexicon_path))]
+        data = _read_json(self.lexicon_path)
+        reason = validate_lexicon(data) if data is not None else None
+        if reason:
+            self.rejected.append(f"{self.lexicon_path}: {reason}, using defaults")
+        self._lexicon = Lexicon(data if data is not None and reason is None else DEFAULT_LEXICON)
+
+    # --- actions / events ----------------------------------------------
+    @property
+    def actions(self) -> List[ActionSpec]:
+        self.refresh()
+        return self._actions
+
+    @property
+    def actions_by_label(self) -> Dict[str, ActionSpec]:
+        self.refresh()
+        return self._actions_by_label
+
+    @property
+    def actions_by_tag(self) -> Dict[str, List[ActionSpec]]:
+        self.refresh()
+        return self._actions_by_tag
+
+    @property
+    def events_by_key(self) -> Dict[str, EventSpec]:
+        self.refresh()
+        return self._events_by_key
+
+    @property
+    def events_by_tag(self) -> Dict[str, List[EventSpec]]:
+        self.refresh()
+        return self._events_by_tag
+
+    @property
+    def action_table(self) -> ActionTable:
+        """Actions compiled for vectorized scoring (rebuilt after a catalog reload)."""
+        self.refresh()
+        if self._action_table is None:
+            self._action_table = ActionTable(self._actions)
+        return self._action_table
+
+    @property
+    def rules(self) -> RuleSet:
+        """Achievement / stat rules (a new RuleSet object after every reload)."""
+        self.refresh()
+        return self._rules
+
+    @property
+    def lexicon(self) -> Lexicon:
+        """Topic / preference keywords compiled into one matcher."""
+        self.refresh()
+        return self._lexicon
+
+    def action(self, label: str) -> Optional[ActionSpec]:
+        return self.actions_by_label.get(label)
+
+    def event(self, key: str) -> Optional[EventSpec]:
+        return self.events_by_key.get(key)
+
+    # --- scenarios / items (loaded on first use, reloaded on mtime change) ---
+    def scenario(self, name: str = "default") -> Dict[str, Any]:
+        cached = self._scenarios.get(name)
+        now = time.monotonic()
+        if cached is not None and now - self._scenario_checked.get(name, float("-inf")) < self.check_interval:
+            return cached[1]
+        self._scenario_checked[name] = now
+        path = self.scenario_dir / f"{name}.json"
+        mtime = _mtime(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        data = _read_json(path) if mtime is not None else None
+        if not isinstance(data, dict):
+            data = {"name": name, "need_drift": {}, "event_bias": {}}
+        bias = data.get("event_bias", {})
+        if not isinstance(bias, dict) or not all(isinstance(v, (int, float)) for v in bias.values()):
+            self.rejected.append(f"{path}: event_bias must map names to numbers")
+            data = {**data, "event_bias": {}}
+        self._scenarios[name] = (mtime, data)
+        if cached is not None:
+            self.generation += 1
+        return data
+
+    def event_sampler(self, scenario: str = "default") -> Optional[AliasSampler[str]]:
+        """Compiled alias sampler over event keys for a scenario's ``event_bias``.
+
+        Rebuilt only when the scenario file or the event catalog changed (``generation``).
+        """
+        bias = self.scenario(scenario).get("event_bias", {})
+        events_by_key = self.events_by_key
+        cached = self._samplers.get(scenario)
+        if cached is not None and cached[0] == self.generation:
+            return cached[1]
+        sampler = compile_event_sampler(bias, events_by_key, self._events_by_tag)
+        self._samplers[scenario] = (self.generation, sampler)
+        return sampler
+
+    def items_pack(self, file: str = "starter_pack.json") -> List[Dict[str, Any]]:
+        path = self.item_dir / file
+        mtime = _mtime(path)
+        cached = self._items.get(file)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        data = _read_json(path) if mtime is not None else None
+        items: List[Dict[str, Any]] = []
+        for idx, spec in enumerate(data if isinstance(data, list) else []):
+            reason = validate_item(spec)
+            if reason:
+                self._reject(path, idx, reason)
+                continue
+            items.append(spec)
+        self._items[file] = (mtime, items)
+        return items
+
+_registry_singleton: Optional[CatalogRegistry] = None
+
+def get_registry() -> CatalogRegistry:
+    global _registry_singleton
+    if _registry_singleton is None:
+        _registry_singleton = CatalogRegistry()
+    return _registry_singleton
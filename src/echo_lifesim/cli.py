@@ -7,7 +7,7 @@ from pathlib import Path
 from .llm_client import get_groq
 from .persistence import save_state, load_state, export_state, DEFAULT_STATE_PATH
 from .skills import load_skill_cards, autounlock_from_tests
-from .world_assets import load_scenario, load_items_pack
+from .catalogs import get_registry
 
 app = typer.Typer(help="ECHO-LifeSim CLI")
 console = Console()
@@ -52,6 +52,19 @@ def turn(text: str, event: str = typer.Option(None, help="Optional event key"))
     needs_table.add_row(*[str(v) for v in result["needs"].values()])
     console.print(needs_table)
 
+@app.command()
+def plan(
+    depth: int = typer.Option(3, help="Simulierte Schritte pro Aktion"),
+    budget_ms: float = typer.Option(50.0, help="Zeitbudget in ms"),
+) -> None:
+    """Bewertet Aktionen per Vorausschau (Forks des States, Original bleibt unverändert)."""
+    table = Table(title="Plan")
+    for col in ("Label", "Dauer", "Wert", "Tiefe"):
+        table.add_column(col)
+    for p in engine.plan_actions(depth=depth, budget_ms=budget_ms):
+        table.add_row(p["label"], p["duration"], f"{p['value']:.1f}", str(p["depth"]))
+    console.print(table)
+
 @app.command()
 def act(label: str = typer.Argument(..., help="Exact label of chosen action")) -> None:
     engine.apply_action_result(label)
@@ -152,9 +165,26 @@ def skills_list() -> None:
 
 @app.command()
 def epoch() -> None:
-    art = engine.state.advance_epoch()
+    art = engine.advance_epoch()
     console.print({"epoch": engine.state.epoch, "artifact": art.title})
 
+@app.command()
+def archive(
+    path: str = typer.Option(None, help="Archiv-Datei für komprimierte Episoden setzen"),
+    spill: str = typer.Option(None, help="Sidecar-Datei für gekürzte Gedanken/Notizen setzen"),
+) -> None:
+    """Zeigt/setzt das Cold-Archiv (Episoden, die aus dem Verlauf fallen) und das Spill-Log."""
+    if path:
+        engine.state.archive_path = path
+    if spill:
+        engine.state.spill_path = spill
+    arch = engine.state.archive
+    console.print({
+        "archive_path": engine.state.archive_path,
+        "archived": len(arch) if arch else 0,
+        "spill_path": engine.state.spill_path,
+    })
+
 @app.command()
 def artifacts() -> None:
     data = [a.model_dump() for a in engine.state.artifacts[-10:]]
@@ -212,14 +242,14 @@ def life_phase() -> None:
 
 @app.command()
 def scenario_set(name: str) -> None:
-    scen = load_scenario(name)
+    scen = get_registry().scenario(name)
     engine.state.world.scenario = scen.get("name", name)
     console.print({"scenario": engine.state.world.scenario})
 
 @app.command()
 def items_load(pack: str = "starter_pack.json") -> None:
     from echo_lifesim.models import Item
-    data = load_items_pack(pack)
+    data = get_registry().items_pack(pack)
     added = []
     for it in data:
         try:
@@ -276,6 +306,55 @@ def set_model(name: str) -> None:
     else:
         console.print(f"[red]Unbekanntes Modell: {name}[/red]")
 
+@app.command()
+def replay(trace: str = typer.Argument(..., help="JSONL-Trace eines SessionRecorder")) -> None:
+    """Spielt eine aufgezeichnete Session in voller Geschwindigkeit ab (State-Vergleich + Latenzen)."""
+    from .replay import replay as run_replay
+    report = run_replay(Path(trace))
+    table = Table(title=f"Replay {trace} ({report['calls']} Calls)")
+    for col in ("Call", "n", "p50 ms", "p90 ms", "p99 ms", "max ms", "aufgezeichnet p50 ms"):
+        table.add_column(col)
+    for op, lat in report["latency_ms"].items():
+        rec = report["recorded_ms"].get(op, {})
+        table.add_row(op, str(int(lat["n"])), *(f"{lat[k]:.2f}" for k in ("p50", "p90", "p99", "max")), f"{rec.get('p50', 0.0):.2f}")
+    console.print(table)
+    if report["clock_drift"]:
+        console.print(f"[yellow]Clock-Drift: {report['clock_drift']} zusätzliche Zeitabfragen[/yellow]")
+    if report["identical"] is None:
+        console.print("[yellow]Trace ohne Abschluss – kein State-Vergleich.[/yellow]")
+    elif report["identical"]:
+        console.print("[green]Finaler State identisch.[/green]")
+    else:
+        console.print(f"[red]State weicht ab: {report['actual']} != {report['expected']}[/red]")
+        raise typer.Exit(1)
+
+@app.command()
+def simulate(
+    personas: int = typer.Option(1000, help="Anzahl simulierter Personas"),
+    steps: int = typer.Option(48, help="Schritte (Turn + Aktion + Tick) pro Persona"),
+    seed: int = typer.Option(0, help="Seed (gleicher Seed = gleiches Ergebnis)"),
+    workers: int = typer.Option(0, help="Prozesse (0 = alle CPUs, 1 = ohne Pool)"),
+    shard_size: int = typer.Option(64, help="Personas pro Batch"),
+    out: str = typer.Option(None, help="Report als JSON speichern"),
+) -> None:
+    """Headless-Simulation vieler Personas über einen Prozess-Pool (ohne LLM)."""
+    from .simulate import simulate as run_simulation
+    report = run_simulation(personas, steps, seed=seed, workers=workers, shard_size=shard_size)
+    table = Table(title=f"Simulation: {personas} Personas × {steps} Schritte (Seed {seed})")
+    for col in ("Need", "Start Ø", "Ende Ø", "Ende σ"):
+        table.add_column(col)
+    for k, series in report["need_mean"].items():
+        table.add_row(k, f"{series[0]:.1f}", f"{series[-1]:.1f}", f"{report['need_std'][k][-1]:.1f}")
+    console.print(table)
+    console.print(f"Akzeptanzrate: {report['acceptance']:.1%}  Thoughts Ø: {report['thoughts_mean']:.1f}")
+    console.print({"achievements": report["achievements"]})
+    rate = personas * steps / max(report["seconds"], 1e-9)
+    console.print(f"[cyan]{report['seconds']:.2f}s ({rate:.0f} Schritte/s) digest {report['digest'][:16]}[/cyan]")
+    if out:
+        import orjson
+        Path(out).write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        console.print(f"[green]Report gespeichert: {out}[/green]")
+
 @app.command()
 def help_start() -> None:
     """Zeigt kompakten Einstiegsleitfaden + erste Befehle."""
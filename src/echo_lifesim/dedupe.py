@@ -0,0 +1,53 @@
+from __future__ import annotations
+from collections import deque
+from hashlib import blake2b
+from typing import Deque, Generic, Hashable, Optional, Tuple, TypeVar
+import re
+import numpy as np
+
+_DIGITS = re.compile(r"\d+")
+_WORD = re.compile(r"\w+")
+
+R = TypeVar("R")
+
+def fingerprint(text: str) -> int:
+    """64-bit SimHash over word unigrams + bigrams; numbers are collapsed so
+    'overmind {interval: 7750}' and 'overmind {interval: 8000}' look alike."""
+    words = _WORD.findall(_DIGITS.sub("0", text.lower()))
+    if not words:
+        return 0
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    hashes = np.array(
+        [int.from_bytes(blake2b(f.encode(), digest_size=8).digest(), "little") for f in features],
+        dtype=np.uint64,
+    )
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(features)
+    return int(np.packbits(votes > 0, bitorder="little").view(np.uint64)[0])
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+class RecentFingerprints(Generic[R]):
+    """Sliding window of recent (group key, fingerprint, record ref) used to spot near-duplicates."""
+    def __init__(self, window: int = 8, max_distance: int = 3):
+        self.max_distance = max_distance
+        self._recent: Deque[Tuple[Hashable, int, R]] = deque(maxlen=window)
+
+    def match(self, key: Hashable, fp: int) -> Optional[R]:
+        for k, other, ref in reversed(self._recent):
+            if k == key and hamming(fp, other) <= self.max_distance:
+                return ref
+        return None
+
+    def add(self, key: Hashable, fp: int, ref: R) -> None:
+        self._recent.append((key, fp, ref))
+
+    def replace(self, old: R, new: R) -> None:
+        """Point entries that refer to ``old`` at ``new`` (record swapped for an edited copy)."""
+        for i, (k, fp, ref) in enumerate(self._recent):
+            if ref is old:
+                self._recent[i] = (k, fp, new)
+
+    def clear(self) -> None:
+        self._recent.clear()
@@ -1,13 +1,16 @@
 from __future__ import annotations
-from typing import Tuple, List, Dict, TypedDict, Optional, Any
+from typing import Tuple, List, Dict, TypedDict, Optional, Any, Awaitable, Callable, TYPE_CHECKING
+import asyncio
 import random
-import time
-from .models import PersonaState, Episode
-from .catalogs import load_actions, load_events
-from .llm_client import get_groq
+import threading
+from .models import PersonaState, Episode, EpisodeLike, Artifact, now
+from .catalogs import get_registry
+from .action_table import need_vector
+from .llm_client import get_groq, get_async_groq
 from .memory import MemoryIndex
-
-EVENT_CACHE = load_events()
+from .rules import RuleTracker
+if TYPE_CHECKING:
+    from .planner import PlanResult
 
 BUFF_LIBRARY: Dict[str, Dict[str, int]] = {
     "klarer_kopf": {"clarity": +2},
@@ -27,30 +30,45 @@ class PersonaReply(TypedDict):
     overmind: Dict[str, int | str]
 
 
+class AsyncPersonaReply(PersonaReply):
+    enriched: Optional[asyncio.Task[str]]
+
+
+REPLY_SYSTEM_PROMPT = "Du bist Ari, kurz, konkret, warm. Max 3 Sätze. Nutze Vorschläge nicht wörtlich wieder, sondern baue sie sinnvoll ein."
+
+
 class LifeSimEngine:
-    def __init__(self, state: PersonaState | None = None):
+    def __init__(self, state: PersonaState | None = None, rng: random.Random | None = None):
         self.state = state or PersonaState()
-        self.memory = MemoryIndex(self.state)
-        self._last_tick_check = time.time()
+        self.rng = rng or random.Random()
+        self.lock = threading.RLock()  # held by scheduler jobs (see scheduler.EngineJobs)
+        self.on_thought_interval: Optional[Callable[[int], None]] = None
+        self._last_tick_check = now()
+
+    @property
+    def state(self) -> PersonaState:
+        return self._state
+
+    @state.setter
+    def state(self, value: PersonaState) -> None:
+        # swapping state (e.g. GUI reload) must not reuse another state's retrieval cache
+        self._state = value
+        self.memory = MemoryIndex(value)
+        # bind right away so thought counters see every thought added through this engine
+        self._rules: Optional[RuleTracker] = RuleTracker(get_registry().rules)
+        self._rules.bind(value)
 
     def ingest_user_input(self, text: str) -> None:
-        topic = "main"
-        lowered = text.lower()
-        if any(k in lowered for k in ["arbeit","job","projekt"]):
-            topic = "work"
-        elif any(k in lowered for k in ["freund","sozial","famil"]):
-            topic = "social"
-        elif any(k in lowered for k in ["gesund","körper","sport"]):
-            topic = "health"
+        # topic + preference keywords come from lexicon/lexicon.json, matched in one pass
+        topic, prefs = get_registry().lexicon.scan(text)
         self.state.add_episode(Episode(actor="user", text=text, tags=[], topic_id=topic))
-        for token in ["morgens", "abends", "ruhig", "fokus"]:
-            if token in text.lower():
-                self.state.upsert_preference(token)
+        for token in prefs:
+            self.state.upsert_preference(token)
 
     def apply_event(self, event_key: Optional[str]) -> Dict[str, int]:
         if not event_key:
             return {}
-        spec = EVENT_CACHE.get(event_key)
+        spec = get_registry().event(event_key)
         if not spec:
             return {}
         effects = spec.get("need_effects", {})
@@ -60,54 +78,25 @@ class LifeSimEngine:
 
     def maybe_trigger_biased_event(self) -> Optional[Dict[str, Any]]:
         """Trigger an event influenced by scenario event_bias if any.
-        Picks from events where name appears in scenario bias list with weighted random.
+        Bias tags/keys resolve to events via the catalog tag index, weighted by rarity,
+        and are drawn in O(1) from the scenario's precompiled alias sampler.
         """
-        scen_name = self.state.world.scenario
-        from .world_assets import load_scenario
-        try:
-            scen = load_scenario(f"{scen_name}.json")
-        except Exception:
-            return None
-        bias = scen.get("event_bias", {})
-        if not bias:
+        sampler = get_registry().event_sampler(self.state.world.scenario)
+        if sampler is None:
             return None
-        # Build weighted list
-        weighted: List[str] = []
-        # Build from bias keys directly (assumed valid event keys)
-        for ev_name, weight in bias.items():
-            weighted.extend([ev_name] * max(1, int(weight)))
-        if not weighted:
-            return None
-        import random
-        if random.random() < 0.25:  # 25% chance per tick
-            chosen = random.choice(weighted)
+        if self.rng.random() < 0.25:  # 25% chance per tick
+            chosen = sampler.sample(self.rng)
             eff = self.apply_event(chosen)
             return {"applied": chosen, "effects": eff}
         return None
 
     def suggest_actions(self) -> List[Tuple[str, str]]:
         s = self.state
-        candidates: List[Tuple[str, str]] = []
-        # dynamic action catalog weighting
-        catalog = load_actions()
-        n = s.needs
-        scored: List[Tuple[float, Tuple[str, str], Dict[str, int]]] = []
-        for a in catalog:
-            label = a.get("label", "")
-            duration = a.get("duration", "?")
-            effects: Dict[str, int] = a.get("need_effects", {})
-            # score: sum of positive deltas for currently low needs + base weight
-            weight = float(a.get("weight", 1.0))
-            score = weight
-            for need, delta in effects.items():
-                val = getattr(n, need, 50)
-                if delta > 0 and val < 55:
-                    score += (55 - val) * (delta / 10)
-            scored.append((score, (label, duration), effects))
-        if not scored:  # fallback safety
-            scored = [(1.0, ("kurzer stretch", "2-Min"), {})]
-        scored.sort(key=lambda x: x[0], reverse=True)
-        candidates = [tpl for _, tpl, _ in scored[:12]]  # keep top pool before variety rules
+        # dynamic action catalog weighting: one vectorized pass over the compiled need-effect matrix
+        table = get_registry().action_table
+        candidates: List[Tuple[str, str]] = table.top(need_vector(s.needs), 12)  # keep top pool before variety rules
+        if not candidates:  # fallback safety
+            candidates = [("kurzer stretch", "2-Min")]
         # intensity filter / reorder
         if s.om_intensity == 1:
             candidates = [c for c in candidates if not c[1].startswith("15")]
@@ -119,7 +108,7 @@ class LifeSimEngine:
                     candidates.insert(0, c)
                     break
         # variety handling
-        random.shuffle(candidates)
+        self.rng.shuffle(candidates)
         if s.om_variety == 1:
             # reinforce habits: push most frequent habit-like candidate up
             for h in s.top_habits(3):
@@ -135,8 +124,8 @@ class LifeSimEngine:
                 ("5-Min journal stichpunkte", "5-Min"),
                 ("kurzer dankbarkeits-check", "2-Min"),
             ]
-            if random.random() < 0.5:
-                candidates.insert(0, random.choice(novel_pool))
+            if self.rng.random() < 0.5:
+                candidates.insert(0, self.rng.choice(novel_pool))
         # finalize length
         limit = max(1, min(4, s.om_suggestion_len))
         trimmed = candidates[:limit]
@@ -148,6 +137,48 @@ class LifeSimEngine:
         return trimmed
 
     def persona_reply(self, user_text: str, event_key: Optional[str] = None) -> PersonaReply:
+        draft = self._draft_reply(user_text, event_key)
+        enriched = self._enrich(user_text, draft["reply"])
+        if enriched:
+            draft["reply"] = enriched
+        return self._commit_reply(draft)[0]
+
+    async def persona_reply_async(
+        self,
+        user_text: str,
+        event_key: Optional[str] = None,
+        on_enriched: Optional[Callable[[str], None]] = None,
+        apply_edit: Optional[Callable[[int, str], Awaitable[object]]] = None,
+    ) -> AsyncPersonaReply:
+        """Reply path that never waits on the network.
+
+        Returns the locally composed reply right away; if the LLM is available, the
+        enriched text arrives later via ``result["enriched"]`` (an asyncio.Task) and/or
+        ``on_enriched``. Once it arrives, the persona episode is updated in place, or
+        handed to ``apply_edit(ep_id, text)`` (e.g. to run it through an actor's mailbox).
+        Enrichment of many engines on one event loop overlaps their network waits.
+        """
+        draft = self._draft_reply(user_text, event_key)
+        local = draft["reply"]
+        result, ep_id = self._commit_reply(draft)
+        task: Optional[asyncio.Task[str]] = None
+        client = get_async_groq()
+        if client.available():
+            async def enrich() -> str:
+                text = await client.chat(REPLY_SYSTEM_PROMPT, f"User: {user_text}\nKontext: {local}")
+                final = text[:320] if text else local
+                if final != local:
+                    if apply_edit is None:
+                        self.state.replace_episode_text(ep_id, final)
+                    else:
+                        await apply_edit(ep_id, final)
+                if on_enriched is not None:
+                    on_enriched(final)
+                return final
+            task = asyncio.create_task(enrich())
+        return {**result, "enriched": task}
+
+    def _draft_reply(self, user_text: str, event_key: Optional[str]) -> PersonaReply:
         self.state.turn += 1
         self.ingest_user_input(user_text)
         event_effects = self.apply_event(event_key)
@@ -160,30 +191,40 @@ class LifeSimEngine:
             self.state.add_note(reflection)
         actions = self.suggest_actions()
         reply = self._compose_reply(user_text, retrieved, actions, event_effects)
+        return {
+            "reply": reply,
+            "actions": actions,
+            "reflection": reflection,
+            "event_effects": event_effects,
+            "needs": {},
+            "overmind": {},
+        }
+
+    def _enrich(self, user_text: str, reply: str) -> Optional[str]:
         groq = get_groq()
         if groq.available():
-            system = "Du bist Ari, kurz, konkret, warm. Max 3 Sätze. Nutze Vorschläge nicht wörtlich wieder, sondern baue sie sinnvoll ein."
-            enriched = groq.chat(system, f"User: {user_text}\nKontext: {reply}")
+            enriched = groq.chat(REPLY_SYSTEM_PROMPT, f"User: {user_text}\nKontext: {reply}")
             if enriched:
-                reply = enriched[:320]
+                return enriched[:320]
+        return None
+
+    def _commit_reply(self, draft: PersonaReply) -> Tuple[PersonaReply, int]:
+        reply = draft["reply"]
         # persona reply inherits last user topic (if any)
-        last_user = next((ep for ep in reversed(self.state.episodes) if ep.actor == "user"), None)
-        topic = last_user.topic_id if last_user else "main"
-        self.state.add_episode(Episode(actor="persona", text=reply, topic_id=topic))
+        last_user = self.state.last_episodes(1, actor="user")
+        topic = last_user[0].topic_id if last_user else "main"
+        ep_id = self.state.add_episode(Episode(actor="persona", text=reply, topic_id=topic))
         adjustments = self.overmind_step()
         # log adjustments as system episode for transparency
         if adjustments:
             self.state.add_episode(Episode(actor="system", text=f"overmind {adjustments}", tags=["overmind"], topic_id=topic))
         return {
-            "reply": reply,
-            "actions": actions,
-            "reflection": reflection,
-            "event_effects": event_effects,
+            **draft,
             "needs": self.state.needs.model_dump(),
             "overmind": adjustments,
-        }
+        }, ep_id
 
-    def _compose_reply(self, user_text: str, retrieved: List[Episode], actions: List[Tuple[str, str]], effects: Dict[str, int]) -> str:
+    def _compose_reply(self, user_text: str, retrieved: List[EpisodeLike], actions: List[Tuple[str, str]], effects: Dict[str, int]) -> str:
         n = self.state.needs
         mood_bits: List[str] = []
         if n.energy < 40:
@@ -216,8 +257,7 @@ class LifeSimEngine:
         if self.state.xp % 25 == 0:
             self.state.add_artifact(title=f"Milestone XP {self.state.xp}", effect="milestone", notes="Auto-award")
         # derive effects from catalog for consistency
-        catalog_map = {a.get("label"): a for a in load_actions()}
-        spec = catalog_map.get(choice_label)
+        spec = get_registry().action(choice_label)
         applied: Dict[str, int] = {}
         if spec:
             eff = spec.get("need_effects", {})
@@ -269,6 +309,14 @@ class LifeSimEngine:
             lines.append(f"[{ep.actor}|{ep.topic_id}] {ep.text}")
         return "\n".join(lines)
 
+    def plan_actions(self, depth: int = 3, budget_ms: float = 50.0) -> List["PlanResult"]:
+        """Candidate actions ranked by k-step lookahead on state forks (see planner.py)."""
+        from .planner import LookaheadPlanner
+        return LookaheadPlanner(depth, budget_ms).plan(self.state)
+
+    def advance_epoch(self) -> Artifact:
+        return self.state.advance_epoch()
+
     def reject_action(self) -> None:
         self.state.rejected_actions += 1
         self.state.success_streak = 0
@@ -287,20 +335,28 @@ class LifeSimEngine:
         s = self.state
         if not s.thought_active or s.thought_mute:
             return
-        now = time.time()
-        if (now - s.last_thought_ts) * 1000 < s.thought_interval_ms:
+        ts = now()
+        if (ts - s.last_thought_ts) * 1000 < s.thought_interval_ms:
+            return
+        self.thought_tick()
+
+    def thought_tick(self) -> None:
+        """Emit a ticker thought now (the scheduler calls this on its own timer)."""
+        s = self.state
+        if not s.thought_active or s.thought_mute:
             return
-        recent = [ep for ep in reversed(s.episodes) if ep.actor == "user"][:2]
+        recent = s.last_episodes(2, actor="user")
         if recent:
             summary_bits = [ep.text[:40] for ep in recent]
             raw_thought = f"Fokus: {' | '.join(summary_bits)}"
             thought = raw_thought[: self.state.thought_max_len]
             s.maybe_add_thought(thought)
-            s.last_thought_ts = now
+            s.last_thought_ts = now()
 
     def overmind_step(self) -> Dict[str, int | str]:
         s = self.state
         adjustments: Dict[str, int | str] = {}
+        prev_interval = s.thought_interval_ms
         # clarity drives ticker speed
         if s.needs.clarity < 40:
             s.thought_interval_ms = max(4000, s.thought_interval_ms - 500)
@@ -308,6 +364,8 @@ class LifeSimEngine:
             if s.thought_interval_ms < 8000:
                 s.thought_interval_ms += 250
         adjustments["thought_interval_ms"] = s.thought_interval_ms
+        if s.thought_interval_ms != prev_interval and self.on_thought_interval is not None:
+            self.on_thought_interval(s.thought_interval_ms)
         # energy influences intensity
         if s.needs.energy < 40:
             s.om_intensity = 1
@@ -346,45 +404,38 @@ class LifeSimEngine:
         # scan achievements
         self._scan_achievements()
         # if night & not yet dreamed -> dream
-        if s.time_block == "NIGHT" and not s.dream_night_flag:
-            dream = self._generate_dream()
-            if dream:
-                result["generated"].append("dream")
+        if self.dream_check():
+            result["generated"].append("dream")
         # biased event chance
         biased = self.maybe_trigger_biased_event()
         if biased:
             result["biased_event"] = biased.get("applied")
         return result
 
+    def dream_check(self) -> Optional[str]:
+        if self.state.time_block == "NIGHT" and not self.state.dream_night_flag:
+            return self._generate_dream()
+        return None
+
     def _scan_achievements(self) -> None:
-        s = self.state
-        # simple conditions
-        conditions = {
-            "streak_5": lambda: s.success_streak >= 5,
-            "xp_50": lambda: s.xp >= 50,
-            "clarity_70": lambda: s.needs.clarity >= 70,
-            "artifact_3": lambda: len(s.artifacts) >= 3,
-        }
-        for key, fn in conditions.items():
-            if key not in s.achievements_unlocked and fn():
-                s.achievements_unlocked.append(key)
-                s.add_episode(Episode(actor="system", text=f"achievement_unlocked {key}", tags=["achievement"], topic_id="main"))
-        # derive stats roughly
-        s.stat_discipline = max(s.stat_discipline, s.success_streak)
-        s.stat_insight = max(s.stat_insight, len([t for t in s.thoughts if 'Fokus' in t.text]))
-        s.stat_resilience = max(s.stat_resilience, s.rejected_actions)
+        # rules live in rules/achievements.json; only rules whose input field changed run
+        rules = get_registry().rules
+        if self._rules is None or self._rules.rules is not rules:
+            self._rules = RuleTracker(rules)
+        for key in self._rules.evaluate(self.state):
+            self.state.add_episode(Episode(actor="system", text=f"achievement_unlocked {key}", tags=["achievement"], topic_id="main"))
 
     def _generate_dream(self) -> Optional[str]:
         s = self.state
         # summarize last few episodes into a dream thought
-        recent = [ep.text for ep in reversed(s.episodes) if ep.actor == "user"][:5]
+        recent = [ep.text for ep in s.last_episodes(5, actor="user")]
         if not recent:
             return None
         dream_txt = "Traum: " + " | ".join(r[:30] for r in recent)[-240:]
         s.maybe_add_thought(dream_txt, refs={"type": ["dream"]})
         s.dream_night_flag = True
         # small chance to create insight artifact
-        if random.random() < 0.25:
+        if self.rng.random() < 0.25:
             art = s.add_artifact(title="Insight Fragment", effect="insight", notes="dream synthesis")
             s.add_episode(Episode(actor="system", text=f"dream_artifact {art.title}", tags=["dream"], topic_id="main"))
         return dream_txt
@@ -0,0 +1,394 @@
+from __future__ import annotations
+from array import array
+from itertools import chain, islice
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union, overload
+import math
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+from .symbols import SymbolTable
+
+if TYPE_CHECKING:
+    from .models import Episode
+
+_NO_DAY = -(1 << 31)  # day=None
+
+class EpisodeView:
+    """One row of an EpisodeStore with the attribute API of ``Episode``.
+
+    Views stay valid when older rows are dropped from the front of the store; reading a
+    dropped row raises LookupError.
+    """
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: EpisodeStore, row: int):
+        self._store = store
+        self._row = row  # absolute row: store._dropped + position
+
+    def _pos(self) -> int:
+        pos = self._row - self._store._dropped
+        if pos < 0:
+            raise LookupError("episode was dropped from the store")
+        return pos
+
+    @property
+    def ts(self) -> float:
+        return self._store._ts[self._pos()]
+
+    @property
+    def actor(self) -> str:
+        return self._store.symbols.names[self._store._actor[self._pos()]]
+
+    @property
+    def text(self) -> str:
+        return self._store._text[self._pos()]
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self._store._text[self._pos()] = value
+
+    @property
+    def tags(self) -> List[str]:
+        names = self._store.symbols.names
+        return [names[t] for t in self._store._tagsets[self._store._tagset[self._pos()]]]
+
+    @property
+    def importance(self) -> float:
+        return self._store._importance[self._pos()]
+
+    @property
+    def topic_id(self) -> str:
+        return self._store.symbols.names[self._store._topic[self._pos()]]
+
+    @property
+    def day(self) -> Optional[int]:
+        day = self._store._day[self._pos()]
+        return None if day == _NO_DAY else day
+
+    @property
+    def repeat(self) -> int:
+        return self._store._repeat[self._pos()]
+
+    @repeat.setter
+    def repeat(self, value: int) -> None:
+        self._store._repeat[self._pos()] = value
+
+    @property
+    def last_ts(self) -> Optional[float]:
+        ts = self._store._last_ts[self._pos()]
+        return None if math.isnan(ts) else ts
+
+    @last_ts.setter
+    def last_ts(self, value: Optional[float]) -> None:
+        self._store._last_ts[self._pos()] = math.nan if value is None else value
+
+    def has_tag(self, tag: str) -> bool:
+        sid = self._store.symbols.get(tag)
+        return sid is not None and sid in self._store._tagsets[self._store._tagset[self._pos()]]
+
+    def model_dump(self) -> Dict[str, Any]:
+        return self._store.row(self._pos())
+
+    def model_copy(self) -> "Episode":
+        """Detached pydantic copy."""
+        from .models import Episode
+        return Episode.model_construct(**self.model_dump())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, EpisodeView):
+            if other._store is self._store and other._row == self._row:
+                return True
+            return self.model_dump() == other.model_dump()
+        dump = getattr(other, "model_dump", None)
+        return dump is not None and self.model_dump() == dump()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"EpisodeView({self.model_dump()!r})"
+
+class EpisodeStore:
+    """Columnar episode history: one typed array per field instead of one model per episode.
+
+    ts / importance / last_ts are float64 columns, day and repeat int32. Actor, topic and
+    tags are ids into ``symbols`` (shared with the owning PersonaState and saved once in
+    the state file); tag lists are interned per distinct combination; texts live in one
+    string list. Indexing returns ``EpisodeView`` handles.
+
+    An overlay (see ``overlay``) reads its first rows from a frozen base store and keeps
+    only the rows appended to it in its own columns; editing or dropping base rows
+    copies them in first.
+    """
+    __slots__ = (
+        "_ts", "_importance", "_actor", "_topic", "_tagset", "_day", "_repeat", "_last_ts", "_text",
+        "symbols", "_tagsets", "_tagset_ids", "_dropped", "_base", "_n_base",
+    )
+
+    def __init__(self, records: Iterable[Any] = (), symbols: Optional[SymbolTable] = None):
+        self._ts = array("d")
+        self._importance = array("d")
+        self._actor = array("I")
+        self._topic = array("I")
+        self._tagset = array("I")
+        self._day = array("i")
+        self._repeat = array("i")
+        self._last_ts = array("d")
+        self._text: List[str] = []
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self._tagsets: List[Tuple[int, ...]] = [()]
+        self._tagset_ids: Dict[Tuple[int, ...], int] = {(): 0}
+        self._dropped = 0  # rows removed from the front so far (keeps views stable)
+        self._base: Optional[EpisodeStore] = None  # overlay: rows 0.._n_base are read from here
+        self._n_base = 0
+        for rec in records:
+            self.append(rec)
+
+    def _tagset_id(self, tags: Tuple[int, ...]) -> int:
+        tid = self._tagset_ids.get(tags)
+        if tid is None:
+            tid = self._tagset_ids[tags] = len(self._tagsets)
+            self._tagsets.append(tags)
+        return tid
+
+    # --- writes --------------------------------------------------------
+    def append(self, ep: Any) -> None:
+        """Add an ``Episode``, ``EpisodeView`` or episode dict as the newest row."""
+        if isinstance(ep, dict):
+            self._append_dict(ep)
+            return
+        intern = self.symbols.intern
+        self._append(
+            ep.ts, intern(ep.actor), ep.text, tuple(intern(t) for t in ep.tags), ep.importance,
+            intern(ep.topic_id), ep.day, ep.repeat, ep.last_ts,
+        )
+
+    def _append_dict(self, data: Dict[str, Any]) -> None:
+        # defaults as in Episode; actor / topic / tags may be names or symbol ids
+        text = data["text"]
+        if not isinstance(text, str):
+            raise TypeError("text must be a string")
+        ts = data.get("ts")
+        if ts is None:
+            from .models import now
+            ts = now()
+        day = data.get("day")
+        last_ts = data.get("last_ts")
+        resolve = self.symbols.resolve
+        tags = data.get("tags")
+        self._append(
+            float(ts), resolve(data.get("actor", "user")), text, tuple(map(resolve, tags)) if tags else (),
+            float(data.get("importance", 0.5)), resolve(data.get("topic_id", "main")),
+            None if day is None else int(day), int(data.get("repeat", 1)),
+            None if last_ts is None else float(last_ts),
+        )
+
+    def _append(
+        self, ts: float, actor: int, text: str, tags: Tuple[int, ...], importance: float,
+        topic: int, day: Optional[int], repeat: int, last_ts: Optional[float],
+    ) -> None:
+        self._ts.append(ts)
+        self._importance.append(importance)
+        self._actor.append(actor)
+        self._topic.append(topic)
+        self._tagset.append(self._tagset_id(tags))
+        self._day.append(_NO_DAY if day is None else day)
+        self._repeat.append(repeat)
+        self._last_ts.append(math.nan if last_ts is None else last_ts)
+        self._text.append(text)
+
+    def overlay(self, symbols: Optional[SymbolTable] = None) -> "EpisodeStore":
+        """New store that reads the current rows from this one and appends to its own
+        columns (O(1), for forks). This store's first rows must not be edited or dropped
+        while the overlay reads them; ``symbols`` must extend this store's table."""
+        layer = EpisodeStore(symbols=symbols if symbols is not None else self.symbols)
+        layer._base = self
+        layer._n_base = len(self)
+        return layer
+
+    def reads_from(self, other: "EpisodeStore") -> bool:
+        """True if some of this store's rows are read from ``other`` (overlay chain)."""
+        base = self._base
+        while base is not None:
+            if base is other:
+                return True
+            base = base._base
+        return False
+
+    def _materialize(self) -> None:
+        # copy the base rows in (once) before they are edited or dropped
+        base, nb = self._base, self._n_base
+        if base is None:
+            return
+        flat = base.copy(self.symbols, stop=nb)
+        for rec in self.dump(nb, None, names=False):
+            flat._append_dict(rec)
+        for name in ("_ts", "_importance", "_actor", "_topic", "_tagset", "_day", "_repeat", "_last_ts", "_text", "_tagsets", "_tagset_ids"):
+            setattr(self, name, getattr(flat, name))
+        self._dropped -= nb  # views of own rows keep pointing at the same rows
+        self._base, self._n_base = None, 0
+
+    def writable(self, pos: int) -> EpisodeView:
+        """View of row ``pos`` that may be edited (base rows are copied in first)."""
+        if pos < self._n_base:
+            self._materialize()
+        return self[pos]
+
+    def drop_front(self, n: int) -> None:
+        """Remove the ``n`` oldest rows."""
+        self._materialize()
+        n = min(n, len(self._text))
+        for col in (self._ts, self._importance, self._actor, self._topic, self._tagset, self._day, self._repeat, self._last_ts, self._text):
+            del col[:n]
+        self._dropped += n
+
+    def copy(self, symbols: Optional[SymbolTable] = None, stop: Optional[int] = None) -> "EpisodeStore":
+        """Independent flat copy of the first ``stop`` rows (default all). ``symbols`` must
+        extend this store's table (e.g. a copy of it); by default the table is shared."""
+        symbols = symbols if symbols is not None else self.symbols
+        n = len(self) if stop is None else min(stop, len(self))
+        if self._base is not None:
+            clone = self._base.copy(symbols, stop=min(n, self._n_base))
+            for rec in self.dump(self._n_base, n, names=False):
+                clone._append_dict(rec)
+            return clone
+        clone = EpisodeStore.__new__(EpisodeStore)
+        for name in ("_ts", "_importance", "_actor", "_topic", "_tagset", "_day", "_repeat", "_last_ts", "_text"):
+            setattr(clone, name, getattr(self, name)[:n])
+        clone._tagsets = self._tagsets[:]
+        clone.symbols = symbols
+        clone._tagset_ids = dict(self._tagset_ids)
+        clone._dropped = self._dropped
+        clone._base, clone._n_base = None, 0
+        return clone
+
+    # --- reads ---------------------------------------------------------
+    def __len__(self) -> int:
+        return self._n_base + len(self._text)
+
+    @overload
+    def __getitem__(self, key: int) -> EpisodeView: ...
+    @overload
+    def __getitem__(self, key: slice) -> List[EpisodeView]: ...
+    def __getitem__(self, key: Union[int, slice]) -> Union[EpisodeView, List[EpisodeView]]:
+        n = len(self)
+        if isinstance(key, slice):
+            if self._base is not None:
+                return [self[i] for i in range(*key.indices(n))]
+            return [EpisodeView(self, self._dropped + i) for i in range(*key.indices(n))]
+        if key < 0:
+            key += n
+        if not 0 <= key < n:
+            raise IndexError("episode index out of range")
+        if key < self._n_base:
+            return self._base[key]  # type: ignore[index]
+        return EpisodeView(self, self._dropped + key - self._n_base)
+
+    def __iter__(self) -> Iterator[EpisodeView]:
+        dropped = self._dropped
+        own = (EpisodeView(self, dropped + i) for i in range(len(self._text)))
+        if self._base is not None:
+            return chain(islice(self._base, self._n_base), own)
+        return own
+
+    def index_rows(self, base: int, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, str, int, int, Tuple[int, ...]]]:
+        """(episode id, text, actor id, topic id, tag ids) for rows ``start:stop``."""
+        nb = self._n_base
+        stop = len(self) if stop is None else stop
+        if self._base is not None and start < nb:
+            yield from self._base.index_rows(base, start, min(stop, nb))
+        tagsets = self._tagsets
+        for pos in range(max(start, nb) - nb, stop - nb):
+            yield (base + nb + pos, self._text[pos], self._actor[pos], self._topic[pos], tagsets[self._tagset[pos]])
+
+    def matches(self, pos: int, actor: Optional[int], topic: Optional[int], tag: Optional[int]) -> bool:
+        """Row filter on symbol ids (None = any)."""
+        if pos < self._n_base:
+            return self._base.matches(pos, actor, topic, tag)  # type: ignore[union-attr]
+        pos -= self._n_base
+        return (
+            (actor is None or self._actor[pos] == actor)
+            and (topic is None or self._topic[pos] == topic)
+            and (tag is None or tag in self._tagsets[self._tagset[pos]])
+        )
+
+    def ts_slice(self, lo: int, hi: int) -> array[float]:
+        """Timestamps of rows ``lo:hi`` (a copy)."""
+        return self._column_slice("_ts", lo, hi)
+
+    def importance_slice(self, lo: int, hi: int) -> array[float]:
+        return self._column_slice("_importance", lo, hi)
+
+    def _column_slice(self, name: str, lo: int, hi: int) -> array[float]:
+        nb = self._n_base
+        if self._base is None or lo >= nb:
+            col: array[float] = getattr(self, name)
+            return col[lo - nb : hi - nb]
+        out = self._base._column_slice(name, lo, min(hi, nb))
+        if hi > nb:
+            out.extend(getattr(self, name)[: hi - nb])
+        return out
+
+    def row(self, pos: int, names: bool = True) -> Dict[str, Any]:
+        """Row ``pos`` as an episode dict: same keys, order and types as Episode.model_dump(),
+        or with actor / topic / tags as symbol ids (``names=False``, the state file form)."""
+        if pos < self._n_base:
+            return self._base.row(pos, names)  # type: ignore[union-attr]
+        pos -= self._n_base
+        day = self._day[pos]
+        last_ts = self._last_ts[pos]
+        actor, topic, tags = self._actor[pos], self._topic[pos], self._tagsets[self._tagset[pos]]
+        if names:
+            sym = self.symbols.names
+            return {
+                "ts": self._ts[pos], "actor": sym[actor], "text": self._text[pos], "tags": [sym[t] for t in tags],
+                "importance": self._importance[pos], "topic_id": sym[topic],
+                "day": None if day == _NO_DAY else day, "repeat": self._repeat[pos],
+                "last_ts": None if math.isnan(last_ts) else last_ts,
+            }
+        return {
+            "ts": self._ts[pos], "actor": actor, "text": self._text[pos], "tags": list(tags),
+            "importance": self._importance[pos], "topic_id": topic,
+            "day": None if day == _NO_DAY else day, "repeat": self._repeat[pos],
+            "last_ts": None if math.isnan(last_ts) else last_ts,
+        }
+
+    def dump(self, start: int = 0, stop: Optional[int] = None, names: bool = True) -> List[Dict[str, Any]]:
+        """Rows ``start:stop`` as episode dicts (see ``row``)."""
+        return [self.row(pos, names) for pos in range(*slice(start, stop).indices(len(self)))]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, EpisodeStore):
+            return self.dump() == other.dump()
+        if isinstance(other, list):
+            return len(other) == len(self) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"EpisodeStore(len={len(self)})"
+
+    # --- pydantic ------------------------------------------------------
+    @classmethod
+    def validate(cls, value: Any, symbols: Optional[SymbolTable] = None) -> "EpisodeStore":
+        if isinstance(value, EpisodeStore):
+            return value
+        if not isinstance(value, (list, tuple)):
+            raise ValueError("episodes must be a list")
+        store = cls(symbols=symbols)
+        for i, rec in enumerate(value):
+            try:
+                store.append(rec)
+            except (KeyError, TypeError, AttributeError, IndexError) as e:
+                raise ValueError(f"episodes[{i}]: invalid episode ({e!r})") from None
+        return store
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        def validate(value: Any, info: core_schema.ValidationInfo) -> EpisodeStore:
+            # inside PersonaState, ids refer to its ``symbols`` field (validated first)
+            data = info.data if info.data is not None else {}
+            return cls.validate(value, data.get("symbols"))
+        return core_schema.with_info_plain_validator_function(
+            validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda store: store.dump(names=False)),
+        )
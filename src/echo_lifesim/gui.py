@@ -53,7 +53,7 @@ with st.sidebar:
         st.warning("Zurückgesetzt.")
     st.markdown("### Epoch / Research")
     if st.button("Epoch +1", help="Forciert Epochenwechsel: ggf. Artefakt + Life-Phase-Prüfung"):
-        art = engine.state.advance_epoch()
+        art = engine.advance_epoch()
         st.success(f"Epoch {engine.state.epoch} -> Artifact: {art.title}")
     if st.button("Toggle Web Research", help="Aktiviert/Deaktiviert experimentelles Recherche-Skill Fenster"):
         engine.state.web_research_enabled = not engine.state.web_research_enabled
@@ -199,7 +199,7 @@ with col_state:
     tab_objs = st.tabs(topics)
     for t_idx, t in enumerate(topics):
         with tab_objs[t_idx]:
-            filtered = [ep for ep in reversed(engine.state.episodes) if ep.topic_id == t][:10]
+            filtered = engine.state.last_episodes(10, topic=t)
             for ep in filtered:
                 st.write(f"[{ep.actor}] {ep.text}")
     st.markdown("### Thoughts")
@@ -0,0 +1,185 @@
+from __future__ import annotations
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, Tuple, TypeVar, Union
+import asyncio
+import inspect
+import re
+import orjson
+from .engine import AsyncPersonaReply, LifeSimEngine
+from .models import PersonaState
+from .persistence import load_state, save_state
+
+T = TypeVar("T")
+Job = Callable[[LifeSimEngine], Union[T, Awaitable[T]]]
+
+DEFAULT_PERSONA_DIR = Path("personas")
+_PERSONA_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+def state_footprint(state: PersonaState) -> int:
+    """Approximate resident size of a persona: its serialized state in bytes."""
+    return len(orjson.dumps(state.model_dump()))
+
+class _PersonaActor:
+    """One persona: an engine plus a mailbox drained by a single task (no concurrent access)."""
+    def __init__(self, engine: LifeSimEngine, footprint: int):
+        self.engine = engine
+        self.footprint = footprint
+        self.pending = 0  # queued + running jobs and unfinished reply enrichments (pin the actor)
+        self.calls = 0
+        self.mailbox: asyncio.Queue[Tuple[Job[Any], asyncio.Future[Any]]] = asyncio.Queue()
+        self.task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            job, fut = await self.mailbox.get()
+            try:
+                result = job(self.engine)
+                if inspect.isawaitable(result):
+                    result = await result
+                if not fut.done():
+                    fut.set_result(result)
+            except Exception as e:  # delivered to the caller, the actor keeps running
+                if not fut.done():
+                    fut.set_exception(e)
+            finally:
+                self.pending -= 1
+                self.calls += 1
+
+    def stop(self) -> None:
+        # only called while idle: the task is parked on mailbox.get()
+        self.task.cancel()
+
+class PersonaHost:
+    """Serves many personas from one process.
+
+    Every persona id maps to an actor with its own mailbox, so calls for one persona run
+    strictly one after another while different personas interleave on the event loop.
+    Catalogs come from the process-wide ``get_registry()`` and are shared by all engines.
+    Idle personas are written to ``<state_dir>/<id>.json`` and dropped in LRU order once
+    more than ``max_resident`` are loaded or their summed footprint exceeds
+    ``memory_budget`` bytes; the next call loads them again.
+    """
+    def __init__(
+        self,
+        state_dir: Path = DEFAULT_PERSONA_DIR,
+        max_resident: int = 256,
+        memory_budget: Optional[int] = None,
+        footprint_every: int = 32,
+    ):
+        self.state_dir = state_dir
+        self.max_resident = max(1, max_resident)
+        self.memory_budget = memory_budget
+        self.footprint_every = max(1, footprint_every)
+        self.resident_bytes = 0
+        self.loads = 0
+        self.evictions = 0
+        self._actors: "OrderedDict[str, _PersonaActor]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._actors)
+
+    def __contains__(self, persona_id: object) -> bool:
+        return persona_id in self._actors
+
+    def path_for(self, persona_id: str) -> Path:
+        if not _PERSONA_ID.match(persona_id):
+            raise ValueError(f"invalid persona id: {persona_id!r}")
+        return self.state_dir / f"{persona_id}.json"
+
+    def _actor(self, persona_id: str) -> _PersonaActor:
+        actor = self._actors.get(persona_id)
+        if actor is not None:
+            self._actors.move_to_end(persona_id)
+            return actor
+        state = load_state(self.path_for(persona_id))
+        actor = _PersonaActor(LifeSimEngine(state), state_footprint(state))
+        self._actors[persona_id] = actor
+        self.resident_bytes += actor.footprint
+        self.loads += 1
+        return actor
+
+    async def call(self, persona_id: str, job: Job[T]) -> T:
+        """Run ``job(engine)`` on the persona's actor (sync or async job) and return its result."""
+        return await self._submit(self._actor(persona_id), job)
+
+    async def _submit(self, actor: _PersonaActor, job: Job[T]) -> T:
+        fut: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        actor.pending += 1
+        actor.mailbox.put_nowait((job, fut))
+        try:
+            return await fut
+        finally:
+            if actor.calls % self.footprint_every == 0 and actor.pending == 0:
+                new = state_footprint(actor.engine.state)
+                self.resident_bytes += new - actor.footprint
+                actor.footprint = new
+            self._evict()
+
+    async def reply(self, persona_id: str, text: str, event_key: Optional[str] = None) -> AsyncPersonaReply:
+        """Local reply without waiting on the LLM (``persona_reply_async``).
+
+        The enrichment runs outside the mailbox, writes its edit back through it, and keeps
+        the persona resident until then, so eviction never saves a state with an edit
+        still in flight.
+        """
+        actor = self._actor(persona_id)
+
+        async def edit(ep_id: int, final: str) -> None:
+            await self._submit(actor, lambda e: e.state.replace_episode_text(ep_id, final))
+
+        async def job(engine: LifeSimEngine) -> AsyncPersonaReply:
+            result = await engine.persona_reply_async(text, event_key, apply_edit=edit)
+            task = result["enriched"]
+            if task is not None:
+                actor.pending += 1  # still inside the mailbox: cannot be evicted in between
+                task.add_done_callback(lambda _t: self._enrichment_done(actor))
+            return result
+
+        return await self._submit(actor, job)
+
+    def _enrichment_done(self, actor: _PersonaActor) -> None:
+        actor.pending -= 1
+        self._evict()
+
+    async def act(self, persona_id: str, label: Optional[str]) -> None:
+        await self.call(persona_id, lambda e: e.apply_action_result(label))
+
+    def _over_budget(self) -> bool:
+        if len(self._actors) > self.max_resident:
+            return True
+        return self.memory_budget is not None and self.resident_bytes > self.memory_budget
+
+    def _evict(self) -> None:
+        while self._over_budget():
+            victim = next((pid for pid, a in self._actors.items() if a.pending == 0), None)
+            if victim is None:  # everything resident is busy
+                return
+            self.evict(victim)
+
+    def evict(self, persona_id: str) -> bool:
+        """Persist and unload an idle persona. No await between unload and save, so a
+        concurrent call either still sees the actor or loads the saved file."""
+        actor = self._actors.get(persona_id)
+        if actor is None or actor.pending:
+            return False
+        del self._actors[persona_id]
+        actor.stop()
+        self._save(persona_id, actor.engine.state)
+        self.resident_bytes -= actor.footprint
+        self.evictions += 1
+        return True
+
+    def _save(self, persona_id: str, state: PersonaState) -> None:
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        save_state(state, self.path_for(persona_id))
+        if state.archive is not None:
+            state.archive.close()
+
+    async def close(self) -> None:
+        """Wait for queued work, then persist and stop every resident persona."""
+        while self._actors:
+            stopped = [a.task for pid, a in list(self._actors.items()) if self.evict(pid)]
+            # cancelled actors finish on the next loop turn; busy ones (e.g. waiting on an
+            # enrichment) get time to drain
+            await asyncio.gather(*stopped, asyncio.sleep(0 if stopped else 0.01), return_exceptions=True)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+import re
+from bisect import bisect_left, insort
+from typing import Dict, Generic, Hashable, Iterable, List, TypeVar
+
+_TOKEN_RE = re.compile(r"\w+")
+MIN_TOKEN_LEN = 3
+
+K = TypeVar("K", bound=Hashable)
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens used for indexing and queries (short tokens dropped)."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) >= MIN_TOKEN_LEN]
+
+class PositionIndex(Generic[K]):
+    """key -> ascending absolute episode ids (actor, topic, tag symbol ids, tokens, ...).
+
+    Appends are O(1) per key; "last n where" queries walk a posting list from its tail.
+    """
+    def __init__(self) -> None:
+        self._postings: Dict[K, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def add_key(self, key: K, ep_id: int) -> None:
+        self._postings.setdefault(key, []).append(ep_id)
+
+    def ids(self, key: K) -> List[int]:
+        return self._postings.get(key, [])
+
+    def prune_before(self, min_id: int) -> None:
+        empty: List[K] = []
+        for key, ids in self._postings.items():
+            cut = bisect_left(ids, min_id)
+            if cut:
+                del ids[:cut]
+                if not ids:
+                    empty.append(key)
+        for key in empty:
+            del self._postings[key]
+
+class TokenIndex(PositionIndex[str]):
+    """Inverted index token -> ascending episode ids.
+
+    Ids are absolute episode ids (see ``PersonaState.episode_base``), so appends are
+    O(tokens) and pruning old history only trims the head of each posting list.
+    """
+    def add(self, ep_id: int, text: str) -> None:
+        for tok in set(tokenize(text)):
+            self._postings.setdefault(tok, []).append(ep_id)
+
+    def replace(self, ep_id: int, old_text: str, new_text: str) -> None:
+        """Re-index an edited episode (postings stay sorted)."""
+        old, new = set(tokenize(old_text)), set(tokenize(new_text))
+        for tok in old - new:
+            ids = self._postings.get(tok)
+            if ids is None:
+                continue
+            i = bisect_left(ids, ep_id)
+            if i < len(ids) and ids[i] == ep_id:
+                del ids[i]
+                if not ids:
+                    del self._postings[tok]
+        for tok in new - old:
+            insort(self._postings.setdefault(tok, []), ep_id)
+
+    def hits(self, tokens: Iterable[str]) -> Dict[int, int]:
+        """Episode id -> number of query tokens it contains (duplicates count, like the old scan)."""
+        counts: Dict[int, int] = {}
+        for tok in tokens:
+            for ep_id in self._postings.get(tok, ()):
+                counts[ep_id] = counts.get(ep_id, 0) + 1
+        return counts
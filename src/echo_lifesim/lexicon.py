@@ -0,0 +1,123 @@
+from __future__ import annotations
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+# used when lexicon/lexicon.json is missing (the keywords ingest_user_input hard-coded before)
+DEFAULT_LEXICON: Dict[str, Any] = {
+    "default_topic": "main",
+    "topics": {
+        "work": {"arbeit": 1.0, "job": 1.0, "projekt": 1.0},
+        "social": {"freund": 1.0, "sozial": 1.0, "famil": 1.0},
+        "health": {"gesund": 1.0, "körper": 1.0, "sport": 1.0},
+    },
+    "preferences": ["morgens", "abends", "ruhig", "fokus"],
+}
+
+class AhoCorasick:
+    """Multi-pattern substring matcher: one pass over the text finds every occurrence of
+    every pattern, at a per-character cost independent of the number of patterns."""
+    def __init__(self, patterns: List[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        for pid, pat in enumerate(patterns):
+            node = 0
+            for ch in pat:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(pid)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> List[int]:
+        """Pattern ids of all matches, in order of their end position."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        hits: List[int] = []
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                hits.extend(out[node])
+        return hits
+
+def _keywords_ok(words: Any) -> bool:
+    if isinstance(words, list):
+        return all(isinstance(w, str) and w for w in words)
+    return isinstance(words, dict) and all(
+        isinstance(w, str) and w and isinstance(v, (int, float)) and v > 0 for w, v in words.items()
+    )
+
+def validate_lexicon(data: Any) -> Optional[str]:
+    if not isinstance(data, dict):
+        return "not an object"
+    if not isinstance(data.get("default_topic", "main"), str):
+        return "default_topic must be a string"
+    topics = data.get("topics", {})
+    if not isinstance(topics, dict) or not all(_keywords_ok(v) for v in topics.values()):
+        return "topics must map topic ids to keyword lists or {keyword: weight > 0}"
+    prefs = data.get("preferences", [])
+    if not isinstance(prefs, list) or not _keywords_ok(prefs):
+        return "preferences must be a list of keywords"
+    return None
+
+class Lexicon:
+    """Topic and preference keywords compiled into one automaton.
+
+    Topic score = summed weight of the distinct keywords found; the best topic wins,
+    ties go to the topic listed first. Preferences are reported once each, in file order.
+    Matching is on lowercased substrings, like the inline checks it replaces.
+    """
+    def __init__(self, data: Dict[str, Any]):
+        self.default_topic: str = data.get("default_topic", "main")
+        self.topics: List[str] = list(data.get("topics", {}))
+        self.preferences: List[str] = [p.lower() for p in data.get("preferences", [])]
+        index: Dict[str, int] = {}
+        self._payload: List[List[Tuple[int, float]]] = []  # pattern -> [(topic idx | -1 - pref idx, weight)]
+
+        def pattern(word: str) -> List[Tuple[int, float]]:
+            word = word.lower()
+            if word not in index:
+                index[word] = len(self._payload)
+                self._payload.append([])
+            return self._payload[index[word]]
+
+        for t_idx, (topic, words) in enumerate(data.get("topics", {}).items()):
+            weighted = words if isinstance(words, dict) else {w: 1.0 for w in words}
+            for word, weight in weighted.items():
+                pattern(word).append((t_idx, float(weight)))
+        for p_idx, word in enumerate(self.preferences):
+            pattern(word).append((-1 - p_idx, 0.0))
+        self._matcher = AhoCorasick(list(index))
+
+    def scan(self, text: str) -> Tuple[str, List[str]]:
+        """(topic id, preference keywords present) for ``text`` in a single pass."""
+        scores = [0.0] * len(self.topics)
+        prefs = [False] * len(self.preferences)
+        for pid in set(self._matcher.find(text.lower())):
+            for slot, weight in self._payload[pid]:
+                if slot >= 0:
+                    scores[slot] += weight
+                else:
+                    prefs[-1 - slot] = True
+        topic = self.default_topic
+        best = 0.0
+        for t_idx, score in enumerate(scores):
+            if score > best:
+                topic, best = self.topics[t_idx], score
+        return topic, [p for p, hit in zip(self.preferences, prefs) if hit]
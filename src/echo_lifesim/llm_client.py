@@ -1,7 +1,9 @@
 from __future__ import annotations
 import os
 import httpx
-from typing import Optional
+from typing import Any, Optional
+import asyncio
+import weakref
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -23,6 +25,44 @@ MODEL_HINTS = {
     "mixtral-8x7b-32768": "Mixture-of-Experts, längerer Kontext, balanced speed.",
 }
 
+def _payload(model: str, system: str, user: str, max_tokens: int) -> dict[str, Any]:
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ],
+        "max_tokens": max_tokens,
+        "temperature": 0.4,
+    }
+
+def _headers(api_key: str) -> dict[str, str]:
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+    }
+
+def _content(data: Any, max_tokens: int) -> str:
+    return str(data.get("choices", [{}])[0].get("message", {}).get("content", ""))[:max_tokens]
+
+def _describe_error(e: Exception) -> tuple[bool, str]:
+    """(fatal, message) for a failed request; fatal errors are returned without retrying."""
+    if isinstance(e, httpx.HTTPStatusError):
+        code = e.response.status_code
+        if code == 401:
+            return True, "[LLM] Auth fehlgeschlagen (401). Prüfe GROQ_API_KEY."
+        if code == 429:
+            return False, "Rate Limit (429) – warte kurz oder reduziere Frequenz."
+        if 500 <= code < 600:
+            return False, f"Serverfehler {code} – transient?"
+        return False, f"HTTP {code}: {e.response.text[:80]}"
+    if isinstance(e, httpx.TimeoutException):
+        return False, "Timeout"
+    return False, f"{type(e).__name__}: {e}"[:140]  # pragma: no cover
+
+def _give_up(last_err: str) -> str:
+    return f"[LLM] Fehlgeschlagen nach {MAX_RETRIES+1} Versuchen: {last_err}"[:200]
+
 class GroqClient:
     def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
         self.api_key = api_key or GROQ_API_KEY
@@ -49,44 +89,22 @@ class GroqClient:
     def chat(self, system: str, user: str, max_tokens: int = 280) -> str:
         if not self.api_key:
             raise RuntimeError("GROQ_API_KEY nicht gesetzt.")
-        payload = {
-            "model": self.model,
-            "messages": [
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
-            "max_tokens": max_tokens,
-            "temperature": 0.4,
-        }
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+        payload = _payload(self.model, system, user, max_tokens)
+        headers = _headers(self.api_key)
         last_err: str = ""
         for attempt in range(1, MAX_RETRIES + 2):
             try:
                 r = self._client.post(GROQ_BASE_URL, json=payload, headers=headers)
                 r.raise_for_status()
-                data = r.json()
-                return data.get("choices", [{}])[0].get("message", {}).get("content", "")[:max_tokens]
-            except httpx.HTTPStatusError as e:
-                code = e.response.status_code
-                if code == 401:
-                    return "[LLM] Auth fehlgeschlagen (401). Prüfe GROQ_API_KEY."
-                if code == 429:
-                    last_err = "Rate Limit (429) – warte kurz oder reduziere Frequenz."
-                elif 500 <= code < 600:
-                    last_err = f"Serverfehler {code} – transient?"
-                else:
-                    last_err = f"HTTP {code}: {e.response.text[:80]}"
-            except httpx.TimeoutException:
-                last_err = "Timeout"
-            except Exception as e:  # pragma: no cover
-                last_err = f"{type(e).__name__}: {e}"[:140]
+                return _content(r.json(), max_tokens)
+            except Exception as e:
+                fatal, last_err = _describe_error(e)
+                if fatal:
+                    return last_err
             # simple backoff
             if attempt <= MAX_RETRIES:
                 continue
-        return f"[LLM] Fehlgeschlagen nach {MAX_RETRIES+1} Versuchen: {last_err}"[:200]
+        return _give_up(last_err)
 
     # Placeholder for future Responses API integration (stream/tool usage)
     def respond(self, system: str, user: str) -> str:  # pragma: no cover
@@ -108,7 +126,46 @@ class GroqClient:
             "retries": MAX_RETRIES,
         }
 
+class AsyncGroqClient:
+    """Non-blocking twin of GroqClient (httpx.AsyncClient); many chats can await concurrently."""
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+        self.api_key = api_key or GROQ_API_KEY
+        self.model = model or get_groq().model
+        self._client = httpx.AsyncClient(timeout=TIMEOUT)
+
+    def available(self) -> bool:
+        return bool(self.api_key)
+
+    async def chat(self, system: str, user: str, max_tokens: int = 280) -> str:
+        if not self.api_key:
+            raise RuntimeError("GROQ_API_KEY nicht gesetzt.")
+        payload = _payload(self.model, system, user, max_tokens)
+        headers = _headers(self.api_key)
+        last_err: str = ""
+        for _attempt in range(1, MAX_RETRIES + 2):
+            try:
+                r = await self._client.post(GROQ_BASE_URL, json=payload, headers=headers)
+                r.raise_for_status()
+                return _content(r.json(), max_tokens)
+            except Exception as e:
+                fatal, last_err = _describe_error(e)
+                if fatal:
+                    return last_err
+        return _give_up(last_err)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
 _groq_singleton: Optional[GroqClient] = None
+# httpx async pools are bound to an event loop -> one client per running loop
+_async_groq_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncGroqClient]" = weakref.WeakKeyDictionary()
+
+def get_async_groq() -> AsyncGroqClient:
+    loop = asyncio.get_running_loop()
+    client = _async_groq_clients.get(loop)
+    if client is None:
+        client = _async_groq_clients[loop] = AsyncGroqClient()
+    return client
 
 def get_groq() -> GroqClient:
     global _groq_singleton
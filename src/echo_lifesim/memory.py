@@ -1,21 +1,237 @@
 from __future__ import annotations
-from typing import List
-from .models import Episode, PersonaState
+from collections import OrderedDict
+from typing import Dict, List, Literal, Optional, Sequence, Tuple
+import numpy as np
+from .models import Episode, EpisodeLike, PersonaState
+from .rollup import EpisodeSummary
+from .semantic import SemanticIndex, normalize_text
+from .indexing import tokenize
+from .scoring import (
+    EpisodeScorer, hit_matrix, hits_to_arrays, score_records, top_k_scored,
+    OVERLAP_WEIGHT, IMPORTANCE_WEIGHT, RECENCY_WEIGHT,
+)
+
+CacheKey = Tuple[Tuple[str, ...], int, int, str]
+RetrievalMode = Literal["lexical", "semantic", "hybrid"]
+
+class RetrievalCache:
+    """Bounded LRU of retrieval results keyed by (query tokens, k, state revision, mode).
+
+    Any episode mutation bumps the revision, so stale entries can never match again;
+    they simply age out of the LRU.
+    """
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: OrderedDict[CacheKey, List[EpisodeLike]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: CacheKey) -> Optional[List[EpisodeLike]]:
+        found = self._data.get(key)
+        if found is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return list(found)
+
+    def put(self, key: CacheKey, value: List[EpisodeLike]) -> None:
+        if self.maxsize <= 0:
+            return
+        self._data[key] = list(value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self._data), "maxsize": self.maxsize}
+
+Ranked = List[Tuple[float, int, EpisodeLike]]
+
+SUMMARY_IMPORTANCE = 0.5
+SUMMARY_OVERLAP_DISCOUNT = 0.8  # an aggregate match is weaker evidence than a raw episode
+SUMMARY_ID_OFFSET = -(1 << 40)
 
 class MemoryIndex:
-    """Simple heuristic retrieval without vectors."""
-    def __init__(self, state: PersonaState):
+    """Heuristic retrieval without vectors, backed by the state's inverted token index.
+
+    Hot episodes are searched first; if none of them covers at least ``archive_threshold``
+    of the query tokens, the roll-up summaries and the cold archive (if any) are searched too.
+    ``mode`` selects exact token overlap ("lexical"), hashed n-gram similarity via an LSH
+    index ("semantic", built lazily on first use) or the better of both ("hybrid").
+    """
+    def __init__(self, state: PersonaState, cache_size: int = 256, archive_threshold: float = 0.5,
+                 archive_pool: int = 32, mode: RetrievalMode = "lexical", semantic_pool: int = 32):
         self.state = state
+        self.scorer = EpisodeScorer()
+        self.cache = RetrievalCache(cache_size)
+        self.archive_threshold = archive_threshold
+        self.archive_pool = archive_pool
+        self.mode: RetrievalMode = mode
+        self.semantic_pool = semantic_pool
+        self._semantic: Optional[SemanticIndex] = None
 
-    def relevance(self, ep: Episode, query_tokens: List[str], now: float) -> float:
-        overlap = sum(1 for t in query_tokens if t in ep.text.lower())
+    def relevance(self, ep: EpisodeLike, query_tokens: List[str], now: float) -> float:
+        ep_tokens = set(tokenize(ep.text))
+        overlap = sum(1 for t in query_tokens if t in ep_tokens)
         overlap_score = overlap / max(1, len(query_tokens))
         recency = 1.0 / (1.0 + (now - ep.ts) / 3600.0)
-        return overlap_score * 0.7 + ep.importance * 0.3 + recency * 0.2
-
-    def retrieve(self, query: str, k: int = 5) -> List[Episode]:
-        tokens = [t for t in query.lower().split() if len(t) > 2]
-        now = self.state.episodes[-1].ts if self.state.episodes else 0.0
-        scored = [ (self.relevance(ep, tokens, now), ep) for ep in self.state.episodes[-100:] ]
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [ep for _score, ep in scored[:k]]
+        return overlap_score * OVERLAP_WEIGHT + ep.importance * IMPORTANCE_WEIGHT + recency * RECENCY_WEIGHT
+
+    def _candidates(self, tokens: List[str], k: int) -> Dict[int, int]:
+        s = self.state
+        hits = s.match_tokens(tokens)
+        # newest episodes always compete so recency/importance still rank non-matching queries
+        end = s.episode_base + len(s.episodes)
+        for ep_id in range(max(s.episode_base, end - k), end):
+            hits.setdefault(ep_id, 0)
+        return hits
+
+    def _episodes(self, ids: List[int]) -> List[EpisodeLike]:
+        eps = self.state.episodes
+        base = self.state.episode_base
+        return [eps[i - base] for i in ids]
+
+    def _key(self, query: str, tokens: List[str], k: int, mode: RetrievalMode) -> CacheKey:
+        words = tokens if mode == "lexical" else normalize_text(query).split()
+        return (tuple(words), k, self.state.revision, mode)
+
+    def semantic_index(self) -> SemanticIndex:
+        if self._semantic is None:
+            self._semantic = SemanticIndex()
+        self._semantic.sync(self.state)
+        return self._semantic
+
+    def _match(self, query: str, tokens: List[str], k: int, mode: RetrievalMode) -> Tuple[np.ndarray, np.ndarray]:
+        """Candidate ids and match strength in [0, 1] (token coverage and/or cosine similarity)."""
+        hits = self._candidates(tokens, k)
+        n_tokens = max(1, len(tokens))
+        if mode == "lexical":
+            ids, counts = hits_to_arrays(hits)
+            return ids, counts / n_tokens
+        if mode == "hybrid":
+            strength = {ep_id: count / n_tokens for ep_id, count in hits.items()}
+        else:
+            strength = {ep_id: 0.0 for ep_id, count in hits.items() if count == 0}  # keep recency fallback
+        for ep_id, sim in self.semantic_index().query(query, max(k, self.semantic_pool)):
+            strength[ep_id] = max(strength.get(ep_id, 0.0), sim, 0.0)
+        ids = np.fromiter(strength.keys(), dtype=np.int64, count=len(strength))
+        return ids, np.fromiter(strength.values(), dtype=np.float64, count=len(strength))
+
+    def retrieve(self, query: str, k: int = 5, mode: Optional[RetrievalMode] = None) -> List[EpisodeLike]:
+        if not self.state.episodes or k <= 0:
+            return []
+        mode = mode or self.mode
+        tokens = tokenize(query)
+        key = self._key(query, tokens, k, mode)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        self.scorer.sync(self.state)
+        ids, strength = self._match(query, tokens, k, mode)
+        scores = self.scorer.score(ids, strength, 1)
+        best = float(strength.max()) if len(strength) else 0.0
+        result = self._finish(tokens, k, best, top_k_scored(ids, scores, k))
+        self.cache.put(key, result)
+        return result
+
+    def _finish(self, tokens: List[str], k: int, best: float, hot: List[Tuple[int, float]]) -> List[EpisodeLike]:
+        ranked: Ranked = [(sc, ep_id, ep) for (ep_id, sc), ep in zip(hot, self._episodes([i for i, _ in hot]))]
+        if tokens and best < self.archive_threshold:
+            ranked.extend(self._archive_ranked(tokens, k))
+            ranked.extend(self._summary_ranked(tokens))
+            ranked.sort(key=lambda x: (x[0], x[1]), reverse=True)
+        return [ep for _sc, _id, ep in ranked[:k]]
+
+    def _summaries_scored(self, tokens: List[str]) -> List[Tuple[float, int, EpisodeSummary]]:
+        matched = [(i, sm, sum(1 for t in tokens if t in sm.token_counts)) for i, sm in enumerate(self.state.summaries)]
+        matched = [m for m in matched if m[2]]
+        if not matched:
+            return []
+        scores = score_records(
+            np.full(len(matched), SUMMARY_IMPORTANCE), np.array([sm.ts_last for _i, sm, _o in matched]),
+            np.array([o for _i, _sm, o in matched], dtype=np.float64) * SUMMARY_OVERLAP_DISCOUNT,
+            len(tokens), self.scorer.now(),
+        )
+        return [(float(sc), i, sm) for (i, sm, _o), sc in zip(matched, scores)]
+
+    def _summary_ranked(self, tokens: List[str]) -> Ranked:
+        # summaries rank below archived episodes on ties
+        return [
+            (sc, SUMMARY_ID_OFFSET + i, Episode(actor="summary", text=sm.text(), ts=sm.ts_last, topic_id=sm.topic_id,
+                                                tags=["summary", sm.level], day=sm.day))
+            for sc, i, sm in self._summaries_scored(tokens)
+        ]
+
+    def retrieve_summaries(self, query: str, k: int = 5) -> List[EpisodeSummary]:
+        """Search only the roll-up hierarchy (a few hundred records for years of history)."""
+        self.scorer.sync(self.state)
+        scored = self._summaries_scored(tokenize(query))
+        scored.sort(key=lambda x: (x[0], x[1]), reverse=True)
+        return [sm for _sc, _i, sm in scored[:k]]
+
+    def _archive_ranked(self, tokens: List[str], k: int) -> Ranked:
+        archive = self.state.archive
+        if archive is None or not len(archive):
+            return []
+        hits = archive.search(tokens)
+        if not hits:
+            return []
+        pos, counts = hits_to_arrays(hits)
+        # pre-select by raw overlap so only a small pool of records is ever decoded
+        pool = top_k_scored(pos, counts, max(k, self.archive_pool))
+        episodes = [Episode(**rec) for rec in archive.get_many(p for p, _c in pool)]
+        scores = score_records(
+            np.array([ep.importance for ep in episodes]), np.array([ep.ts for ep in episodes]),
+            np.array([c for _p, c in pool]), len(tokens), self.scorer.now(),
+        )
+        # archived ids sort below every hot id, so hot episodes win ties
+        return [(float(sc), p - len(archive), ep) for (p, _c), sc, ep in zip(pool, scores, episodes)]
+
+    def retrieve_many(self, queries: Sequence[str], k: int = 5, mode: Optional[RetrievalMode] = None) -> List[List[EpisodeLike]]:
+        """Batch retrieval: lexical cache misses are scored against one shared candidate matrix."""
+        if not self.state.episodes or k <= 0:
+            return [[] for _ in queries]
+        mode = mode or self.mode
+        if mode != "lexical":
+            return [self.retrieve(q, k, mode) for q in queries]
+        results: List[Optional[List[EpisodeLike]]] = []
+        todo: List[Tuple[int, List[str], CacheKey]] = []
+        for q, query in enumerate(queries):
+            tokens = tokenize(query)
+            key = self._key(query, tokens, k, mode)
+            cached = self.cache.get(key)
+            results.append(cached)
+            if cached is None:
+                todo.append((q, tokens, key))
+        if todo:
+            for (q, _tokens, key), found in zip(todo, self._score_batch([t for _q, t, _k in todo], k)):
+                results[q] = found
+                self.cache.put(key, found)
+        return [r or [] for r in results]
+
+    def _score_batch(self, token_lists: List[List[str]], k: int) -> List[List[EpisodeLike]]:
+        self.scorer.sync(self.state)
+        per_query = [self._candidates(tokens, k) for tokens in token_lists]
+        union: set[int] = set()
+        for hits in per_query:
+            union.update(hits)
+        ids = np.fromiter(sorted(union), dtype=np.int64, count=len(union))
+        n_tokens = np.array([len(t) for t in token_lists], dtype=np.float64)
+        scores = self.scorer.score_many(ids, hit_matrix(per_query, ids), n_tokens)
+        out: List[List[EpisodeLike]] = []
+        for q, hits in enumerate(per_query):
+            # restrict each row to its own candidate set (same result as retrieve)
+            mask = np.isin(ids, np.fromiter(hits.keys(), dtype=np.int64, count=len(hits)))
+            best = max(hits.values(), default=0) / max(1, len(token_lists[q]))
+            out.append(self._finish(token_lists[q], k, best, top_k_scored(ids[mask], scores[q][mask], k)))
+        return out
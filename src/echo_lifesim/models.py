@@ -1,26 +1,67 @@
 from __future__ import annotations
-from pydantic import BaseModel, Field
-from typing import List, Literal, Dict, Any
+from pydantic import BaseModel, Field, GetCoreSchemaHandler, PrivateAttr, field_serializer
+from pydantic_core import SchemaValidator, core_schema
+from typing import Callable, Deque, Iterator, List, Literal, Dict, Any, Optional, Iterable, Sequence, Set, Tuple, Union, overload
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+import operator
 import time
+import weakref
+from .indexing import PositionIndex, TokenIndex
+from .archive import EpisodeArchive
+from .spill import SpillLog
+from .ranking import Ranking
+from .rollup import EpisodeSummary, summarize_days, consolidate
+from .dedupe import RecentFingerprints, fingerprint
+from .episodes import EpisodeStore, EpisodeView
+from .symbols import SymbolTable
+
+_clock: ContextVar[Callable[[], float]] = ContextVar("echo_lifesim_clock", default=time.time)
+
+def now() -> float:
+    """Wall clock used for all timestamps (swappable for record/replay, see ``use_clock``)."""
+    return _clock.get()()
+
+@contextmanager
+def use_clock(clock: Callable[[], float]) -> Iterator[None]:
+    token = _clock.set(clock)
+    try:
+        yield
+    finally:
+        _clock.reset(token)
 
 TimeBlock = Literal["MORNING", "MIDDAY", "EVENING", "NIGHT"]
 Location = Literal["HOME", "WORK", "OUTSIDE", "SOCIAL"]
 
+# history lists a fork shares with its parent until it first writes to them
+COW_FIELDS = ("thoughts", "notes", "artifacts", "summaries")  # episodes: see EpisodeStore.overlay
+EDIT_LOG_SIZE = 1024  # recent text edits kept for incremental index refresh
+
 NEED_KEYS = ["energy", "clarity", "connection", "order", "creativity", "calm"]
+TIME_BLOCKS: List[TimeBlock] = ["MORNING", "MIDDAY", "EVENING", "NIGHT"]
 
 class Episode(BaseModel):
-    ts: float = Field(default_factory=lambda: time.time())
+    ts: float = Field(default_factory=now)
     actor: str = "user"  # or "persona"
     text: str
     tags: List[str] = Field(default_factory=list)
     importance: float = 0.5
     topic_id: str = "main"
+    day: Optional[int] = None  # simulated day, stamped by PersonaState.add_episode
+    repeat: int = 1  # near-duplicates collapsed into this record
+    last_ts: Optional[float] = None  # ts of the latest collapsed duplicate
+
+# stored episodes come back as EpisodeView; synthesized ones (summaries, archive hits) as Episode
+EpisodeLike = Union[Episode, EpisodeView]
 
 class Thought(BaseModel):
-    ts: float = Field(default_factory=lambda: time.time())
+    ts: float = Field(default_factory=now)
     text: str
     source: str = "ticker"  # future: overmind, system, reflection
     refs: Dict[str, List[int] | List[str]] = Field(default_factory=dict)
+    repeat: int = 1
+    last_ts: Optional[float] = None
 
 class WorldEntity(BaseModel):
     id: str
@@ -61,34 +102,115 @@ class Item(BaseModel):
     passive_need_delta: Dict[str, int] = Field(default_factory=dict)  # applied each MORNING
     notes: str = ""
 
-class NeedState(BaseModel):
-    energy: int = 50
-    clarity: int = 50
-    connection: int = 50
-    order: int = 50
-    creativity: int = 50
-    calm: int = 50
+NEED_SLOTS: Dict[str, int] = {k: i for i, k in enumerate(NEED_KEYS)}
+NEED_MIN, NEED_MAX, NEED_MID = 0, 100, 50
+
+_needs_validator = SchemaValidator(core_schema.typed_dict_schema(
+    {k: core_schema.typed_dict_field(core_schema.int_schema(), required=False) for k in NEED_KEYS}
+))
+
+class _NeedSlot:
+    """Attribute access to one slot of ``NeedState._v``."""
+    __slots__ = ("slot",)
+
+    def __init__(self, need: str):
+        self.slot = NEED_SLOTS[need]
+
+    @overload
+    def __get__(self, obj: None, owner: Any) -> "_NeedSlot": ...
+    @overload
+    def __get__(self, obj: "NeedState", owner: Any) -> int: ...
+    def __get__(self, obj: Optional["NeedState"], owner: Any) -> Any:
+        return self if obj is None else obj._v[self.slot]
+
+    def __set__(self, obj: "NeedState", value: int) -> None:
+        obj._v[self.slot] = value
+
+class NeedState:
+    """The six needs as one int list indexed by ``NEED_SLOTS``.
+
+    Keeps the attribute API (``needs.energy``), keyword construction, validation and
+    ``model_dump`` of the former pydantic model; delta, clamp and decay run over the whole
+    list at once.
+    """
+    __slots__ = ("_v",)
+    energy = _NeedSlot("energy")
+    clarity = _NeedSlot("clarity")
+    connection = _NeedSlot("connection")
+    order = _NeedSlot("order")
+    creativity = _NeedSlot("creativity")
+    calm = _NeedSlot("calm")
+
+    def __init__(self, **values: int):
+        self._v = [NEED_MID] * len(NEED_KEYS)
+        if values:
+            for k, v in _needs_validator.validate_python(values).items():
+                self._v[NEED_SLOTS[k]] = v
 
     def apply_delta(self, **deltas: int) -> None:
-        for k, v in deltas.items():
-            if k in NEED_KEYS:
-                new_val = getattr(self, k) + v
-                setattr(self, k, max(0, min(100, new_val)))
+        v = self._v
+        for k, d in deltas.items():
+            slot = NEED_SLOTS.get(k)
+            if slot is not None:
+                x = v[slot] + d
+                v[slot] = NEED_MIN if x < NEED_MIN else NEED_MAX if x > NEED_MAX else x
+
+    def apply_vector(self, deltas: Sequence[int]) -> None:
+        """Add a delta per slot (``NEED_KEYS`` order) and clamp."""
+        self._v = [NEED_MIN if x < NEED_MIN else NEED_MAX if x > NEED_MAX else x for x in map(operator.add, self._v, deltas)]
+
+    def clamp(self) -> None:
+        self._v = [NEED_MIN if x < NEED_MIN else NEED_MAX if x > NEED_MAX else x for x in self._v]
 
     def decay_towards_mid(self, amount: int = 2) -> None:
-        for k in NEED_KEYS:
-            val = getattr(self, k)
-            if val > 50:
-                setattr(self, k, max(50, val - amount))
-            elif val < 50:
-                setattr(self, k, min(50, val + amount))
+        self._v = [
+            max(NEED_MID, x - amount) if x > NEED_MID else min(NEED_MID, x + amount) if x < NEED_MID else x
+            for x in self._v
+        ]
+
+    def vector(self) -> List[int]:
+        """Values in ``NEED_KEYS`` order (a copy)."""
+        return list(self._v)
+
+    def model_dump(self) -> Dict[str, int]:
+        return dict(zip(NEED_KEYS, self._v))
+
+    def model_copy(self) -> "NeedState":
+        clone = NeedState.__new__(NeedState)
+        clone._v = list(self._v)
+        return clone
+
+    @classmethod
+    def model_validate(cls, value: Any) -> "NeedState":
+        if isinstance(value, NeedState):
+            return value
+        if not isinstance(value, dict):
+            raise ValueError("needs must be an object")
+        return cls(**value)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls.model_validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda needs: needs.model_dump()),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, NeedState):
+            return self._v == other._v
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return "NeedState(" + ", ".join(f"{k}={v}" for k, v in zip(NEED_KEYS, self._v)) + ")"
 
 class Preference(BaseModel):
     key: str
     weight: float = 1.0
 
 class Note(BaseModel):
-    ts: float = Field(default_factory=lambda: time.time())
+    ts: float = Field(default_factory=now)
     text: str
 
 class PersonaProfile(BaseModel):
@@ -105,7 +227,9 @@ class PersonaProfile(BaseModel):
 class PersonaState(BaseModel):
     profile: PersonaProfile = Field(default_factory=PersonaProfile)
     needs: NeedState = Field(default_factory=NeedState)
-    episodes: List["Episode"] = Field(default_factory=list)
+    # actor / topic / tag names; episodes in the state file refer to them by position
+    symbols: SymbolTable = Field(default_factory=SymbolTable)
+    episodes: EpisodeStore = Field(default_factory=EpisodeStore)  # columnar, see episodes.py
     notes: List["Note"] = Field(default_factory=list)
     preferences: List["Preference"] = Field(default_factory=list)
     turn: int = 0
@@ -142,6 +266,7 @@ class PersonaState(BaseModel):
     stat_discipline: int = 0
     stat_insight: int = 0
     stat_resilience: int = 0
+    counters: Dict[str, int] = Field(default_factory=dict)  # incremental rule inputs (see rules.py)
     dream_night_flag: bool = False  # to avoid multiple dream generations per night
     # items & mastery & phases
     items: List[Item] = Field(default_factory=list)
@@ -153,33 +278,350 @@ class PersonaState(BaseModel):
     web_research_enabled: bool = False
     # history management
     max_episode_history: int = 400
+    episode_base: int = 0  # absolute id of episodes[0]; grows when history is compressed
+    archive_path: Optional[str] = None  # cold tier for compressed episodes (None = drop them)
+    # bounded buffers (0 = unbounded); trimmed once `history_slack` over capacity
+    max_live_episodes: int = 2000  # hard ceiling between epochs, evicted like advance_epoch does
+    max_thoughts: int = 1000
+    max_notes: int = 500
+    history_slack: float = 0.25
+    spill_path: Optional[str] = None  # sidecar log for trimmed thoughts / notes (None = drop them)
+    summaries: List[EpisodeSummary] = Field(default_factory=list)  # day -> epoch -> phase roll-ups
+    rollup_day_epochs: int = 2  # epochs to keep day-level summaries before folding them
+    # near-duplicate suppression (SimHash over the last `dedupe_window` records)
+    dedupe_actors: List[str] = Field(default_factory=lambda: ["system"])
+    dedupe_window: int = 8
+    dedupe_max_distance: int = 3
     # progression / objectives
     day_counter: int = 0
     daily_objectives: List[Dict[str, Any]] = Field(default_factory=list)
     last_objective_day: int = -1
 
-    def add_episode(self, ep: Episode) -> None:
+    _token_index: TokenIndex = PrivateAttr(default_factory=TokenIndex)
+    _by_actor: PositionIndex[int] = PrivateAttr(default_factory=PositionIndex)
+    _by_topic: PositionIndex[int] = PrivateAttr(default_factory=PositionIndex)
+    _by_tag: PositionIndex[int] = PrivateAttr(default_factory=PositionIndex)
+    _revision: int = PrivateAttr(default=0)
+    _edited_ids: Deque[int] = PrivateAttr(default_factory=lambda: deque(maxlen=EDIT_LOG_SIZE))  # newest text edits
+    _edit_count: int = PrivateAttr(default=0)
+    _archive: Optional[EpisodeArchive] = PrivateAttr(default=None)
+    _spill: Optional[SpillLog] = PrivateAttr(default=None)
+    # rankings mirror preferences / habit_counts (rebuilt if the field is replaced)
+    _pref_rank: Optional[Ranking] = PrivateAttr(default=None)
+    _pref_by_key: Dict[str, Preference] = PrivateAttr(default_factory=dict)
+    _habit_rank: Optional[Ranking] = PrivateAttr(default=None)
+    _episode_fps: RecentFingerprints[int] = PrivateAttr()
+    _thought_fps: RecentFingerprints[Thought] = PrivateAttr()
+    _thought_needles: Dict[str, str] = PrivateAttr(default_factory=dict)  # counter -> substring
+    _shared: Set[str] = PrivateAttr(default_factory=set)  # COW_FIELDS still shared with the fork parent
+    _forks: List["weakref.ReferenceType[PersonaState]"] = PrivateAttr(default_factory=list)  # live forks of this state
+    _forked: bool = PrivateAttr(default=False)
+    _indexed: bool = PrivateAttr(default=True)
+
+    def model_post_init(self, __context: Any) -> None:
+        # one table per state: the store's (also when a store was passed in directly)
+        self.symbols = self.episodes.symbols
+        self._reset_indexes()
+        self._index_all()
+        # the live window holds the last `dedupe_window` episodes of dedupe actors only
+        recent: List[int] = []
+        for actor in self.dedupe_actors:
+            sid = self.symbols.get(actor)
+            if sid is not None:
+                recent.extend(self._by_actor.ids(sid)[-self.dedupe_window:])
+        for ep_id in sorted(recent)[-self.dedupe_window:]:
+            ep = self.episodes[ep_id - self.episode_base]
+            self._episode_fps.add(self._dedupe_key(ep.actor, ep.topic_id), fingerprint(ep.text), ep_id)
+        for th in self.thoughts[-self.dedupe_window:]:
+            self._thought_fps.add(th.source, fingerprint(th.text), th)
+
+    def _reset_indexes(self) -> None:
+        self._token_index = TokenIndex()
+        self._by_actor = PositionIndex()
+        self._by_topic = PositionIndex()
+        self._by_tag = PositionIndex()
+        self._episode_fps = RecentFingerprints(self.dedupe_window, self.dedupe_max_distance)
+        self._thought_fps = RecentFingerprints(self.dedupe_window, self.dedupe_max_distance)
+
+    def _ensure_indexed(self) -> None:
+        # forks start without indexes; build them the first time a fork is queried
+        if not self._indexed:
+            self._index_all()
+            self._indexed = True
+
+    @field_serializer("symbols")
+    def _dump_symbols(self, symbols: SymbolTable) -> List[str]:
+        return list(self.episodes.symbols.names)
+
+    def _dedupe_key(self, actor: str, topic: str) -> Tuple[int, int]:
+        return (self.symbols.intern(actor), self.symbols.intern(topic))
+
+    def _index_all(self, start: int = 0) -> None:
+        # actor / topic / tag postings are keyed by symbol id
+        tokens, by_actor, by_topic, by_tag = self._token_index, self._by_actor, self._by_topic, self._by_tag
+        for ep_id, text, actor, topic, tags in self.episodes.index_rows(self.episode_base, start):
+            tokens.add(ep_id, text)
+            by_actor.add_key(actor, ep_id)
+            by_topic.add_key(topic, ep_id)
+            for tag in set(tags):
+                by_tag.add_key(tag, ep_id)
+
+    def _own(self, field: str, append: bool = False) -> None:
+        # copy before writing while the value is shared with the parent or with a live fork;
+        # appends leave the rows under a fork's episode overlay alone, so they don't count
+        value = getattr(self, field)
+        if field in self._shared or self._fork_shares(field, value, append):
+            if isinstance(value, EpisodeStore):
+                # the store's own table, as it is now: a snapshot taken at fork time may be stale
+                store = value.copy(value.symbols.copy())
+                setattr(self, field, store)
+                self.symbols = store.symbols
+            else:
+                setattr(self, field, list(value))
+            self._shared.discard(field)
+
+    def _fork_shares(self, field: str, value: Any, append: bool = False) -> bool:
+        shared = False
+        live = []
+        for ref in self._forks:
+            fork = ref()
+            if fork is not None:
+                live.append(ref)
+                theirs = getattr(fork, field)
+                shared = shared or (field in fork._shared and theirs is value) or (
+                    not append and isinstance(theirs, EpisodeStore) and theirs.reads_from(value)
+                )
+        self._forks = live
+        return shared
+
+    def fork(self) -> "PersonaState":
+        """Cheap what-if copy for planning.
+
+        Needs, buffs, objectives, counters and the other small mutable fields are copied;
+        the fork's episodes are an overlay that appends to its own tail over the parent's
+        store; thoughts, notes, artifacts and summaries are shared until either side first
+        writes to them (copy-on-write). Forks never write to the archive or spill log, skip
+        near-duplicate collapsing (it would edit shared records) and build their search
+        indexes only if queried.
+        """
+        symbols = self.symbols.copy()
+        clone = self.model_copy(update={
+            "needs": self.needs.model_copy(),
+            "symbols": symbols,
+            "episodes": self.episodes.overlay(symbols),
+            "buffs": dict(self.buffs),
+            "debuffs": dict(self.debuffs),
+            "habit_counts": dict(self.habit_counts),
+            "counters": dict(self.counters),
+            "daily_objectives": [dict(o) for o in self.daily_objectives],
+            "preferences": [p.model_copy() for p in self.preferences],
+            "achievements_unlocked": list(self.achievements_unlocked),
+            "unlocked_skills": list(self.unlocked_skills),
+            "skill_uses": dict(self.skill_uses),
+            "skill_mastery": dict(self.skill_mastery),
+            "life_phase_history": list(self.life_phase_history),
+            "topics": list(self.topics),
+            "items": list(self.items),
+            "world": self.world.model_copy(deep=True),
+            "archive_path": None,
+            "spill_path": None,
+        })
+        # model_copy shares private attrs: give the fork its own
+        clone._reset_indexes()
+        clone._revision = 0
+        clone._edited_ids = deque(maxlen=EDIT_LOG_SIZE)
+        clone._edit_count = 0
+        clone._archive = None
+        clone._spill = None
+        clone._pref_rank = None
+        clone._pref_by_key = {}
+        clone._habit_rank = self._habit_rank.copy(clone.habit_counts) if self._habit_rank is not None else None
+        clone._thought_needles = dict(self._thought_needles)
+        clone._shared = set(COW_FIELDS)
+        clone._forks = []
+        self._forks.append(weakref.ref(clone))
+        clone._forked = True
+        clone._indexed = False
+        return clone
+
+    def add_episode(self, ep: Episode) -> int:
+        """Append an episode and return its absolute id (the earlier id if it collapsed into a near-duplicate)."""
         if ep.topic_id not in self.topics:
             self.topics.append(ep.topic_id)
+        if ep.day is None:
+            ep.day = self.day_counter
+        self._own("episodes", append=True)
+        ep_id = self.episode_base + len(self.episodes)
+        if ep.actor in self.dedupe_actors and not self._forked:
+            key = self._dedupe_key(ep.actor, ep.topic_id)
+            fp = fingerprint(ep.text)
+            prev_id = self._episode_fps.match(key, fp)
+            if prev_id is not None and (prev := self.episode_by_id(prev_id)) is not None:
+                # keep the newest wording: near-duplicates may differ in their numbers
+                if prev.text != ep.text:
+                    self.replace_episode_text(prev_id, ep.text)
+                self._own("episodes")
+                prev = self.episodes.writable(prev_id - self.episode_base)
+                prev.repeat += 1
+                prev.last_ts = ep.ts
+                self._revision += 1
+                return prev_id
+            self._episode_fps.add(key, fp, ep_id)
         self.episodes.append(ep)
+        if self._indexed:
+            self._index_all(len(self.episodes) - 1)
+        if self._over_capacity(len(self.episodes), self.max_live_episodes):
+            self._evict_episodes(len(self.episodes) - self.max_live_episodes, self.epoch)
+        self._revision += 1
+        return ep_id
+
+    def last_episodes(
+        self,
+        n: int,
+        actor: Optional[str] = None,
+        topic: Optional[str] = None,
+        tag: Optional[str] = None,
+    ) -> List[EpisodeView]:
+        """Newest ``n`` episodes matching all given filters, newest first.
+
+        Served from the actor/topic/tag position indexes: with one filter this reads only
+        the ``n`` ids returned; with several, the shortest posting list is walked backwards.
+        """
+        if n <= 0:
+            return []
+        self._ensure_indexed()
+        store = self.episodes
+        if actor is None and topic is None and tag is None:
+            return store[: -n - 1 : -1]
+        # filters become symbol ids: a name never interned cannot match anything
+        ids = [None if name is None else self.symbols.get(name) for name in (actor, topic, tag)]
+        if any(name is not None and sid is None for name, sid in zip((actor, topic, tag), ids)):
+            return []
+        actor_id, topic_id, tag_id = ids
+        postings = [
+            idx.ids(sid)
+            for idx, sid in ((self._by_actor, actor_id), (self._by_topic, topic_id), (self._by_tag, tag_id))
+            if sid is not None
+        ]
+        base = self.episode_base
+        out: List[EpisodeView] = []
+        for ep_id in reversed(min(postings, key=len)):
+            if store.matches(ep_id - base, actor_id, topic_id, tag_id):
+                out.append(store[ep_id - base])
+                if len(out) == n:
+                    break
+        return out
+
+    def replace_episode_text(self, ep_id: int, text: str) -> bool:
+        """Swap an episode's text in place (e.g. late LLM enrichment), keeping indexes in sync."""
+        ep = self.episode_by_id(ep_id)
+        if ep is None:
+            return False
+        self._ensure_indexed()
+        # a fork copies the columns first, never editing rows the parent can still see
+        self._own("episodes")
+        ep = self.episodes.writable(ep_id - self.episode_base)
+        self._token_index.replace(ep_id, ep.text, text)
+        ep.text = text
+        self._edited_ids.append(ep_id)
+        self._edit_count += 1
+        self._revision += 1
+        return True
+
+    @property
+    def edit_count(self) -> int:
+        """Text edits so far (derived indexes remember it to replay only newer ones)."""
+        return self._edit_count
+
+    def edits_since(self, seen: int) -> Optional[List[int]]:
+        """Ids edited after the first ``seen`` edits, oldest first; None once the bounded
+        log no longer reaches back that far (the caller has to rebuild instead)."""
+        missing = self._edit_count - seen
+        if not 0 <= missing <= len(self._edited_ids):
+            return None
+        return list(self._edited_ids)[len(self._edited_ids) - missing:]
+
+    @property
+    def revision(self) -> int:
+        """Monotonic counter bumped on every episode mutation (cache key for retrieval)."""
+        return self._revision
+
+    def episode_by_id(self, ep_id: int) -> Optional[EpisodeView]:
+        pos = ep_id - self.episode_base
+        if 0 <= pos < len(self.episodes):
+            return self.episodes[pos]
+        return None
+
+    @property
+    def archive(self) -> Optional[EpisodeArchive]:
+        """Cold episode tier, opened lazily from ``archive_path``."""
+        if self.archive_path is None:
+            return None
+        if self._archive is None or str(self._archive.path) != self.archive_path:
+            self._archive = EpisodeArchive(self.archive_path)
+        return self._archive
+
+    @property
+    def spill(self) -> Optional[SpillLog]:
+        """Sidecar for trimmed thoughts and notes, from ``spill_path``."""
+        if self.spill_path is None:
+            return None
+        if self._spill is None or str(self._spill.path) != self.spill_path:
+            self._spill = SpillLog(self.spill_path)
+        return self._spill
+
+    def _over_capacity(self, n: int, cap: int) -> bool:
+        # trimming in batches of cap * slack keeps appends amortized O(1)
+        return cap > 0 and n > cap + max(1, int(cap * self.history_slack))
+
+    def _trim_buffer(self, field: str, cap: int) -> None:
+        items = getattr(self, field)
+        if not self._over_capacity(len(items), cap):
+            return
+        self._own(field)
+        items = getattr(self, field)
+        drop = len(items) - cap
+        spill = self.spill
+        if spill is not None:
+            spill.append_many(field, (item.model_dump(exclude_defaults=True) for item in items[:drop]))
+        del items[:drop]
+
+    def match_tokens(self, tokens: Iterable[str]) -> Dict[int, int]:
+        """Episode id -> query token hits, via the inverted index (cost scales with matches)."""
+        self._ensure_indexed()
+        return self._token_index.hits(tokens)
 
     def add_note(self, text: str) -> None:
+        self._own("notes")
         self.notes.append(Note(text=text))
+        self._trim_buffer("notes", self.max_notes)
+
+    def _preference_ranking(self) -> Ranking:
+        rank = self._pref_rank
+        if rank is None or rank.source is not self.preferences or len(rank) != len(self.preferences):
+            by_key: Dict[str, Preference] = {}
+            for pref in self.preferences:
+                by_key.setdefault(pref.key, pref)
+            self._pref_by_key = by_key
+            rank = self._pref_rank = Ranking(((p.key, p.weight) for p in self.preferences), self.preferences)
+        return rank
 
     def upsert_preference(self, key: str, delta: float = 0.2) -> None:
-        for pref in self.preferences:
-            if pref.key == key:
-                pref.weight = min(3.0, pref.weight + delta)
-                return
-        self.preferences.append(Preference(key=key, weight=1.0 + delta))
+        rank = self._preference_ranking()
+        pref = self._pref_by_key.get(key)
+        if pref is not None:
+            pref.weight = min(3.0, pref.weight + delta)
+        else:
+            pref = self._pref_by_key[key] = Preference(key=key, weight=1.0 + delta)
+            self.preferences.append(pref)
+        rank.set(key, pref.weight)
 
     def top_preferences(self, n: int = 5) -> List[str]:
-        return [p.key for p in sorted(self.preferences, key=lambda p: p.weight, reverse=True)[:n]]
+        return self._preference_ranking().top(n)
 
     def advance_time(self) -> None:
-        order: List[TimeBlock] = ["MORNING", "MIDDAY", "EVENING", "NIGHT"]
-        idx = order.index(self.time_block)
-        self.time_block = order[(idx + 1) % len(order)]
+        idx = TIME_BLOCKS.index(self.time_block)
+        self.time_block = TIME_BLOCKS[(idx + 1) % len(TIME_BLOCKS)]
         if self.time_block == "MORNING":
             # new day
             self.day_counter += 1
@@ -193,7 +635,7 @@ class PersonaState(BaseModel):
         if self.last_objective_day == self.day_counter:
             return
         # simple: select up to 2 lowest needs and create raise objectives
-        need_vals = {k: getattr(self.needs, k) for k in NEED_KEYS}
+        need_vals = self.needs.model_dump()
         lows = sorted(need_vals.items(), key=lambda x: x[1])[:2]
         self.daily_objectives = []
         for name, val in lows:
@@ -226,10 +668,18 @@ class PersonaState(BaseModel):
 
     def record_habit(self, action_label: str) -> None:
         key = action_label.lower().strip()
-        self.habit_counts[key] = self.habit_counts.get(key, 0) + 1
+        rank = self._habit_ranking()
+        count = self.habit_counts[key] = self.habit_counts.get(key, 0) + 1
+        rank.set(key, count)
+
+    def _habit_ranking(self) -> Ranking:
+        rank = self._habit_rank
+        if rank is None or rank.source is not self.habit_counts or len(rank) != len(self.habit_counts):
+            rank = self._habit_rank = Ranking(self.habit_counts.items(), self.habit_counts)
+        return rank
 
     def top_habits(self, n: int = 5) -> List[str]:
-        return [k for k, _ in sorted(self.habit_counts.items(), key=lambda kv: kv[1], reverse=True)[:n]]
+        return self._habit_ranking().top(n)
 
     # thought handling
     def maybe_add_thought(self, text: str, refs: Dict[str, List[int] | List[str]] | None = None) -> None:
@@ -237,7 +687,39 @@ class PersonaState(BaseModel):
             return
         # enforce max len
         truncated = text[: self.thought_max_len]
-        self.thoughts.append(Thought(text=truncated, refs=refs or {}))
+        thought = Thought(text=truncated, refs=refs or {})
+        fp = fingerprint(truncated)
+        prev = None if self._forked else self._thought_fps.match(thought.source, fp)
+        for name, needle in self._thought_needles.items():
+            if needle in truncated:
+                self.counters[name] = self.counters.get(name, 0) + 1
+        if prev is not None:
+            self._own("thoughts")
+            # collapsed thoughts are never appended, so a match is among the newest entries
+            pos = next((i for i in range(len(self.thoughts) - 1, max(-1, len(self.thoughts) - 1 - self.dedupe_window), -1)
+                        if self.thoughts[i] is prev), None)
+            if pos is not None:
+                # a fork may hold the same object: swap in an updated copy instead of editing it
+                merged = prev.model_copy(update={"text": truncated, "repeat": prev.repeat + 1, "last_ts": thought.ts})
+                self.thoughts[pos] = merged
+                self._thought_fps.replace(prev, merged)
+                return
+        self._thought_fps.add(thought.source, fp, thought)
+        self._own("thoughts")
+        self.thoughts.append(thought)
+        self._trim_buffer("thoughts", self.max_thoughts)
+
+    def track_thoughts(self, counter: str, needle: str) -> None:
+        """Keep ``counters[counter]`` = thoughts containing ``needle`` (repeats included) up to date.
+
+        Registering a needle on a state (again after loading it) recounts the kept thoughts,
+        catching those added while nothing was registered; a saved count may also cover
+        thoughts trimmed since, so the larger value wins.
+        """
+        if self._thought_needles.get(counter) != needle:
+            recount = sum(t.repeat for t in self.thoughts if needle in t.text)
+            self.counters[counter] = max(self.counters.get(counter, 0), recount)
+        self._thought_needles[counter] = needle
 
     # skills
     def unlock_skill(self, name: str) -> bool:
@@ -252,6 +734,7 @@ class PersonaState(BaseModel):
     # artifacts
     def add_artifact(self, title: str, effect: str = "flavor", notes: str = "") -> Artifact:
         art = Artifact(epoch=self.epoch, title=title, effect=effect, notes=notes)
+        self._own("artifacts")
         self.artifacts.append(art)
         return art
 
@@ -264,12 +747,29 @@ class PersonaState(BaseModel):
         top_habits = ",".join(self.top_habits(3)) or "-"
         summary = f"E{self.epoch}: prefs={top_prefs} habits={top_habits} episodes={len(self.episodes)}"
         art = self.add_artifact(title=f"Epoch {self.epoch} Summary", effect="summary", notes=summary)
-        # compress episodes if exceeding cap (keep newest N)
+        # compress episodes if exceeding cap (keep newest N), rolling evicted ones up
         if len(self.episodes) > self.max_episode_history:
-            self.episodes = self.episodes[-self.max_episode_history:]
+            self._evict_episodes(len(self.episodes) - self.max_episode_history, self.epoch - 1)
         self._maybe_advance_life_phase()
+        if self.summaries:
+            self.summaries = consolidate(self.summaries, self.epoch, self.life_phase, self.rollup_day_epochs)
+        self._revision += 1
         return art
 
+    def _evict_episodes(self, drop: int, epoch: int) -> None:
+        """Move the ``drop`` oldest episodes to the archive and roll them up under ``epoch``."""
+        evicted = self.episodes[:drop]
+        archive = self.archive
+        if archive is not None:
+            archive.append_many(self.episodes.dump(0, drop))
+        self._own("summaries")
+        self.summaries.extend(summarize_days(evicted, epoch, self.life_phase))
+        self._own("episodes")
+        self.episodes.drop_front(drop)
+        self.episode_base += drop
+        for idx in (self._token_index, self._by_actor, self._by_topic, self._by_tag):
+            idx.prune_before(self.episode_base)
+
     def _apply_item_passives(self) -> None:
         for it in self.items:
             if it.passive_need_delta:
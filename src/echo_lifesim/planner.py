@@ -0,0 +1,90 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Tuple, TypedDict
+import random
+import time
+from .action_table import NEED_GAP_THRESHOLD, need_vector
+from .catalogs import get_registry
+from .engine import LifeSimEngine
+from .models import PersonaState
+
+class PlanResult(TypedDict):
+    label: str
+    duration: str
+    value: float  # minus the discounted need gap summed over ``depth`` steps (higher is better)
+    depth: int  # steps compared (the depth every candidate reached within the budget)
+    needs: Dict[str, int]  # needs after this candidate's last simulated step
+
+def need_gap(state: PersonaState) -> int:
+    """Total shortfall below NEED_GAP_THRESHOLD (0 = every need comfortably met)."""
+    return sum(max(0, NEED_GAP_THRESHOLD - v) for v in state.needs.vector())
+
+class _Rollout:
+    def __init__(self, label: str, duration: str, engine: LifeSimEngine):
+        self.label = label
+        self.duration = duration
+        self.engine = engine
+        self.values: List[float] = []  # cumulative value after each simulated step
+
+    @property
+    def depth(self) -> int:
+        return len(self.values)
+
+class LookaheadPlanner:
+    """Ranks candidate actions by simulating what follows them.
+
+    Each candidate runs on its own ``PersonaState.fork()``: the action goes through
+    ``apply_action_result`` (which advances time), then up to ``depth - 1`` greedy
+    follow-up actions. Candidates are deepened level by level so that when the
+    ``budget_ms`` deadline hits, all evaluated candidates have been simulated equally far.
+    """
+    def __init__(self, depth: int = 3, budget_ms: float = 50.0, discount: float = 0.9, seed: int = 0):
+        self.depth = max(1, depth)
+        self.budget_ms = budget_ms
+        self.discount = discount
+        self.seed = seed
+
+    def plan(self, state: PersonaState, candidates: Optional[Sequence[Tuple[str, str]]] = None) -> List[PlanResult]:
+        deadline = time.perf_counter() + self.budget_ms / 1000.0
+        table = get_registry().action_table
+        if candidates is None:
+            candidates = table.top(need_vector(state.needs), 12)
+        rollouts: List[_Rollout] = []
+        for label, duration in candidates:
+            if rollouts and time.perf_counter() > deadline:
+                break
+            rollout = _Rollout(label, duration, LifeSimEngine(state.fork(), rng=random.Random(self.seed)))
+            self._step(rollout, label)
+            rollouts.append(rollout)
+        for _ in range(1, self.depth):
+            if time.perf_counter() > deadline:
+                break
+            for r in rollouts:
+                if time.perf_counter() > deadline:
+                    break
+                follow = table.top(need_vector(r.engine.state.needs), 1)
+                self._step(r, follow[0][0] if follow else None)
+        if not rollouts:
+            return []
+        # compare only over the depth every rollout reached (ties keep candidate order)
+        depth = min(r.depth for r in rollouts)
+        ranked = sorted(rollouts, key=lambda r: -r.values[depth - 1])
+        return [
+            {
+                "label": r.label,
+                "duration": r.duration,
+                "value": r.values[depth - 1],
+                "depth": depth,
+                "needs": r.engine.state.needs.model_dump(),
+            }
+            for r in ranked
+        ]
+
+    def _step(self, rollout: _Rollout, label: Optional[str]) -> None:
+        engine = rollout.engine
+        if label:
+            engine.apply_action_result(label)
+        else:
+            engine.state.advance_time()
+            engine._apply_status_effects()
+        prev = rollout.values[-1] if rollout.values else 0.0
+        rollout.values.append(prev - (self.discount ** rollout.depth) * need_gap(engine.state))
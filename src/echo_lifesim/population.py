@@ -0,0 +1,154 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from .models import NEED_KEYS, NEED_MAX, NEED_MID, NEED_MIN, TIME_BLOCKS, PersonaState
+from .engine import BUFF_LIBRARY, DEBUFF_LIBRARY
+
+DAY_DECAY = 2  # NeedState.decay_towards_mid default
+
+def _effect_matrix(names: Sequence[str], library: Dict[str, Dict[str, int]]) -> np.ndarray:
+    mat = np.zeros((len(names), len(NEED_KEYS)), dtype=np.int16)
+    for row, name in enumerate(names):
+        for need, delta in library.get(name, {}).items():
+            if need in NEED_KEYS:
+                mat[row, NEED_KEYS.index(need)] = delta
+    return mat
+
+class Population:
+    """Struct-of-arrays need dynamics for N personas.
+
+    Mirrors the scalar path ``PersonaState.advance_time`` + ``LifeSimEngine._apply_status_effects``
+    (time block, day rollover with mid-decay and item passives, buff/debuff expiry and
+    per-turn effects) as whole-array steps. Layout:
+
+    - ``needs``: (N, len(NEED_KEYS)) int16, clamped to [0, 100]
+    - ``time_block`` (index into TIME_BLOCKS) and ``day``: (N,)
+    - ``buff_ttl`` / ``debuff_ttl``: (N, names) remaining turns, 0 = inactive
+    - ``item_delta``: (N, item slots, needs) passive deltas, applied slot by slot each morning
+    - ``item_buffs``: (N, buff names) longest item-granted buff, refreshed each morning
+
+    Effects are applied in library order where the scalar path uses dict insertion order;
+    results are identical as long as buffs on one need all push the same way (true for
+    BUFF_LIBRARY / DEBUFF_LIBRARY). Objectives, dreams and episodes are not modelled.
+    """
+    def __init__(
+        self,
+        n: int,
+        buff_names: Optional[Sequence[str]] = None,
+        debuff_names: Optional[Sequence[str]] = None,
+        item_slots: int = 0,
+    ):
+        self.buff_names: List[str] = list(buff_names if buff_names is not None else BUFF_LIBRARY)
+        self.debuff_names: List[str] = list(debuff_names if debuff_names is not None else DEBUFF_LIBRARY)
+        self.needs = np.full((n, len(NEED_KEYS)), NEED_MID, dtype=np.int16)
+        self.time_block = np.zeros(n, dtype=np.int8)
+        self.day = np.zeros(n, dtype=np.int32)
+        self.buff_ttl = np.zeros((n, len(self.buff_names)), dtype=np.int16)
+        self.debuff_ttl = np.zeros((n, len(self.debuff_names)), dtype=np.int16)
+        self.item_delta = np.zeros((n, item_slots, len(NEED_KEYS)), dtype=np.int16)
+        self.item_buffs = np.zeros((n, len(self.buff_names)), dtype=np.int16)
+        self._buff_eff = _effect_matrix(self.buff_names, BUFF_LIBRARY)
+        self._debuff_eff = _effect_matrix(self.debuff_names, DEBUFF_LIBRARY)
+
+    def __len__(self) -> int:
+        return len(self.needs)
+
+    @classmethod
+    def from_states(cls, states: Sequence[PersonaState]) -> "Population":
+        buffs = list(BUFF_LIBRARY)
+        debuffs = list(DEBUFF_LIBRARY)
+        for s in states:
+            for name in list(s.buffs) + [b for it in s.items for b in it.effect_buffs]:
+                if name not in buffs:
+                    buffs.append(name)
+            for name in s.debuffs:
+                if name not in debuffs:
+                    debuffs.append(name)
+        slots = max((sum(1 for it in s.items if it.passive_need_delta) for s in states), default=0)
+        pop = cls(len(states), buffs, debuffs, slots)
+        for i, s in enumerate(states):
+            pop.needs[i] = s.needs.vector()
+            pop.time_block[i] = TIME_BLOCKS.index(s.time_block)
+            pop.day[i] = s.day_counter
+            for name, ttl in s.buffs.items():
+                pop.buff_ttl[i, buffs.index(name)] = ttl
+            for name, ttl in s.debuffs.items():
+                pop.debuff_ttl[i, debuffs.index(name)] = ttl
+            slot = 0
+            for it in s.items:
+                if it.passive_need_delta:
+                    for need, delta in it.passive_need_delta.items():
+                        if need in NEED_KEYS:
+                            pop.item_delta[i, slot, NEED_KEYS.index(need)] = delta
+                    slot += 1
+                for name, turns in it.effect_buffs.items():
+                    col = buffs.index(name)
+                    pop.item_buffs[i, col] = max(pop.item_buffs[i, col], turns)
+        return pop
+
+    def export(self, i: int) -> Dict[str, Any]:
+        """Scalar view of persona ``i`` (same shape as the corresponding PersonaState fields)."""
+        return {
+            "needs": {k: int(v) for k, v in zip(NEED_KEYS, self.needs[i])},
+            "time_block": TIME_BLOCKS[int(self.time_block[i])],
+            "day_counter": int(self.day[i]),
+            "buffs": {n: int(t) for n, t in zip(self.buff_names, self.buff_ttl[i]) if t > 0},
+            "debuffs": {n: int(t) for n, t in zip(self.debuff_names, self.debuff_ttl[i]) if t > 0},
+        }
+
+    # --- kernel steps --------------------------------------------------
+    def _rows(self, mask: np.ndarray) -> Any:
+        # personas usually move in lockstep: a full slice avoids fancy-index copies
+        return slice(None) if mask.all() else np.flatnonzero(mask)
+
+    def apply_delta(self, deltas: np.ndarray, rows: Any = slice(None)) -> None:
+        """NeedState.apply_delta for many personas: ``deltas`` is (needs,) or (rows, needs)."""
+        if isinstance(rows, slice):
+            np.add(self.needs, deltas, out=self.needs, casting="unsafe")
+            np.clip(self.needs, NEED_MIN, NEED_MAX, out=self.needs)
+        else:
+            self.needs[rows] = np.clip(self.needs[rows] + deltas, NEED_MIN, NEED_MAX)
+
+    def decay_towards_mid(self, rows: Any = slice(None), amount: int = DAY_DECAY) -> None:
+        val = self.needs[rows]
+        self.needs[rows] = np.where(
+            val > NEED_MID,
+            np.maximum(NEED_MID, val - amount),
+            np.minimum(NEED_MID, val + amount),
+        )
+
+    def advance_time(self) -> None:
+        self.time_block += 1
+        self.time_block %= len(TIME_BLOCKS)
+        morning = self.time_block == 0
+        if morning.any():
+            rows = self._rows(morning)
+            self.day[rows] += 1
+            self.decay_towards_mid(rows)
+            for slot in range(self.item_delta.shape[1]):
+                self.apply_delta(self.item_delta[rows, slot], rows)
+            if self.item_buffs.any():
+                self.buff_ttl[rows] = np.maximum(self.buff_ttl[rows], self.item_buffs[rows])
+        # _tick_effects: every active effect loses a turn, reaching 0 removes it
+        for ttl in (self.buff_ttl, self.debuff_ttl):
+            np.subtract(ttl, 1, out=ttl)
+            np.maximum(ttl, 0, out=ttl)
+
+    def apply_status_effects(self) -> None:
+        for ttl, eff in ((self.buff_ttl, self._buff_eff), (self.debuff_ttl, self._debuff_eff)):
+            for col in np.flatnonzero(eff.any(axis=1)):
+                active = ttl[:, col] > 0
+                if active.any():
+                    self.apply_delta(eff[col] if active.all() else active[:, None] * eff[col])
+
+    def step(self, deltas: Optional[np.ndarray] = None) -> None:
+        """One turn: optional action/event deltas, then time advance and status effects
+        (the tail of LifeSimEngine.apply_action_result)."""
+        if deltas is not None:
+            self.apply_delta(deltas)
+        self.advance_time()
+        self.apply_status_effects()
+
+    def run(self, turns: int) -> None:
+        for _ in range(turns):
+            self.step()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+class Ranking:
+    """Scores by key, kept in descending order so top-n is a slice.
+
+    ``_order`` is a bisect-sorted list of ``(-score, seq, key)``; ``seq`` is the insertion
+    order, so ties rank like a stable ``sorted(..., reverse=True)`` over the source
+    container. ``source`` is the container the ranking mirrors (lets owners detect that it
+    was replaced).
+    """
+    __slots__ = ("_entries", "_order", "_next", "source")
+
+    def __init__(self, items: Iterable[Tuple[str, float]] = (), source: object = None):
+        self._entries: Dict[str, Tuple[float, int, str]] = {}
+        self._next = 0
+        for key, score in items:
+            if key not in self._entries:
+                self._entries[key] = (-score, self._next, key)
+                self._next += 1
+        self._order: List[Tuple[float, int, str]] = sorted(self._entries.values())
+        self.source = source
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def get(self, key: str, default: Optional[float] = None) -> Optional[float]:
+        entry = self._entries.get(key)
+        return default if entry is None else -entry[0]
+
+    def set(self, key: str, score: float) -> None:
+        old = self._entries.get(key)
+        if old is not None:
+            if old[0] == -score:
+                return
+            del self._order[bisect_left(self._order, old)]
+            seq = old[1]
+        else:
+            seq = self._next
+            self._next += 1
+        entry = self._entries[key] = (-score, seq, key)
+        insort(self._order, entry)
+
+    def top(self, n: int) -> List[str]:
+        return [key for _s, _seq, key in self._order[: max(0, n)]]
+
+    def copy(self, source: object = None) -> "Ranking":
+        clone = Ranking.__new__(Ranking)
+        clone._entries = dict(self._entries)
+        clone._order = list(self._order)
+        clone._next = self._next
+        clone.source = source
+        return clone
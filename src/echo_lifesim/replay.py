@@ -0,0 +1,185 @@
+from __future__ import annotations
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Callable, Dict, IO, List, Optional, TypedDict
+import random
+import tempfile
+import time
+import numpy as np
+import orjson
+from .engine import LifeSimEngine
+from .models import PersonaState, use_clock
+
+TRACE_VERSION = 2  # 2: episode rows hold symbol ids, bounded-buffer settings in the state
+RECORDED_OPS = ("persona_reply", "apply_action_result", "reject_action", "autonomous_tick", "advance_epoch")
+
+def state_digest(state: PersonaState) -> str:
+    """Stable hash of the persisted state (archive / spill locations excluded, replays use temp files)."""
+    data = state.model_dump(exclude={"archive_path", "spill_path"})
+    return sha256(orjson.dumps(data, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+class SessionRecorder:
+    """Records engine calls to a JSONL trace for ``replay``.
+
+    Line 1 holds the trace version, RNG seed and the starting state. Each later line holds
+    one top-level call of ``RECORDED_OPS``: its arguments, every clock reading taken
+    during the call, the LLM enrichments it received and the observed latency. ``close``
+    appends the final state digest. The engine's RNG is reseeded from the trace seed, so
+    attach the recorder right after creating or loading the engine.
+    """
+    def __init__(self, engine: LifeSimEngine, path: Path, seed: Optional[int] = None):
+        self.engine = engine
+        self.seed = seed if seed is not None else random.randrange(1 << 62)
+        self._fh: Optional[IO[bytes]] = path.open("wb")
+        self._depth = 0
+        self._clock: List[float] = []
+        self._llm: List[Optional[str]] = []
+        engine.rng = random.Random(self.seed)
+        arch = engine.state.archive
+        self._write({
+            "trace": TRACE_VERSION,
+            "seed": self.seed,
+            "archive_len": len(arch) if arch is not None else 0,
+            "state": engine.state.model_dump(),
+        })
+        for op in RECORDED_OPS:
+            setattr(engine, op, self._wrap(op, getattr(engine, op)))
+        enrich = engine._enrich
+        def recorded_enrich(user_text: str, reply: str) -> Optional[str]:
+            out = enrich(user_text, reply)
+            self._llm.append(out)
+            return out
+        engine._enrich = recorded_enrich  # type: ignore[method-assign]
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        if self._fh is None:
+            raise ValueError("recorder is closed")
+        self._fh.write(orjson.dumps(record) + b"\n")
+        self._fh.flush()
+
+    def _read_clock(self) -> float:
+        ts = time.time()
+        self._clock.append(ts)
+        return ts
+
+    def _wrap(self, op: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        def call(*args: Any, **kwargs: Any) -> Any:
+            if self._depth:  # nested recorded op: part of the outer call
+                return fn(*args, **kwargs)
+            self._depth += 1
+            self._clock, self._llm = [], []
+            t0 = time.perf_counter()
+            try:
+                with use_clock(self._read_clock):
+                    return fn(*args, **kwargs)
+            finally:
+                ms = (time.perf_counter() - t0) * 1000
+                self._depth -= 1
+                rec: Dict[str, Any] = {"op": op, "args": list(args), "clock": self._clock, "ms": round(ms, 3)}
+                if kwargs:
+                    rec["kw"] = kwargs
+                if self._llm:
+                    rec["llm"] = self._llm
+                self._write(rec)
+        return call
+
+    def close(self) -> str:
+        digest = state_digest(self.engine.state)
+        if self._fh is not None:
+            self._write({"end": True, "state": digest})
+            self._fh.close()
+            self._fh = None
+        return digest
+
+    def __enter__(self) -> "SessionRecorder":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+class ReplayReport(TypedDict):
+    calls: int
+    identical: Optional[bool]  # None when the trace has no end record
+    expected: Optional[str]
+    actual: str
+    clock_drift: int  # clock reads beyond what the trace recorded (code path changed)
+    latency_ms: Dict[str, Dict[str, float]]
+    recorded_ms: Dict[str, Dict[str, float]]
+
+def latency_summary(samples: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    out: Dict[str, Dict[str, float]] = {}
+    for op, values in samples.items():
+        arr = np.asarray(values, dtype=np.float64)
+        p50, p90, p99 = np.percentile(arr, [50, 90, 99])
+        out[op] = {"n": len(arr), "p50": float(p50), "p90": float(p90), "p99": float(p99), "max": float(arr.max())}
+    return out
+
+def replay(path: Path) -> ReplayReport:
+    """Re-execute a trace at full speed with recorded clock, seed and LLM outputs."""
+    lines = path.read_bytes().splitlines()
+    if not lines:
+        raise ValueError(f"empty trace: {path}")
+    header = orjson.loads(lines[0])
+    version = header.get("trace")
+    if version != TRACE_VERSION:
+        if isinstance(version, int) and version < TRACE_VERSION:
+            raise ValueError(
+                f"trace version {version} predates the current state format (version {TRACE_VERSION}); "
+                "its state digests cannot match, record the session again"
+            )
+        raise ValueError(f"unsupported trace version: {version}")
+    state = PersonaState.model_validate(header["state"])
+    expected: Optional[str] = None
+    timings: Dict[str, List[float]] = {}
+    recorded: Dict[str, List[float]] = {}
+    drift = 0
+    calls = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        if state.archive_path:
+            # replay against a private copy of the archive as it was when recording started
+            source = state.archive
+            state.archive_path = str(Path(tmp) / "archive.jsonl")
+            n = min(header.get("archive_len", 0), len(source) if source is not None else 0)
+            if source is not None and n:
+                state.archive.append_many(source.get_many(range(n)))  # type: ignore[union-attr]
+                source.close()
+        if state.spill_path:
+            # trimmed records go to a throwaway sidecar instead of the recorded one
+            state.spill_path = str(Path(tmp) / "spill.jsonl")
+        engine = LifeSimEngine(state, rng=random.Random(header["seed"]))
+        llm: List[Optional[str]] = []
+        engine._enrich = lambda user_text, reply: llm.pop(0) if llm else None  # type: ignore[method-assign]
+        for raw in lines[1:]:
+            rec = orjson.loads(raw)
+            if rec.get("end"):
+                expected = rec["state"]
+                break
+            readings = iter(rec["clock"])
+            last = rec["clock"][-1] if rec["clock"] else 0.0
+            def clock() -> float:
+                nonlocal drift
+                for ts in readings:
+                    return float(ts)
+                drift += 1
+                return last
+            llm[:] = rec.get("llm", [])
+            fn = getattr(engine, rec["op"])
+            t0 = time.perf_counter()
+            with use_clock(clock):
+                fn(*rec.get("args", []), **rec.get("kw", {}))
+            timings.setdefault(rec["op"], []).append((time.perf_counter() - t0) * 1000)
+            recorded.setdefault(rec["op"], []).append(rec.get("ms", 0.0))
+            calls += 1
+        actual = state_digest(engine.state)
+        arch = engine.state.archive
+        if arch is not None:
+            arch.close()
+    return {
+        "calls": calls,
+        "identical": None if expected is None else expected == actual,
+        "expected": expected,
+        "actual": actual,
+        "clock_drift": drift,
+        "latency_ms": latency_summary(timings),
+        "recorded_ms": latency_summary(recorded),
+    }
@@ -0,0 +1,117 @@
+from __future__ import annotations
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Literal, Tuple
+from pydantic import BaseModel, Field
+from .indexing import tokenize
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .models import EpisodeLike
+
+SummaryLevel = Literal["day", "epoch", "phase"]
+
+ROLLUP_TOP_TOKENS = 12
+ROLLUP_SAMPLES = 3
+
+class EpisodeSummary(BaseModel):
+    """Compact record standing in for a group of compressed episodes of one topic."""
+    level: SummaryLevel
+    topic_id: str = "main"
+    day: int = -1
+    epoch: int = 0
+    phase: str = "phase_1"
+    count: int = 0
+    ts_first: float = 0.0
+    ts_last: float = 0.0
+    token_counts: Dict[str, int] = Field(default_factory=dict)  # top tokens only
+    samples: List[str] = Field(default_factory=list)  # representative texts
+
+    @property
+    def key(self) -> str:
+        scope = {"day": f"day {self.day}", "epoch": f"epoch {self.epoch}", "phase": self.phase}[self.level]
+        return f"{scope}|{self.topic_id}"
+
+    def top_tokens(self, n: int = 5) -> List[str]:
+        return [t for t, _c in sorted(self.token_counts.items(), key=lambda kv: kv[1], reverse=True)[:n]]
+
+    def text(self) -> str:
+        return f"[{self.key}] " + " | ".join(self.samples)
+
+def _content_tokens(text: str) -> List[str]:
+    return [t for t in tokenize(text) if not t.isdigit()]
+
+def _pick_samples(texts: Iterable[str], counts: Dict[str, int]) -> List[str]:
+    seen: Dict[str, int] = {}
+    for text in texts:
+        if text not in seen:
+            seen[text] = sum(counts.get(t, 0) for t in set(_content_tokens(text)))
+    return [t for t, _sc in sorted(seen.items(), key=lambda kv: kv[1], reverse=True)[:ROLLUP_SAMPLES]]
+
+def _top(counter: Counter[str]) -> Dict[str, int]:
+    return dict(counter.most_common(ROLLUP_TOP_TOKENS))
+
+def summarize_days(episodes: Iterable["EpisodeLike"], epoch: int, phase: str) -> List[EpisodeSummary]:
+    """Group raw episodes by (topic, day) into day-level summaries."""
+    groups: Dict[Tuple[str, int], List["EpisodeLike"]] = {}
+    for ep in episodes:
+        groups.setdefault((ep.topic_id, ep.day if ep.day is not None else -1), []).append(ep)
+    out: List[EpisodeSummary] = []
+    for (topic, day), eps in groups.items():
+        counter: Counter[str] = Counter()
+        for ep in eps:
+            counter.update(_content_tokens(ep.text))
+        counts = _top(counter)
+        out.append(EpisodeSummary(
+            level="day", topic_id=topic, day=day, epoch=epoch, phase=phase, count=len(eps),
+            ts_first=min(ep.ts for ep in eps), ts_last=max(ep.ts for ep in eps),
+            token_counts=counts, samples=_pick_samples((ep.text for ep in eps), counts),
+        ))
+    return out
+
+def merge(summaries: List[EpisodeSummary], level: SummaryLevel) -> EpisodeSummary:
+    """Fold same-topic summaries into one record of the next level up."""
+    first = summaries[0]
+    counter: Counter[str] = Counter()
+    for sm in summaries:
+        counter.update(sm.token_counts)
+    counts = _top(counter)
+    return EpisodeSummary(
+        level=level, topic_id=first.topic_id, day=-1,
+        epoch=first.epoch if level == "epoch" else max(sm.epoch for sm in summaries),
+        phase=first.phase, count=sum(sm.count for sm in summaries),
+        ts_first=min(sm.ts_first for sm in summaries), ts_last=max(sm.ts_last for sm in summaries),
+        token_counts=counts, samples=_pick_samples((t for sm in summaries for t in sm.samples), counts),
+    )
+
+def consolidate(summaries: List[EpisodeSummary], epoch: int, phase: str, day_epochs: int = 2) -> List[EpisodeSummary]:
+    """Keep the hierarchy bounded: day-level records are kept for the last ``day_epochs``
+    closed epochs, older ones fold into epoch records, which fold into phase records
+    once their life phase is over."""
+    kept: List[EpisodeSummary] = []
+    to_epoch: Dict[Tuple[str, int], List[EpisodeSummary]] = {}
+    for sm in summaries:
+        if sm.level == "day" and sm.epoch < epoch - day_epochs:
+            to_epoch.setdefault((sm.topic_id, sm.epoch), []).append(sm)
+        else:
+            kept.append(sm)
+    for group in to_epoch.values():
+        existing = next((sm for sm in kept if sm.level == "epoch" and sm.topic_id == group[0].topic_id
+                         and sm.epoch == group[0].epoch), None)
+        if existing is not None:
+            kept.remove(existing)
+            group = [existing, *group]
+        kept.append(merge(group, "epoch"))
+    out: List[EpisodeSummary] = []
+    to_phase: Dict[Tuple[str, str], List[EpisodeSummary]] = {}
+    for sm in kept:
+        if sm.level == "epoch" and sm.phase != phase:
+            to_phase.setdefault((sm.topic_id, sm.phase), []).append(sm)
+        else:
+            out.append(sm)
+    for group in to_phase.values():
+        existing = next((sm for sm in out if sm.level == "phase" and sm.topic_id == group[0].topic_id
+                         and sm.phase == group[0].phase), None)
+        if existing is not None:
+            out.remove(existing)
+            group = [existing, *group]
+        out.append(merge(group, "phase"))
+    return out
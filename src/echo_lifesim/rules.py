@@ -0,0 +1,139 @@
+from __future__ import annotations
+import operator
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# used when rules/achievements.json is missing (same rules the engine hard-coded before)
+DEFAULT_RULES: Dict[str, Any] = {
+    "counters": [
+        {"name": "insight_thoughts", "thoughts_containing": "Fokus"},
+    ],
+    "achievements": [
+        {"key": "streak_5", "field": "success_streak", "op": ">=", "value": 5},
+        {"key": "xp_50", "field": "xp", "op": ">=", "value": 50},
+        {"key": "clarity_70", "field": "needs.clarity", "op": ">=", "value": 70},
+        {"key": "artifact_3", "field": "artifacts", "op": ">=", "value": 3},
+    ],
+    "stats": [
+        {"stat": "stat_discipline", "field": "success_streak"},
+        {"stat": "stat_insight", "field": "counters.insight_thoughts"},
+        {"stat": "stat_resilience", "field": "rejected_actions"},
+    ],
+}
+
+OPS: Dict[str, Callable[[Any, Any], bool]] = {
+    ">=": operator.ge,
+    ">": operator.gt,
+    "<=": operator.le,
+    "<": operator.lt,
+    "==": operator.eq,
+}
+
+_MISSING = object()
+
+def resolve_field(state: Any, path: str) -> Any:
+    """Dotted path into the state (attributes or dict keys); lists resolve to their length."""
+    value = state
+    for part in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(part, 0)
+        else:
+            value = getattr(value, part, 0)
+    return len(value) if isinstance(value, list) else value
+
+def _field_ok(path: Any) -> bool:
+    return isinstance(path, str) and bool(path) and all(path.split("."))
+
+def validate_counter(spec: Any) -> Optional[str]:
+    if not isinstance(spec, dict):
+        return "not an object"
+    if not isinstance(spec.get("name"), str) or not spec["name"]:
+        return "missing name"
+    if not isinstance(spec.get("thoughts_containing"), str) or not spec["thoughts_containing"]:
+        return "thoughts_containing must be a non-empty string"
+    return None
+
+def validate_achievement(spec: Any) -> Optional[str]:
+    if not isinstance(spec, dict):
+        return "not an object"
+    if not isinstance(spec.get("key"), str) or not spec["key"]:
+        return "missing key"
+    if not _field_ok(spec.get("field")):
+        return "field must be a dotted state path"
+    if spec.get("op", ">=") not in OPS:
+        return f"op must be one of {sorted(OPS)}"
+    if not isinstance(spec.get("value"), (int, float)):
+        return "value must be a number"
+    return None
+
+def validate_stat(spec: Any) -> Optional[str]:
+    if not isinstance(spec, dict):
+        return "not an object"
+    if not isinstance(spec.get("stat"), str) or not spec["stat"].startswith("stat_"):
+        return "stat must name a stat_* field"
+    if not _field_ok(spec.get("field")):
+        return "field must be a dotted state path"
+    return None
+
+class RuleSet:
+    """Compiled achievement / stat rules.
+
+    Every rule reads exactly one state field; rules are grouped by that field so a tick
+    only re-evaluates the rules whose field value changed since the last tick.
+    """
+    def __init__(self, data: Dict[str, Any]):
+        self.rejected: List[str] = []
+        self.counters: Dict[str, str] = {}
+        self.achievements: List[Dict[str, Any]] = []
+        self.stats: List[Dict[str, Any]] = []
+        for section, validate in (("counters", validate_counter), ("achievements", validate_achievement), ("stats", validate_stat)):
+            specs = data.get(section, [])
+            for idx, spec in enumerate(specs if isinstance(specs, list) else []):
+                reason = validate(spec)
+                if reason:
+                    self.rejected.append(f"{section}[{idx}]: {reason}")
+                elif section == "counters":
+                    self.counters[spec["name"]] = spec["thoughts_containing"]
+                elif section == "achievements":
+                    self.achievements.append(spec)
+                else:
+                    self.stats.append(spec)
+        self.by_field: Dict[str, Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = {}
+        for spec in self.achievements:
+            self.by_field.setdefault(spec["field"], ([], []))[0].append(spec)
+        for spec in self.stats:
+            self.by_field.setdefault(spec["field"], ([], []))[1].append(spec)
+
+class RuleTracker:
+    """Per-state evaluation of a RuleSet, remembering the last seen value of each field."""
+    def __init__(self, rules: RuleSet):
+        self.rules = rules
+        self._snapshot: Dict[str, Any] = {}
+        self._bound: Any = None
+
+    def bind(self, state: Any) -> None:
+        if state is self._bound:
+            return
+        self._bound = state
+        self._snapshot.clear()
+        for name, needle in self.rules.counters.items():
+            state.track_thoughts(name, needle)
+
+    def evaluate(self, state: Any) -> List[str]:
+        """Apply changed rules to ``state``; returns achievement keys unlocked by this call."""
+        self.bind(state)
+        unlocked: List[str] = []
+        for path, (achievements, stats) in self.rules.by_field.items():
+            value = resolve_field(state, path)
+            if self._snapshot.get(path, _MISSING) == value:
+                continue
+            self._snapshot[path] = value
+            for spec in achievements:
+                key = spec["key"]
+                if key not in state.achievements_unlocked and OPS[spec.get("op", ">=")](value, spec["value"]):
+                    state.achievements_unlocked.append(key)
+                    unlocked.append(key)
+            for spec in stats:
+                stat = spec["stat"]
+                if hasattr(state, stat):
+                    setattr(state, stat, max(getattr(state, stat), value))
+        return unlocked
@@ -0,0 +1,72 @@
+from __future__ import annotations
+import random
+from typing import Any, Dict, Generic, List, Mapping, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+class AliasSampler(Generic[T]):
+    """Walker's alias method: O(n) build, O(1) weighted draw."""
+    def __init__(self, items: Sequence[T], weights: Sequence[float]):
+        if not items or len(items) != len(weights):
+            raise ValueError("need one positive weight per item")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("weights must sum to > 0")
+        n = len(items)
+        self.items = list(items)
+        self._prob = [0.0] * n
+        self._alias = [0] * n
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, g = small.pop(), large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = g
+            scaled[g] = scaled[g] + scaled[s] - 1.0
+            (small if scaled[g] < 1.0 else large).append(g)
+        for i in large + small:  # leftovers are 1.0 up to float error
+            self._prob[i] = 1.0
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def sample(self, rng: random.Random | None = None) -> T:
+        r = rng or random
+        i = r.randrange(len(self.items))
+        return self.items[i] if r.random() < self._prob[i] else self.items[self._alias[i]]
+
+def event_weights(
+    bias: Mapping[str, float],
+    events_by_key: Mapping[str, Mapping[str, Any]],
+    events_by_tag: Mapping[str, Sequence[Mapping[str, Any]]],
+) -> Dict[str, float]:
+    """Resolve scenario ``event_bias`` to per-event weights.
+
+    Bias names may be event tags (fanned out through the tag index) or event keys;
+    every resulting weight is scaled by the event's ``rarity``.
+    """
+    weights: Dict[str, float] = {}
+    for name, w in bias.items():
+        if w <= 0:
+            continue
+        targets = list(events_by_tag.get(name, []))
+        if name in events_by_key:
+            targets.append(events_by_key[name])
+        for ev in targets:
+            weights[ev["key"]] = weights.get(ev["key"], 0.0) + float(w)
+    return {
+        key: w * float(events_by_key[key].get("rarity", 1.0))
+        for key, w in weights.items()
+        if w * float(events_by_key[key].get("rarity", 1.0)) > 0
+    }
+
+def compile_event_sampler(
+    bias: Mapping[str, float],
+    events_by_key: Mapping[str, Mapping[str, Any]],
+    events_by_tag: Mapping[str, Sequence[Mapping[str, Any]]],
+) -> Optional[AliasSampler[str]]:
+    weights = event_weights(bias, events_by_key, events_by_tag)
+    if not weights:
+        return None
+    return AliasSampler(list(weights.keys()), list(weights.values()))
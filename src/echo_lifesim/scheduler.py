@@ -0,0 +1,216 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import math
+import threading
+import time
+from .engine import LifeSimEngine
+from .persistence import save_state
+
+Job = Callable[[], None]
+Dispatch = Callable[[Job], None]
+
+class Timer:
+    """Handle for a scheduled job (``interval`` set = repeating, fixed delay between runs)."""
+    __slots__ = ("fn", "interval", "deadline", "rounds", "cancelled")
+
+    def __init__(self, fn: Job, interval: Optional[int]):
+        self.fn = fn
+        self.interval = interval  # ticks
+        self.deadline = 0
+        self.rounds = 0
+        self.cancelled = False
+
+class TimerWheel:
+    """Hashed timer wheel: O(1) insert/cancel, each tick only looks at one slot.
+
+    A timer lands in slot ``deadline % slots`` and carries the number of full wheel
+    rotations (``rounds``) still to wait. Time is counted in whole ticks; delays round up,
+    so a timer never fires early.
+    """
+    def __init__(self, slots: int = 512):
+        self.slots: List[List[Timer]] = [[] for _ in range(slots)]
+        self.tick = 0
+        self.size = 0
+
+    def add(self, timer: Timer, delay: int) -> None:
+        delay = max(1, delay)
+        timer.deadline = self.tick + delay
+        timer.rounds = (delay - 1) // len(self.slots)
+        self.slots[timer.deadline % len(self.slots)].append(timer)
+        self.size += 1
+
+    def advance(self) -> List[Timer]:
+        """Move one tick forward and return the timers due at it."""
+        self.tick += 1
+        slot = self.slots[self.tick % len(self.slots)]
+        due: List[Timer] = []
+        keep: List[Timer] = []
+        for t in slot:
+            if t.cancelled:
+                self.size -= 1
+            elif t.rounds:
+                t.rounds -= 1
+                keep.append(t)
+            else:
+                self.size -= 1
+                due.append(t)
+        slot[:] = keep
+        return due
+
+class Scheduler:
+    """One background thread driving a TimerWheel.
+
+    The thread sleeps until the next tick boundary (or indefinitely while nothing is
+    scheduled), catches up on missed ticks after a stall, and hands due jobs to
+    ``dispatch``. The default dispatch runs them inline on the scheduler thread; an event
+    loop can pass e.g. ``lambda job: loop.call_soon_threadsafe(job)``.
+    """
+    def __init__(self, tick_ms: float = 50.0, slots: int = 512, dispatch: Optional[Dispatch] = None):
+        self.tick_ms = tick_ms
+        self.dispatch: Dispatch = dispatch or (lambda job: job())
+        self.errors = 0  # jobs that raised; the newest exception is kept in last_error
+        self.last_error: Optional[BaseException] = None
+        self._wheel = TimerWheel(slots)
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._origin = time.monotonic()
+
+    def _ticks(self, ms: float) -> int:
+        return max(1, math.ceil(ms / self.tick_ms))
+
+    def call_later(self, delay_ms: float, fn: Job) -> Timer:
+        return self._add(Timer(fn, None), delay_ms)
+
+    def call_every(self, interval_ms: float, fn: Job, first_ms: Optional[float] = None) -> Timer:
+        timer = Timer(fn, self._ticks(interval_ms))
+        return self._add(timer, interval_ms if first_ms is None else first_ms)
+
+    def reschedule(self, timer: Timer, interval_ms: float) -> Timer:
+        """Cancel ``timer`` and re-arm its job with a new interval, counted from now."""
+        timer.cancelled = True
+        return self._add(Timer(timer.fn, self._ticks(interval_ms) if timer.interval else None), interval_ms)
+
+    @staticmethod
+    def cancel(timer: Timer) -> None:
+        timer.cancelled = True
+
+    def _add(self, timer: Timer, delay_ms: float) -> Timer:
+        with self._cond:
+            self._wheel.add(timer, self._ticks(delay_ms))
+            self._cond.notify()
+        return timer
+
+    def __len__(self) -> int:
+        return self._wheel.size
+
+    def start(self) -> "Scheduler":
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+            # wheel tick 0 = now
+            self._origin = time.monotonic() - self._wheel.tick * self.tick_ms / 1000.0
+        self._thread = threading.Thread(target=self._run, name="echo-scheduler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                if not self._wheel.size:
+                    self._cond.wait()
+                    # idle time does not count: restart the clock at the current tick
+                    self._origin = time.monotonic() - self._wheel.tick * self.tick_ms / 1000.0
+                    continue
+                target = math.floor((time.monotonic() - self._origin) * 1000.0 / self.tick_ms)
+                if target <= self._wheel.tick:
+                    next_at = self._origin + (self._wheel.tick + 1) * self.tick_ms / 1000.0
+                    self._cond.wait(max(0.0, next_at - time.monotonic()))
+                    continue
+                due: List[Timer] = []
+                while self._wheel.tick < target:
+                    due.extend(self._wheel.advance())
+            for timer in due:
+                if timer.cancelled:
+                    continue
+                try:
+                    self.dispatch(timer.fn)
+                except Exception as e:
+                    self.errors += 1
+                    self.last_error = e
+                if timer.interval and not timer.cancelled:
+                    with self._cond:
+                        self._wheel.add(timer, timer.interval)
+
+class EngineJobs:
+    """Periodic jobs for one engine on a shared Scheduler.
+
+    - thoughts: every ``state.thought_interval_ms``; re-armed when overmind_step changes it
+    - autonomous tick, dream check and (optional) autosave on fixed intervals
+
+    Jobs take ``engine.lock``; code that drives the same engine from another thread
+    should hold it too. Failing jobs are counted in ``failures`` (``last_error`` holds the
+    newest one) for the caller to report.
+    """
+    def __init__(
+        self,
+        scheduler: Scheduler,
+        engine: LifeSimEngine,
+        tick_ms: Optional[float] = 30_000,
+        dream_ms: Optional[float] = 60_000,
+        autosave_path: Optional[Path] = None,
+        autosave_ms: float = 60_000,
+    ):
+        self.scheduler = scheduler
+        self.engine = engine
+        self.autosave_path = autosave_path
+        self.timers: Dict[str, Timer] = {}
+        self.failures: Dict[str, int] = {}
+        self.last_error: Optional[str] = None
+        self.timers["thought"] = scheduler.call_every(engine.state.thought_interval_ms, self._locked("thought", engine.thought_tick))
+        if tick_ms:
+            self.timers["tick"] = scheduler.call_every(tick_ms, self._locked("tick", engine.autonomous_tick))
+        if dream_ms:
+            self.timers["dream"] = scheduler.call_every(dream_ms, self._locked("dream", engine.dream_check))
+        if autosave_path is not None:
+            self.timers["autosave"] = scheduler.call_every(autosave_ms, self._locked("autosave", self._save))
+        engine.on_thought_interval = self._thought_interval_changed
+
+    def _locked(self, name: str, fn: Callable[[], object]) -> Job:
+        def job() -> None:
+            with self.engine.lock:
+                try:
+                    fn()
+                except Exception as e:
+                    self.failures[name] = self.failures.get(name, 0) + 1
+                    self.last_error = f"{name}: {e!r}"
+                    raise
+        return job
+
+    def _save(self) -> None:
+        assert self.autosave_path is not None
+        save_state(self.engine.state, self.autosave_path)
+
+    def _thought_interval_changed(self, interval_ms: int) -> None:
+        timer = self.timers.get("thought")
+        if timer is not None and not timer.cancelled:
+            self.timers["thought"] = self.scheduler.reschedule(timer, interval_ms)
+
+    def detach(self) -> None:
+        for timer in self.timers.values():
+            self.scheduler.cancel(timer)
+        self.timers.clear()
+        if self.engine.on_thought_interval == self._thought_interval_changed:
+            self.engine.on_thought_interval = None
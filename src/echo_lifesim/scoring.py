@@ -0,0 +1,115 @@
+from __future__ import annotations
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+import numpy.typing as npt
+from .models import PersonaState
+
+OVERLAP_WEIGHT = 0.7
+IMPORTANCE_WEIGHT = 0.3
+RECENCY_WEIGHT = 0.2
+
+class EpisodeScorer:
+    """Vectorized relevance scoring over contiguous importance/timestamp arrays.
+
+    Rows are kept aligned with absolute episode ids and synced incrementally from the
+    state: new episodes are appended, compressed history is dropped from the front.
+    """
+    def __init__(self, capacity: int = 256) -> None:
+        self._ts = np.empty(capacity, dtype=np.float64)
+        self._imp = np.empty(capacity, dtype=np.float64)
+        self._start = 0  # buffer offset of the first live row
+        self._n = 0
+        self._base = 0  # episode id of the first live row
+
+    def __len__(self) -> int:
+        return self._n
+
+    def sync(self, state: PersonaState) -> None:
+        base = state.episode_base
+        end = base + len(state.episodes)
+        if base > self._base:
+            drop = min(base - self._base, self._n)
+            self._start += drop
+            self._n -= drop
+            self._base = base
+        if base < self._base or self._base + self._n > end:
+            # history was replaced wholesale -> rebuild
+            self._start, self._n, self._base = 0, 0, base
+        first_new = self._base + self._n
+        if first_new >= end:
+            return
+        self._reserve(end - first_new)
+        at = self._start + self._n
+        lo, hi = first_new - base, end - base
+        # straight from the store's columns (array slices are copies, safe to wrap)
+        self._ts[at : at + hi - lo] = np.frombuffer(state.episodes.ts_slice(lo, hi), dtype=np.float64)
+        self._imp[at : at + hi - lo] = np.frombuffer(state.episodes.importance_slice(lo, hi), dtype=np.float64)
+        self._n = end - self._base
+
+    def _reserve(self, extra: int) -> None:
+        need = self._n + extra
+        if self._start + need <= len(self._ts):
+            return
+        cap = max(len(self._ts), 16)
+        while cap < need * 2:
+            cap *= 2
+        live = slice(self._start, self._start + self._n)
+        ts = np.empty(cap, dtype=np.float64)
+        imp = np.empty(cap, dtype=np.float64)
+        ts[: self._n] = self._ts[live]
+        imp[: self._n] = self._imp[live]
+        self._ts, self._imp, self._start = ts, imp, 0
+
+    def rows(self, ids: np.ndarray) -> np.ndarray:
+        return ids - self._base + self._start
+
+    def now(self) -> float:
+        """Timestamp of the newest synced episode (the recency reference point)."""
+        return float(self._ts[self._start + self._n - 1]) if self._n else 0.0
+
+    def base_scores(self, ids: np.ndarray) -> npt.NDArray[np.float64]:
+        """Importance + recency part of the score (query independent)."""
+        rows = self.rows(ids)
+        now = self.now()
+        recency = 1.0 / (1.0 + (now - self._ts[rows]) / 3600.0)
+        return np.asarray(self._imp[rows] * IMPORTANCE_WEIGHT + recency * RECENCY_WEIGHT, dtype=np.float64)
+
+    def score(self, ids: np.ndarray, overlap: np.ndarray, n_tokens: int) -> npt.NDArray[np.float64]:
+        return np.asarray((overlap / max(1, n_tokens)) * OVERLAP_WEIGHT + self.base_scores(ids), dtype=np.float64)
+
+    def score_many(self, ids: np.ndarray, hits: np.ndarray, n_tokens: np.ndarray) -> npt.NDArray[np.float64]:
+        """Score a (queries x candidates) hit matrix against shared candidate ids."""
+        overlap = hits / np.maximum(1, n_tokens)[:, None]
+        return np.asarray(overlap * OVERLAP_WEIGHT + self.base_scores(ids)[None, :], dtype=np.float64)
+
+def top_k_scored(ids: np.ndarray, scores: np.ndarray, k: int) -> List[Tuple[int, float]]:
+    """(id, score) of the k best scores, best first; ties go to the newer episode."""
+    if k <= 0 or not len(ids):
+        return []
+    if k < len(ids):
+        sel = np.argpartition(scores, len(ids) - k)[len(ids) - k:]
+    else:
+        sel = np.arange(len(ids))
+    sel = sel[np.lexsort((ids[sel], scores[sel]))[::-1]]
+    return [(int(i), float(sc)) for i, sc in zip(ids[sel], scores[sel])]
+
+def top_k(ids: np.ndarray, scores: np.ndarray, k: int) -> List[int]:
+    return [i for i, _sc in top_k_scored(ids, scores, k)]
+
+def hits_to_arrays(hits: Dict[int, int]) -> tuple[np.ndarray, np.ndarray]:
+    ids = np.fromiter(hits.keys(), dtype=np.int64, count=len(hits))
+    counts = np.fromiter(hits.values(), dtype=np.float64, count=len(hits))
+    return ids, counts
+
+def hit_matrix(per_query: Sequence[Dict[int, int]], ids: np.ndarray) -> np.ndarray:
+    mat = np.zeros((len(per_query), len(ids)), dtype=np.float64)
+    for q, hits in enumerate(per_query):
+        if hits:
+            q_ids, q_counts = hits_to_arrays(hits)
+            mat[q, np.searchsorted(ids, q_ids)] = q_counts
+    return mat
+
+def score_records(importance: np.ndarray, ts: np.ndarray, overlap: np.ndarray, n_tokens: int, now: float) -> np.ndarray:
+    """Same weighting for rows that live outside the scorer (e.g. archived episodes)."""
+    recency = 1.0 / (1.0 + (now - ts) / 3600.0)
+    return (overlap / max(1, n_tokens)) * OVERLAP_WEIGHT + importance * IMPORTANCE_WEIGHT + recency * RECENCY_WEIGHT
@@ -0,0 +1,156 @@
+from __future__ import annotations
+from bisect import bisect_left, insort
+from typing import Dict, List, Sequence, Tuple
+import unicodedata
+import zlib
+import numpy as np
+import numpy.typing as npt
+from .models import PersonaState
+
+_FOLD = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+
+def normalize_text(text: str) -> str:
+    """Casefold, fold umlauts/accents and collapse non-letters to single spaces."""
+    text = text.casefold().translate(_FOLD)
+    text = unicodedata.normalize("NFKD", text)
+    chars = [c if c.isalnum() else " " for c in text if not unicodedata.combining(c)]
+    return " ".join("".join(chars).split())
+
+class HashedEmbedder:
+    """Offline text vectors: signed feature hashing of character n-grams (no model download)."""
+    def __init__(self, dim: int = 256, ngram_sizes: Sequence[int] = (3, 4)):
+        self.dim = dim
+        self.ngram_sizes = tuple(ngram_sizes)
+
+    def embed(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for word in normalize_text(text).split():
+            padded = f" {word} "
+            for n in self.ngram_sizes:
+                for i in range(max(1, len(padded) - n + 1)):
+                    h = zlib.crc32(padded[i:i + n].encode())
+                    vec[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
+
+class SemanticIndex:
+    """Approximate nearest-neighbour index over hashed episode embeddings.
+
+    Vectors live in one growing float32 matrix aligned with absolute episode ids (synced
+    incrementally like ``EpisodeScorer``). Random-hyperplane LSH tables map each vector to
+    buckets; a query only scores the episodes found in its buckets (plus one-bit probes).
+    Below ``exact_below`` rows a full matrix scan is cheaper than probing and is exact.
+    """
+    def __init__(self, embedder: HashedEmbedder | None = None, tables: int = 6, bits: int = 10, seed: int = 7,
+                 exact_below: int = 4096):
+        self.embedder = embedder or HashedEmbedder()
+        self.exact_below = exact_below
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((tables, bits, self.embedder.dim)).astype(np.float32)
+        self._weights = (1 << np.arange(bits)).astype(np.int64)
+        self._reset(0)
+
+    def _reset(self, base: int) -> None:
+        tables = len(self._planes)
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(tables)]
+        self._vecs = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self._codes = np.zeros((0, tables), dtype=np.int64)
+        self._n = 0
+        self._base = base
+        self._edits_seen = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _hash(self, vecs: np.ndarray) -> npt.NDArray[np.int64]:
+        """(n, dim) -> (n, tables) bucket codes."""
+        signs = np.einsum("tbd,nd->ntb", self._planes, vecs) > 0
+        return np.asarray(signs.astype(np.int64) @ self._weights, dtype=np.int64)
+
+    def sync(self, state: PersonaState) -> None:
+        base = state.episode_base
+        end = base + len(state.episodes)
+        edited = state.edits_since(self._edits_seen)
+        if edited is None or base < self._base or self._base + self._n > end:
+            self._reset(base)  # history replaced wholesale, or edits older than the state's log
+            edited = []
+        if base > self._base:
+            self._drop_before(base)
+        self._apply_edits(state, edited)
+        self._edits_seen = state.edit_count
+        first_new = self._base + self._n
+        if first_new >= end:
+            return
+        new = np.stack([self.embedder.embed(state.episodes[i - base].text) for i in range(first_new, end)])
+        codes = self._hash(new)
+        rows = self._n + len(new)
+        if rows > len(self._vecs):
+            cap = max(64, rows * 2)
+            vecs = np.zeros((cap, self.embedder.dim), dtype=np.float32)
+            all_codes = np.zeros((cap, len(self._buckets)), dtype=np.int64)
+            vecs[: self._n] = self._vecs[: self._n]
+            all_codes[: self._n] = self._codes[: self._n]
+            self._vecs, self._codes = vecs, all_codes
+        self._vecs[self._n:rows] = new
+        self._codes[self._n:rows] = codes
+        for offset, row_codes in enumerate(codes.tolist()):
+            ep_id = first_new + offset
+            for table, code in zip(self._buckets, row_codes):
+                table.setdefault(code, []).append(ep_id)
+        self._n = rows
+
+    def _apply_edits(self, state: PersonaState, edited: List[int]) -> None:
+        for ep_id in edited:
+            row = ep_id - self._base
+            ep = state.episode_by_id(ep_id)
+            if ep is None or not 0 <= row < self._n:
+                continue
+            vec = self.embedder.embed(ep.text)
+            code = self._hash(vec[None, :])[0]
+            for table, old, new in zip(self._buckets, self._codes[row].tolist(), code.tolist()):
+                if old != new:
+                    ids = table[old]
+                    ids.remove(ep_id)
+                    if not ids:
+                        del table[old]
+                    insort(table.setdefault(new, []), ep_id)
+            self._vecs[row] = vec
+            self._codes[row] = code
+
+    def _drop_before(self, base: int) -> None:
+        drop = min(base - self._base, self._n)
+        for table_idx, table in enumerate(self._buckets):
+            for code in set(self._codes[:drop, table_idx].tolist()):
+                ids = table[code]
+                del ids[: bisect_left(ids, base)]
+                if not ids:
+                    del table[code]
+        self._vecs[: self._n - drop] = self._vecs[drop: self._n]
+        self._codes[: self._n - drop] = self._codes[drop: self._n]
+        self._n -= drop
+        self._base = base
+
+    def query(self, text: str, k: int = 5) -> List[Tuple[int, float]]:
+        """(episode id, cosine similarity) of the best approximate matches, best first."""
+        if not self._n or k <= 0:
+            return []
+        q = self.embedder.embed(text)
+        if not q.any():
+            return []
+        if self._n < self.exact_below:
+            ids = np.arange(self._base, self._base + self._n, dtype=np.int64)
+        else:
+            codes = self._hash(q[None, :])[0].tolist()
+            probes = [0, *self._weights.tolist()]  # exact bucket + every one-bit neighbour
+            found: set[int] = set()
+            for table, code in zip(self._buckets, codes):
+                for flip in probes:
+                    found.update(table.get(code ^ flip, ()))
+            if not found:
+                return []
+            ids = np.fromiter(found, dtype=np.int64, count=len(found))
+        sims = self._vecs[ids - self._base] @ q
+        keep = min(k, len(ids))
+        sel = np.argpartition(sims, len(ids) - keep)[len(ids) - keep:]
+        sel = sel[np.lexsort((ids[sel], sims[sel]))[::-1]]
+        return [(int(i), float(sc)) for i, sc in zip(ids[sel], sims[sel])]
@@ -0,0 +1,185 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+from typing import Dict, Iterator, List, Optional, Tuple, TypedDict
+import os
+import random
+import time
+import numpy as np
+from .catalogs import get_registry
+from .engine import LifeSimEngine
+from .models import NEED_KEYS, TIME_BLOCKS, PersonaState, use_clock
+
+SIM_EPOCH = 1_700_000_000.0  # simulated wall clock start (fixed, so runs are reproducible)
+
+# scripted user lines; each step one is drawn per persona
+SCRIPT: Tuple[str, ...] = (
+    "Bin etwas müde, will aber einen klaren nächsten Schritt",
+    "Arbeit am Projekt stockt, ich brauche Fokus",
+    "Heute abends Zeit mit Freunden",
+    "Morgens ruhig starten und etwas Sport",
+    "Fühle mich zerstreut und unruhig",
+    "Familie besuchen oder lieber allein sein?",
+    "Körper fühlt sich schwer an, gesund essen",
+    "Neuer Job-Gedanke lässt mich nicht los",
+)
+
+class SimBatch(TypedDict):
+    """Metrics of one shard, one row (or column) per persona."""
+    start: int  # index of the shard's first persona
+    needs: np.ndarray  # (steps + 1, personas, needs) int16, row 0 = initial needs
+    accepted: np.ndarray  # (personas,) int32
+    rejected: np.ndarray  # (personas,) int32
+    thoughts: np.ndarray  # (personas,) int32
+    achievements: Dict[str, np.ndarray]  # key -> (personas,) bool
+
+class SimReport(TypedDict):
+    personas: int
+    steps: int
+    seed: int
+    need_mean: Dict[str, List[float]]  # need -> mean per step (steps + 1 values)
+    need_std: Dict[str, List[float]]
+    acceptance: float  # accepted / (accepted + rejected) over all personas
+    acceptance_hist: List[int]  # personas per acceptance-rate decile
+    thoughts_mean: float
+    achievements: Dict[str, int]  # personas that unlocked the key
+    digest: str  # hash over all batches in persona order (same seed -> same digest)
+    seconds: float
+
+class _OfflineEngine(LifeSimEngine):
+    """Engine without LLM enrichment (replies stay local and deterministic)."""
+    def _enrich(self, user_text: str, reply: str) -> Optional[str]:
+        return None
+
+def _init_worker() -> None:
+    # catalogs are read once per worker and not re-checked during the run
+    reg = get_registry()
+    reg.refresh(force=True)
+    reg.check_interval = float("inf")
+    reg.event_sampler("default")
+
+def _initial_state(rng: random.Random) -> PersonaState:
+    s = PersonaState()
+    for k in NEED_KEYS:
+        setattr(s.needs, k, rng.randint(20, 80))
+    s.time_block = rng.choice(TIME_BLOCKS)
+    return s
+
+def run_shard(start: int, count: int, steps: int, seed: int, step_minutes: float = 60.0) -> SimBatch:
+    """Simulate personas ``start .. start + count - 1``.
+
+    Every persona gets its own RNG derived from ``(seed, index)`` and a simulated clock,
+    so its trajectory does not depend on the shard it lands in. Per step: one scripted
+    turn, accept a suggested action (with a per-persona probability) or reject, one
+    autonomous tick.
+    """
+    keys = [a["key"] for a in get_registry().rules.achievements]
+    needs = np.empty((steps + 1, count, len(NEED_KEYS)), dtype=np.int16)
+    accepted = np.zeros(count, dtype=np.int32)
+    rejected = np.zeros(count, dtype=np.int32)
+    thoughts = np.zeros(count, dtype=np.int32)
+    unlocked = {k: np.zeros(count, dtype=bool) for k in keys}
+    for j in range(count):
+        rng = random.Random(f"{seed}:{start + j}")
+        engine = _OfflineEngine(_initial_state(rng), rng=random.Random(rng.getrandbits(64)))
+        s = engine.state
+        accept_p = 0.3 + 0.6 * rng.random()
+        needs[0, j] = s.needs.vector()
+        clock = [SIM_EPOCH]
+        with use_clock(lambda: clock[0]):
+            for t in range(steps):
+                clock[0] = SIM_EPOCH + t * step_minutes * 60
+                reply = engine.persona_reply(rng.choice(SCRIPT))
+                if reply["actions"] and rng.random() < accept_p:
+                    engine.apply_action_result(rng.choice(reply["actions"])[0])
+                else:
+                    engine.reject_action()
+                engine.autonomous_tick()
+                needs[t + 1, j] = s.needs.vector()
+        accepted[j] = s.accepted_actions
+        rejected[j] = s.rejected_actions
+        thoughts[j] = len(s.thoughts)
+        for k in s.achievements_unlocked:
+            if k in unlocked:
+                unlocked[k][j] = True
+    return {
+        "start": start,
+        "needs": needs,
+        "accepted": accepted,
+        "rejected": rejected,
+        "thoughts": thoughts,
+        "achievements": unlocked,
+    }
+
+def _run_shard(args: Tuple[int, int, int, int, float]) -> SimBatch:
+    return run_shard(*args)
+
+def iter_batches(
+    personas: int,
+    steps: int,
+    seed: int = 0,
+    workers: int = 0,
+    shard_size: int = 64,
+    step_minutes: float = 60.0,
+) -> Iterator[SimBatch]:
+    """Shard batches in persona order. ``workers`` 0 = one per CPU, 1 = in this process."""
+    shards = [
+        (start, min(shard_size, personas - start), steps, seed, step_minutes)
+        for start in range(0, personas, max(1, shard_size))
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(shards) <= 1:
+        for shard in shards:
+            yield _run_shard(shard)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards)), initializer=_init_worker) as pool:
+        yield from pool.map(_run_shard, shards)
+
+def simulate(
+    personas: int,
+    steps: int,
+    seed: int = 0,
+    workers: int = 0,
+    shard_size: int = 64,
+    step_minutes: float = 60.0,
+) -> SimReport:
+    """Run a headless population and reduce the shard batches as they arrive."""
+    t0 = time.perf_counter()
+    need_sum = np.zeros((steps + 1, len(NEED_KEYS)), dtype=np.int64)
+    need_sq = np.zeros_like(need_sum)
+    accepted = rejected = thoughts = 0
+    hist = np.zeros(10, dtype=np.int64)
+    achievements: Dict[str, int] = {}
+    # one hash per column, persona-major, so the digest does not depend on shard_size
+    digests = [sha256() for _ in range(4)]
+    for batch in iter_batches(personas, steps, seed, workers, shard_size, step_minutes):
+        wide = batch["needs"].astype(np.int64)
+        need_sum += wide.sum(axis=1)
+        need_sq += (wide * wide).sum(axis=1)
+        accepted += int(batch["accepted"].sum())
+        rejected += int(batch["rejected"].sum())
+        thoughts += int(batch["thoughts"].sum())
+        total = batch["accepted"] + batch["rejected"]
+        rate = np.divide(batch["accepted"], total, out=np.zeros(len(total)), where=total > 0)
+        hist += np.bincount(np.minimum((rate * 10).astype(np.int64), 9), minlength=10)
+        for key, hit in batch["achievements"].items():
+            achievements[key] = achievements.get(key, 0) + int(hit.sum())
+        columns = (batch["needs"].transpose(1, 0, 2), batch["accepted"], batch["rejected"], batch["thoughts"])
+        for h, arr in zip(digests, columns):
+            h.update(np.ascontiguousarray(arr).tobytes())
+    n = max(1, personas)
+    mean = need_sum / n
+    std = np.sqrt(np.maximum(need_sq / n - mean * mean, 0.0))
+    return {
+        "personas": personas,
+        "steps": steps,
+        "seed": seed,
+        "need_mean": {k: mean[:, i].round(3).tolist() for i, k in enumerate(NEED_KEYS)},
+        "need_std": {k: std[:, i].round(3).tolist() for i, k in enumerate(NEED_KEYS)},
+        "acceptance": accepted / max(1, accepted + rejected),
+        "acceptance_hist": hist.tolist(),
+        "thoughts_mean": thoughts / n,
+        "achievements": achievements,
+        "digest": sha256(b"".join(h.digest() for h in digests)).hexdigest(),
+        "seconds": time.perf_counter() - t0,
+    }
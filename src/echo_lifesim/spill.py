@@ -0,0 +1,35 @@
+from __future__ import annotations
+from pathlib import Path
+import orjson
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+Record = Dict[str, Any]
+
+class SpillLog:
+    """Append-only sidecar for records trimmed from the bounded state buffers.
+
+    One orjson line per record, tagged with the buffer it came from (``"kind"``). The file
+    is only opened while a batch is written, so there is no handle to close.
+    """
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+
+    def append_many(self, kind: str, records: Iterable[Record]) -> int:
+        n = 0
+        with self.path.open("ab") as f:
+            for rec in records:
+                f.write(orjson.dumps({"kind": kind, **rec}) + b"\n")
+                n += 1
+        return n
+
+    def read(self, kind: Optional[str] = None) -> Iterator[Record]:
+        """Spilled records, oldest first, optionally only those of one ``kind``."""
+        if not self.path.exists():
+            return
+        with self.path.open("rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                rec: Record = orjson.loads(line)
+                if kind is None or rec.get("kind") == kind:
+                    yield rec
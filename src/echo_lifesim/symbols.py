@@ -0,0 +1,81 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+class SymbolTable:
+    """Append-only string <-> small int table for identifiers (actors, topics, tags, habit keys).
+
+    Ids are positions in ``names`` and never change, so they can be stored in columns and
+    in the state file; the table itself is saved once as the list of names.
+    """
+    __slots__ = ("names", "_ids")
+
+    def __init__(self, names: Optional[List[str]] = None):
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        for name in names or ():
+            self.intern(name)
+
+    def intern(self, name: str) -> int:
+        sid = self._ids.get(name)
+        if sid is None:
+            sid = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return sid
+
+    def get(self, name: str) -> Optional[int]:
+        """Id of ``name`` without adding it (None = never seen, so nothing can match it)."""
+        return self._ids.get(name)
+
+    def name(self, sid: int) -> str:
+        return self.names[sid]
+
+    def resolve(self, ref: Any) -> int:
+        """Id for a stored reference: an id into this table or a plain name (older files)."""
+        if type(ref) is int:
+            if not 0 <= ref < len(self.names):
+                raise ValueError(f"unknown symbol id {ref}")
+            return ref
+        if isinstance(ref, str):
+            return self.intern(ref)
+        raise TypeError("symbol must be a name or an id")
+
+    def copy(self) -> "SymbolTable":
+        clone = SymbolTable.__new__(SymbolTable)
+        clone.names = list(self.names)
+        clone._ids = dict(self._ids)
+        return clone
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._ids
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SymbolTable):
+            return self.names == other.names
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"SymbolTable({len(self.names)} names)"
+
+    @classmethod
+    def validate(cls, value: Any) -> "SymbolTable":
+        if isinstance(value, SymbolTable):
+            return value
+        if not isinstance(value, list) or not all(isinstance(n, str) for n in value):
+            raise ValueError("symbols must be a list of strings")
+        if len(set(value)) != len(value):
+            raise ValueError("symbols must be unique")
+        return cls(value)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls.validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda table: list(table.names)),
+        )
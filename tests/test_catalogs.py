@@ -0,0 +1,140 @@
+import os
+import orjson
+from echo_lifesim.catalogs import CatalogRegistry
+
+def _write(path, data, mtime):
+    path.write_bytes(orjson.dumps(data))
+    os.utime(path, ns=(mtime, mtime))
+
+def test_registry_validates_and_reloads_on_change(tmp_path):
+    actions = tmp_path / "actions.json"
+    events = tmp_path / "events.json"
+    _write(actions, [
+        {"label": "kurzer stretch", "duration": "2-Min", "need_effects": {"energy": 4}, "tags": ["body"]},
+        {"label": "kaputt", "need_effects": {"mood": 3}},
+        {"duration": "5-Min"},
+    ], 1_000_000_000)
+    _write(events, [{"key": "regen", "need_effects": {"calm": 5}, "rarity": 0.6, "tags": ["weather"]}], 1_000_000_000)
+    reg = CatalogRegistry(actions, events, tmp_path, tmp_path, check_interval=0)
+    assert [a["label"] for a in reg.actions] == ["kurzer stretch"]
+    assert len(reg.rejected) == 2
+    assert reg.actions_by_tag["body"][0] is reg.action("kurzer stretch")
+    assert reg.events_by_tag["weather"][0]["key"] == "regen"
+    gen = reg.generation
+    reg.actions
+    assert reg.generation == gen  # unchanged files are not re-read
+    _write(actions, [{"label": "nachricht an freund", "need_effects": {"connection": 8}}], 2_000_000_000)
+    assert reg.action("nachricht an freund") is not None
+    assert reg.action("kurzer stretch") is None
+    assert reg.generation == gen + 1 and reg.rejected == []
+
+def test_event_sampler_resolves_bias_tags_with_rarity(tmp_path):
+    import random
+    from echo_lifesim.sampling import AliasSampler
+    events = tmp_path / "events.json"
+    _write(events, [
+        {"key": "regen", "need_effects": {"calm": 5}, "rarity": 0.6, "tags": ["weather"]},
+        {"key": "idee_fund", "need_effects": {"creativity": 8}, "rarity": 0.2, "tags": ["insight"]},
+        {"key": "absage", "need_effects": {"connection": -6}, "rarity": 0.3, "tags": ["social"]},
+    ], 1_000_000_000)
+    (tmp_path / "default.json").write_bytes(orjson.dumps({"name": "default", "event_bias": {"insight": 1.0, "weather": 1.0}}))
+    reg = CatalogRegistry(tmp_path / "none.json", events, tmp_path, tmp_path, check_interval=0)
+    sampler = reg.event_sampler("default")
+    assert sampler is not None and sorted(sampler.items) == ["idee_fund", "regen"]
+    assert reg.event_sampler("default") is sampler  # cached until catalogs change
+    rng = random.Random(3)
+    draws = [sampler.sample(rng) for _ in range(4000)]
+    assert 0.70 < draws.count("regen") / len(draws) < 0.80  # 0.6 / (0.6 + 0.2)
+    alias = AliasSampler(["a", "b", "c"], [1, 2, 7])
+    counts = [alias.sample(rng) for _ in range(10000)]
+    assert abs(counts.count("c") / 10000 - 0.7) < 0.03
+
+def test_action_table_matches_reference_scoring():
+    import random
+    from echo_lifesim.action_table import ActionTable
+    from echo_lifesim.models import NEED_KEYS, NeedState
+    rng = random.Random(11)
+    catalog = [
+        {"label": f"a{i}", "duration": "2-Min", "weight": rng.choice([1.0, 1.5]),
+         "need_effects": {k: rng.randint(-3, 8) for k in rng.sample(NEED_KEYS, 2)}}
+        for i in range(2000)
+    ]
+    needs = NeedState(energy=30, clarity=70, connection=52, order=10, creativity=55, calm=41)
+    ref = []
+    for a in catalog:
+        score = a["weight"]
+        for need, delta in a["need_effects"].items():
+            val = getattr(needs, need)
+            if delta > 0 and val < 55:
+                score += (55 - val) * (delta / 10)
+        ref.append((score, a["label"]))
+    ref.sort(key=lambda x: x[0], reverse=True)
+    table = ActionTable(catalog)
+    vec = [getattr(needs, k) for k in NEED_KEYS]
+    import numpy as np
+    assert [lbl for lbl, _d in table.top(np.array(vec, dtype=float), 12)] == [lbl for _s, lbl in ref[:12]]
+
+def test_rule_tracker_only_reevaluates_changed_fields(tmp_path):
+    from echo_lifesim.models import PersonaState, Artifact
+    from echo_lifesim.rules import RuleTracker
+    rules_file = tmp_path / "achievements.json"
+    _write(rules_file, {
+        "counters": [{"name": "insight_thoughts", "thoughts_containing": "Fokus"}],
+        "achievements": [
+            {"key": "artifact_2", "field": "artifacts", "op": ">=", "value": 2},
+            {"key": "calm_low", "field": "needs.calm", "op": "<", "value": 20},
+            {"key": "broken", "field": "xp", "op": "~", "value": 1},
+        ],
+        "stats": [{"stat": "stat_insight", "field": "counters.insight_thoughts"}],
+    }, 1_000_000_000)
+    reg = CatalogRegistry(tmp_path / "a.json", tmp_path / "e.json", tmp_path, tmp_path, check_interval=0, rules_path=rules_file)
+    tracker = RuleTracker(reg.rules)
+    assert reg.rejected == [f"{rules_file}:achievements[2]: op must be one of ['<', '<=', '==', '>', '>=']"]
+    state = PersonaState()
+    state.maybe_add_thought("Fokus auf Atem")
+    assert tracker.evaluate(state) == []
+    state.maybe_add_thought("Fokus auf Atem")  # collapsed repeat still counts
+    state.artifacts += [Artifact(epoch=0, title="a"), Artifact(epoch=0, title="b")]
+    state.needs.calm = 10
+    assert tracker.evaluate(state) == ["artifact_2", "calm_low"]
+    assert state.stat_insight == 2 and len(state.thoughts) == 1
+    state.achievements_unlocked.clear()
+    assert tracker.evaluate(state) == []  # nothing changed since the last snapshot
+
+def test_lexicon_automaton_matches_naive_substring_scan(tmp_path):
+    import random
+    from echo_lifesim.lexicon import AhoCorasick
+    rng = random.Random(5)
+    patterns = sorted({"".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(40)})
+    ac = AhoCorasick(patterns)
+    for _ in range(200):
+        text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 30)))
+        found = sorted(ac.find(text))
+        naive = sorted(pid for pid, p in enumerate(patterns) for i in range(len(text)) if text.startswith(p, i))
+        assert found == naive
+
+    lex_file = tmp_path / "lexicon.json"
+    _write(lex_file, {
+        "topics": {"work": ["arbeit", "job"], "social": {"freund": 1.0, "familie": 2.5}},
+        "preferences": ["abends", "Ruhig"],
+    }, 1_000_000_000)
+    reg = CatalogRegistry(tmp_path / "a.json", tmp_path / "e.json", tmp_path, tmp_path, check_interval=0, lexicon_path=lex_file)
+    assert reg.lexicon.scan("Arbeit und Job, abends mit der Familie, ganz ruhig") == ("social", ["abends", "ruhig"])
+    assert reg.lexicon.scan("Arbeit mit freund") == ("work", [])  # tie -> first listed topic
+    assert reg.lexicon.scan("nichts") == ("main", [])
+    _write(lex_file, {"topics": {"work": {"job": -1}}}, 2_000_000_000)
+    assert reg.lexicon.scan("job") == ("work", [])  # invalid file -> built-in defaults
+    assert reg.rejected and "using defaults" in reg.rejected[0]
+
+def test_thought_counters_survive_reload():
+    from echo_lifesim.engine import LifeSimEngine
+    from echo_lifesim.models import PersonaState
+    saved = PersonaState(counters={"insight_thoughts": 0})
+    saved.maybe_add_thought("Fokus auf Atem")
+    state = PersonaState.model_validate(saved.model_dump())
+    assert state.counters["insight_thoughts"] == 0
+    eng = LifeSimEngine(state)
+    assert state.counters["insight_thoughts"] == 1
+    state.maybe_add_thought("Fokus am Abend")
+    eng.autonomous_tick()
+    assert state.counters["insight_thoughts"] == 2 and state.stat_insight >= 2
@@ -16,3 +16,34 @@ def test_reflection_every_five():
         r = eng.persona_reply(f"Input {i}")
         ref = r["reflection"]
     assert ref is not None
+
+def test_async_reply_returns_local_text_and_enriches_later(monkeypatch):
+    import asyncio
+    import time
+    import echo_lifesim.engine as engine_mod
+
+    class SlowClient:
+        def available(self):
+            return True
+        async def chat(self, system, user):
+            await asyncio.sleep(0.1)
+            return "angereichert: " + user.splitlines()[0]
+
+    monkeypatch.setattr(engine_mod, "get_async_groq", lambda: SlowClient())
+
+    async def run():
+        engines = [LifeSimEngine(PersonaState()) for _ in range(5)]
+        t0 = time.perf_counter()
+        results = [await e.persona_reply_async(f"hallo {i}") for i, e in enumerate(engines)]
+        assert time.perf_counter() - t0 < 0.05  # local replies do not wait on the LLM
+        assert all(not r["reply"].startswith("angereichert") for r in results)
+        texts = await asyncio.gather(*(r["enriched"] for r in results))
+        assert time.perf_counter() - t0 < 0.3  # waits overlap
+        return engines, texts
+
+    engines, texts = asyncio.run(run())
+    for i, (e, text) in enumerate(zip(engines, texts)):
+        assert text == f"angereichert: User: hallo {i}"
+        persona = [ep for ep in e.state.episodes if ep.actor == "persona"]
+        assert persona[-1].text == text
+        assert e.memory.retrieve("angereichert", k=1)[0].text == text
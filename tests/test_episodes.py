@@ -0,0 +1,65 @@
+import pytest
+from pydantic import ValidationError
+from echo_lifesim.episodes import EpisodeStore, EpisodeView
+from echo_lifesim.models import Episode, PersonaState
+
+def test_store_round_trips_like_episode_models():
+    eps = [
+        Episode(actor="user", text="hallo", ts=1.0, day=0),
+        Episode(actor="system", text="x", tags=["overmind", "a"], importance=0.9, topic_id="work", ts=2.0, last_ts=3.0, repeat=2),
+        Episode(actor="persona", text="ohne tag", ts=4.0),
+    ]
+    store = EpisodeStore(eps)
+    assert store.dump() == [e.model_dump() for e in eps]
+    view = store[1]
+    assert isinstance(view, EpisodeView) and view == eps[1] and view.tags == ["overmind", "a"]
+    assert store[-1].day is None and store[0].last_ts is None
+    state = PersonaState(episodes=[e.model_dump() for e in eps])
+    assert PersonaState.model_validate(state.model_dump()).model_dump() == state.model_dump()
+    assert state.last_episodes(1, tag="a")[0].text == "x"
+    with pytest.raises(ValidationError):
+        PersonaState(episodes=[{"actor": "user"}])
+
+def test_views_follow_rows_through_compression_and_forks():
+    state = PersonaState(max_episode_history=3)
+    for i in range(6):
+        state.add_episode(Episode(actor="user", text=f"eintrag {i}"))
+    newest = state.episodes[-1]
+    state.advance_epoch()
+    assert len(state.episodes) == 3 and state.episode_base == 3
+    assert newest.text == "eintrag 5" and state.episodes[0].text == "eintrag 3"
+    fork = state.fork()
+    assert fork.replace_episode_text(5, "nur im fork")
+    assert newest.text == "eintrag 5" and fork.episodes[-1].text == "nur im fork"
+    assert fork.episodes is not state.episodes
+
+def test_state_file_stores_symbol_ids_and_reads_named_rows():
+    state = PersonaState()
+    state.add_episode(Episode(actor="user", text="a", topic_id="work", tags=["x", "y"]))
+    state.add_episode(Episode(actor="persona", text="b", topic_id="work"))
+    data = state.model_dump()
+    names = data["symbols"]
+    row = data["episodes"][0]
+    assert [names[row["actor"]], names[row["topic_id"]]] == ["user", "work"]
+    assert [names[t] for t in row["tags"]] == ["x", "y"]
+    loaded = PersonaState.model_validate(data)
+    assert loaded.episodes == state.episodes and loaded.symbols.names == names
+    legacy = PersonaState(episodes=[ep.model_dump() for ep in state.episodes])  # names, no table
+    assert legacy.last_episodes(5, topic="work", actor="persona")[0].text == "b"
+    assert legacy.last_episodes(5, actor="niemand") == []
+    with pytest.raises(ValidationError):
+        PersonaState(symbols=["user"], episodes=[{"actor": 3, "text": "?"}])
+
+def test_parent_writes_after_fork_leave_fork_history_alone():
+    state = PersonaState(max_live_episodes=4)
+    for i in range(5):
+        state.add_episode(Episode(actor="user", text=f"e{i}", topic_id="alt"))
+    fork = state.fork()
+    for i in range(5, 12):
+        state.add_episode(Episode(actor="user", text=f"e{i}", topic_id=f"neu{i}", tags=[f"t{i}"]))
+    assert state.episode_base > 0 and state.episodes[-1].text == "e11"
+    assert fork.episode_base == 0 and [ep.text for ep in fork.episodes] == [f"e{i}" for i in range(5)]
+    assert fork.episode_by_id(0).text == "e0"
+    fork.add_episode(Episode(actor="user", text="nur im fork", topic_id="fork", tags=["x"]))
+    assert fork.episodes[-1].topic_id == "fork" and fork.last_episodes(1, topic="alt")[0].text == "e4"
+    assert state.last_episodes(1, topic="fork") == [] and state.episodes[-1].text == "e11"
@@ -18,3 +18,96 @@ def test_history_compression():
         state.add_episode(Episode(actor="user", text=f"e {i}"))
     state.advance_epoch()
     assert len(state.episodes) <= 10
+
+def test_compressed_episodes_go_to_archive(tmp_path):
+    from echo_lifesim.memory import MemoryIndex
+    state = PersonaState(max_episode_history=5, archive_path=str(tmp_path / "ep.archive"))
+    state.add_episode(Episode(actor="user", text="erster urlaub am meer"))
+    for i in range(10):
+        state.add_episode(Episode(actor="user", text=f"alltag {i}"))
+    state.advance_epoch()
+    assert len(state.episodes) == 5
+    assert len(state.archive) == 6
+    hits = MemoryIndex(state).retrieve("urlaub meer", k=2)
+    assert hits[0].text == "erster urlaub am meer"
+    # reopening sees the same archive
+    again = PersonaState(archive_path=state.archive_path)
+    assert again.archive.get(0)["text"] == "erster urlaub am meer"
+
+def test_archive_search_uses_postings_file_and_survives_torn_append(tmp_path):
+    from echo_lifesim.archive import EpisodeArchive
+    path = tmp_path / "ep.archive"
+    arch = EpisodeArchive(path)
+    arch.append_many([{"text": "urlaub am meer"}, {"text": "meer meer wellen"}, {"text": "alltag"}])
+    assert arch.search(["meer", "urlaub"]) == {0: 2, 1: 1}
+    with path.open("ab") as f:
+        f.write(b'{"text": "halb geschri')  # torn append after the last committed record
+    again = EpisodeArchive(path)
+    assert again.get(2) == {"text": "alltag"}
+    arch.tok_path.unlink()  # archive from before the postings file: tokenized on first use
+    assert EpisodeArchive(path).search(["wellen", "wellen"]) == {1: 2}
+
+def test_archive_postings_stay_sorted_across_batches_and_interrupted_appends(tmp_path):
+    from echo_lifesim.archive import EpisodeArchive
+    path = tmp_path / "ep.archive"
+    arch = EpisodeArchive(path)
+    texts = []
+    for batch in range(12):
+        recs = [{"text": f"thema{(batch * 7 + i) % 5} tag{batch}"} for i in range(batch % 4)]
+        arch.append_many(recs)
+        texts += [r["text"] for r in recs]
+    assert len(arch._segments) < 6
+    hits = {i: ("thema2" in t.split()) + ("tag3" in t.split()) for i, t in enumerate(texts)}
+    assert arch.search(["thema2", "tag3"]) == {i: n for i, n in hits.items() if n}
+    arch.append_many([{"text": "verloren im absturz"}])
+    arch.close()
+    idx = path.with_name("ep.archive.idx")
+    idx.write_bytes(idx.read_bytes()[:-8])  # the index entry never made it to disk
+    again = EpisodeArchive(path)
+    assert again.search(["verloren"]) == {}
+    again.append_many([{"text": "danach neu"}])
+    assert again.search(["neu", "danach"]) == {len(texts): 2} and again.get(len(texts))["text"] == "danach neu"
+
+def test_evicted_episodes_roll_up_into_summaries():
+    from echo_lifesim.memory import MemoryIndex
+    state = PersonaState(max_episode_history=4, rollup_day_epochs=1)
+    for day in range(3):
+        state.day_counter = day
+        for i in range(4):
+            state.add_episode(Episode(actor="user", text=f"garten giessen tomaten {i}", topic_id="health"))
+        state.add_episode(Episode(actor="user", text="projekt deadline", topic_id="work"))
+    state.advance_epoch()
+    days = [sm for sm in state.summaries if sm.level == "day"]
+    assert {sm.day for sm in days if sm.topic_id == "health"} == {0, 1, 2}
+    assert sum(sm.count for sm in state.summaries) == 11
+    state.advance_epoch()  # day records fold into epoch records; epoch 2 reaches phase_2 -> phase level
+    assert state.life_phase == "phase_2"
+    assert [sm.level for sm in state.summaries] == ["phase", "phase"]
+    found = MemoryIndex(state).retrieve_summaries("tomaten", k=1)
+    assert found and found[0].topic_id == "health" and "tomaten" in found[0].top_tokens()
+
+def test_bounded_buffers_trim_and_spill(tmp_path):
+    from echo_lifesim.models import Thought
+    from echo_lifesim.spill import SpillLog
+    state = PersonaState(
+        max_thoughts=10, max_notes=4, max_live_episodes=20, history_slack=0.5,
+        spill_path=str(tmp_path / "spill.jsonl"), archive_path=str(tmp_path / "ep.archive"),
+    )
+    for i in range(40):
+        state.maybe_add_thought(f"gedanke nummer {i} " + "x" * i)
+        state.add_note(f"notiz {i}")
+        state.add_episode(Episode(actor="user", text=f"eintrag {i} " + "y" * i))
+    assert 10 <= len(state.thoughts) <= 15 and 4 <= len(state.notes) <= 6
+    assert 20 <= len(state.episodes) <= 30
+    assert state.episode_base + len(state.episodes) == 40
+    assert state.episode_by_id(39).text.startswith("eintrag 39")
+    assert len(state.archive) == state.episode_base
+    assert sum(sm.count for sm in state.summaries) == state.episode_base
+    log = SpillLog(state.spill_path)
+    spilled = [Thought.model_validate(r) for r in log.read("thoughts")]
+    assert [t.text for t in spilled + state.thoughts] == [f"gedanke nummer {i} " + "x" * i for i in range(40)]
+    assert len(list(log.read("notes"))) + len(state.notes) == 40
+    fork = state.fork()
+    for i in range(20):
+        fork.maybe_add_thought(f"fork {i} " + "z" * i)
+    assert len(state.thoughts) <= 15 and fork.spill is None
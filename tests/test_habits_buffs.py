@@ -1,5 +1,7 @@
+import pytest
+from pydantic import ValidationError
 from echo_lifesim.engine import LifeSimEngine
-from echo_lifesim.models import PersonaState
+from echo_lifesim.models import NEED_KEYS, NeedState, PersonaState
 
 def test_habit_and_buff_application():
     eng = LifeSimEngine(PersonaState())
@@ -24,3 +26,37 @@ def test_habit_and_buff_application():
     assert after_second >= after_first, "Buff passive effect should not reduce combined clarity+order"
     # Habit counter increments
     assert len(eng.state.habit_counts) >= 1
+
+def test_need_state_slots_keep_model_api():
+    needs = NeedState(energy=98, calm="3")
+    needs.apply_delta(energy=5, calm=-10, unknown=7)
+    assert (needs.energy, needs.calm) == (100, 0)
+    needs.apply_vector([-200, 10, 0, 0, 0, 60])
+    needs.decay_towards_mid(5)
+    assert needs.vector() == [5, 55, 50, 50, 50, 55]
+    assert list(needs.model_dump()) == NEED_KEYS
+    state = PersonaState(needs={"clarity": 12})
+    assert state.needs.clarity == 12 and PersonaState.model_validate(state.model_dump()).needs == state.needs
+    fork = state.fork()
+    fork.needs.clarity = 99
+    assert state.needs.clarity == 12
+    with pytest.raises(ValidationError):
+        PersonaState(needs={"energy": "viel"})
+
+def test_rankings_match_full_sort():
+    import random
+    rng = random.Random(7)
+    state = PersonaState(habit_counts={"alt": 3}, preferences=[{"key": "ruhig", "weight": 2.9}])
+    for _ in range(500):
+        state.record_habit(f"Aktion {rng.randrange(60)} ")
+        state.upsert_preference(f"p{rng.randrange(25)}", delta=rng.choice([0.2, 0.5]))
+    expected = [k for k, _ in sorted(state.habit_counts.items(), key=lambda kv: kv[1], reverse=True)[:7]]
+    assert state.top_habits(7) == expected
+    by_weight = [p.key for p in sorted(state.preferences, key=lambda p: p.weight, reverse=True)[:6]]
+    assert state.top_preferences(6) == by_weight and len({p.key for p in state.preferences}) == len(state.preferences)
+    fork = state.fork()
+    for _ in range(50):
+        fork.record_habit("nur im fork")
+    assert fork.top_habits(1) == ["nur im fork"] and "nur im fork" not in state.top_habits(100)
+    state.habit_counts = {"neu": 1, "neuer": 2}
+    assert state.top_habits() == ["neuer", "neu"]
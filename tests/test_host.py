@@ -0,0 +1,65 @@
+import asyncio
+from echo_lifesim.host import PersonaHost
+
+def test_host_serializes_per_persona_and_evicts_lru(tmp_path):
+    async def run():
+        host = PersonaHost(tmp_path, max_resident=2)
+        active = set()
+        overlaps = []
+
+        async def slow_job(engine, pid):
+            if pid in active:
+                overlaps.append(pid)
+            active.add(pid)
+            await asyncio.sleep(0.01)
+            active.discard(pid)
+            engine.state.turn += 1
+
+        jobs = [host.call(f"p{i % 4}", lambda e, pid=f"p{i % 4}": slow_job(e, pid)) for i in range(20)]
+        await asyncio.gather(*jobs)
+        assert overlaps == []
+        assert len(host) <= 2 and host.evictions >= 2
+        reply = await host.reply("p0", "hallo arbeit")
+        assert reply["actions"]
+        await host.close()
+        return host
+
+    host = asyncio.run(run())
+    assert len(host) == 0 and host.resident_bytes == 0
+    from echo_lifesim.persistence import load_state
+    turns = {p.stem: load_state(p).turn for p in tmp_path.glob("*.json")}
+    assert turns == {"p0": 6, "p1": 5, "p2": 5, "p3": 5}
+
+def test_host_reply_enriches_off_the_mailbox_and_pins_until_edit_lands(tmp_path, monkeypatch):
+    import echo_lifesim.engine as engine_mod
+    from echo_lifesim.persistence import load_state
+    gate = asyncio.Event()
+
+    class SlowClient:
+        def available(self):
+            return True
+        async def chat(self, system, user):
+            await gate.wait()
+            return "angereichert: " + user.splitlines()[0]
+
+    def blocking():
+        raise AssertionError("blocking LLM client used on the event loop")
+
+    monkeypatch.setattr(engine_mod, "get_async_groq", lambda: SlowClient())
+    monkeypatch.setattr(engine_mod, "get_groq", blocking)
+
+    async def run():
+        host = PersonaHost(tmp_path, max_resident=1)
+        first = await host.reply("p0", "hallo")
+        await host.reply("p1", "zweiter")  # p0 would be evicted, but its enrichment is pending
+        assert "p0" in host and first["enriched"] is not None and not first["enriched"].done()
+        await host.call("p1", lambda e: e.state.turn)  # other personas keep being served
+        gate.set()
+        await first["enriched"]
+        await asyncio.sleep(0)
+        assert "p0" not in host
+        await host.close()
+
+    asyncio.run(run())
+    texts = [ep.text for ep in load_state(tmp_path / "p0.json").episodes if ep.actor == "persona"]
+    assert texts == ["angereichert: User: hallo"]
@@ -0,0 +1,104 @@
+from echo_lifesim.models import PersonaState, Episode
+from echo_lifesim.memory import MemoryIndex
+
+def test_retrieve_finds_old_episode():
+    state = PersonaState()
+    state.add_episode(Episode(actor="user", text="Gitarre üben am Abend"))
+    for i in range(300):
+        state.add_episode(Episode(actor="user", text=f"filler {i}"))
+    hits = MemoryIndex(state).retrieve("wann gitarre?", k=3)
+    assert hits[0].text.startswith("Gitarre")
+
+def test_index_pruned_on_epoch_compression():
+    state = PersonaState(max_episode_history=5)
+    state.add_episode(Episode(actor="user", text="alte notiz kaffee"))
+    for i in range(10):
+        state.add_episode(Episode(actor="user", text=f"neu {i}"))
+    state.advance_epoch()
+    assert state.episode_base == 6
+    assert state.match_tokens(["kaffee"]) == {}
+    assert all("kaffee" not in ep.text for ep in MemoryIndex(state).retrieve("kaffee", k=5))
+
+def test_retrieve_many_matches_single_queries():
+    state = PersonaState(max_episode_history=50)
+    for i in range(120):
+        topic = ["arbeit projekt", "freund treffen", "sport laufen"][i % 3]
+        state.add_episode(Episode(actor="user", text=f"{topic} {i}", ts=1000.0 + i * 60))
+    state.advance_epoch()
+    mem = MemoryIndex(state)
+    queries = ["projekt stress", "laufen im park", "nichts passendes"]
+    batch = mem.retrieve_many(queries, k=4)
+    assert [[ep.text for ep in r] for r in batch] == [[ep.text for ep in mem.retrieve(q, k=4)] for q in queries]
+    assert all("laufen" in ep.text for ep in batch[1])
+
+def test_retrieval_cache_hits_and_invalidates():
+    state = PersonaState(max_episode_history=3)
+    mem = MemoryIndex(state, cache_size=2)
+    for i in range(5):
+        state.add_episode(Episode(actor="user", text=f"kaffee runde {i}"))
+    first = mem.retrieve("Kaffee?", k=2)
+    assert mem.retrieve("kaffee", k=2) == first
+    assert mem.cache.hits == 1
+    state.add_episode(Episode(actor="user", text="kaffee neu"))
+    assert mem.retrieve("kaffee", k=2)[0].text == "kaffee neu"
+    state.advance_epoch()
+    assert all(ep in state.episodes for ep in mem.retrieve("kaffee", k=5))
+    mem.retrieve("runde", k=2)
+    assert mem.cache.stats()["evictions"] >= 1
+
+def test_semantic_mode_tolerates_spelling_variants():
+    state = PersonaState()
+    state.add_episode(Episode(actor="user", text="Ich war total erschöpft nach dem Training"))
+    for i in range(200):
+        state.add_episode(Episode(actor="user", text=f"kalender eintrag nummer {i}"))
+    mem = MemoryIndex(state)
+    assert all("erschöpft" not in ep.text for ep in mem.retrieve("erschoepfung", k=3, mode="lexical"))
+    assert "erschöpft" in mem.retrieve("erschoepfung", k=1, mode="semantic")[0].text
+    assert "erschöpft" in mem.retrieve("erschoepfung training", k=1, mode="hybrid")[0].text
+
+def test_semantic_lsh_finds_near_copy():
+    from echo_lifesim.semantic import SemanticIndex
+    state = PersonaState(max_episode_history=300)
+    for i in range(400):
+        state.add_episode(Episode(actor="user", text=f"notiz {i} über thema {i * 7919 % 997}"))
+    state.advance_epoch()
+    sem = SemanticIndex(exact_below=0)
+    sem.sync(state)
+    assert len(sem) == 300
+    best_id, sim = sem.query(state.episodes[-1].text + "!", k=1)[0]
+    assert best_id == state.episode_base + 299 and sim > 0.99
+
+def test_edit_log_is_bounded_and_indexes_resync_past_it():
+    from echo_lifesim.models import EDIT_LOG_SIZE
+    from echo_lifesim.semantic import SemanticIndex
+    state = PersonaState()
+    for i in range(10):
+        state.add_episode(Episode(actor="user", text=f"notiz {i}"))
+    sem = SemanticIndex(exact_below=0)
+    sem.sync(state)
+    state.replace_episode_text(3, "gitarre am abend")
+    assert state.edits_since(0) == [3]
+    for i in range(EDIT_LOG_SIZE + 5):
+        state.replace_episode_text(i % 10, f"geändert {i}")
+    state.replace_episode_text(7, "kochen mit freunden")
+    assert state.edits_since(0) is None and len(state.edits_since(state.edit_count - 2)) == 2
+    sem.sync(state)
+    assert sem.query("kochen mit freunden", k=1)[0][0] == 7
+
+def test_last_episodes_by_actor_topic_tag_survive_pruning():
+    state = PersonaState(max_episode_history=50)
+    for i in range(120):
+        actor = "user" if i % 3 else "persona"
+        state.add_episode(Episode(actor=actor, text=f"eintrag {i}", topic_id="work" if i % 2 else "main", tags=["x"] if i % 5 == 0 else []))
+    state.advance_epoch()
+
+    def scan(n, **f):
+        out = [ep for ep in reversed(state.episodes)
+               if ep.actor == f.get("actor", ep.actor) and ep.topic_id == f.get("topic", ep.topic_id)
+               and (f.get("tag") is None or f["tag"] in ep.tags)]
+        return out[:n]
+
+    for filters in ({"actor": "user"}, {"topic": "work"}, {"tag": "x"}, {"actor": "persona", "topic": "main"}, {}):
+        for n in (0, 1, 4, 100):
+            assert state.last_episodes(n, **filters) == scan(n, **filters)
+    assert state.last_episodes(3, actor="nobody") == []
@@ -29,4 +29,45 @@ def test_ticker_generates_thoughts():
     eng.persona_reply("eins")
     time.sleep(0.02)
     eng.persona_reply("zwei")
-    assert len(eng.state.thoughts) >= 1
\ No newline at end of file
+    assert len(eng.state.thoughts) >= 1
+
+def test_near_duplicate_system_episodes_and_thoughts_collapse():
+    from echo_lifesim.models import Episode
+    state = PersonaState()
+    eng = LifeSimEngine(state)
+    for i in range(6):
+        eng.persona_reply(f"gleiche frage {i}")
+    overmind = [ep for ep in state.episodes if ep.text.startswith("overmind")]
+    assert len(overmind) == 1 and overmind[0].repeat == 6
+    assert overmind[0].last_ts is not None and overmind[0].last_ts >= overmind[0].ts
+    before = len(state.thoughts)
+    for _ in range(4):
+        state.maybe_add_thought("Fokus: gleiche frage | weiter")
+    assert len(state.thoughts) == before + 1 and state.thoughts[-1].repeat == 4
+    state.add_episode(Episode(actor="system", text="achievement_unlocked xp_50", tags=["achievement"]))
+    assert state.episodes[-1].text == "achievement_unlocked xp_50"
+
+def test_collapsed_records_keep_latest_values():
+    from echo_lifesim.models import Episode
+    state = PersonaState()
+    for xp in (100, 200, 300):
+        state.add_episode(Episode(actor="system", text=f"skill_mastery_up web_research_3_2_1 {xp}"))
+    state.maybe_add_thought("overmind {interval: 7750}")
+    state.maybe_add_thought("overmind {interval: 8000}")
+    last = state.episodes[-1]
+    assert last.repeat == 3 and last.text.endswith(" 300")
+    assert state.match_tokens(["300"]) == {state.episode_base + len(state.episodes) - 1: 1}
+    assert state.match_tokens(["100"]) == {}
+    assert state.thoughts[-1].repeat == 2 and "8000" in state.thoughts[-1].text
+
+def test_reloaded_state_keeps_dedupe_window_with_interleaved_actors():
+    from echo_lifesim.models import Episode
+    live = PersonaState()
+    live.add_episode(Episode(actor="system", text="overmind {interval: 7750}"))
+    for i in range(10):
+        live.add_episode(Episode(actor="user" if i % 2 else "persona", text=f"gespräch runde {i}"))
+    reloaded = PersonaState.model_validate(live.model_dump())
+    for state in (live, reloaded):
+        state.add_episode(Episode(actor="system", text="overmind {interval: 8000}", ts=live.episodes[-1].ts + 1))
+    assert len(live.episodes) == len(reloaded.episodes) == 11
+    assert reloaded.model_dump() == live.model_dump()
@@ -0,0 +1,68 @@
+from echo_lifesim.engine import LifeSimEngine
+from echo_lifesim.models import Episode, PersonaState
+from echo_lifesim.planner import LookaheadPlanner
+
+def test_fork_shares_history_until_write_and_never_leaks_back():
+    eng = LifeSimEngine(PersonaState())
+    for i in range(20):
+        eng.persona_reply(f"runde {i} arbeit")
+    parent = eng.state
+    before = parent.model_dump()
+    fork = parent.fork()
+    assert fork.episodes.reads_from(parent.episodes) and fork.thoughts is parent.thoughts
+    sim = LifeSimEngine(fork)
+    for _ in range(6):
+        sim.apply_action_result("2-Min atemfokus")
+    sim.persona_reply("freund treffen")
+    assert fork.episodes.reads_from(parent.episodes)  # appends go to the fork's tail
+    assert [e.text for e in fork.episodes][: len(parent.episodes)] == [e.text for e in parent.episodes]
+    fork.add_artifact("nur im fork")
+    fork.replace_episode_text(fork.episode_base, "geändert im fork")
+    assert not fork.episodes.reads_from(parent.episodes)
+    assert parent.model_dump() == before
+    assert fork.last_episodes(1, actor="user")[0].text == "freund treffen"
+    assert fork.match_tokens(["geändert"]) == {fork.episode_base: 1}
+    assert parent.match_tokens(["geändert"]) == {}
+
+def test_parent_collapse_and_world_edits_stay_out_of_live_fork():
+    from echo_lifesim.models import WorldEntity
+    parent = PersonaState()
+    parent.world.add_entity(WorldEntity(id="park", name="Park", attrs={"besucht": 1}))
+    parent.maybe_add_thought("Fokus: projekt 1")
+    fork = parent.fork()
+    parent.maybe_add_thought("Fokus: projekt 2")
+    parent.world.entities[0].attrs["besucht"] = 2
+    parent.world.add_entity(WorldEntity(id="see", name="See"))
+    assert (parent.thoughts[-1].text, parent.thoughts[-1].repeat) == ("Fokus: projekt 2", 2)
+    assert (fork.thoughts[-1].text, fork.thoughts[-1].repeat) == ("Fokus: projekt 1", 1)
+    assert [e.id for e in fork.world.entities] == ["park"] and fork.world.entities[0].attrs == {"besucht": 1}
+    parent.maybe_add_thought("Fokus: projekt 3")  # window follows the swapped-in copy
+    assert len(parent.thoughts) == 1 and parent.thoughts[-1].repeat == 3
+
+def test_parent_edits_copy_the_store_under_a_live_fork_but_appends_do_not():
+    parent = PersonaState()
+    for i in range(5):
+        parent.add_episode(Episode(actor="persona", text=f"eintrag {i}", importance=0.2))
+    fork = parent.fork()
+    grandchild = fork.fork()
+    fork.add_episode(Episode(actor="persona", text="nur im fork", importance=0.9))
+    store = parent.episodes
+    parent.add_episode(Episode(actor="persona", text="nur im parent", importance=0.2))
+    assert parent.episodes is store
+    parent.replace_episode_text(parent.episode_base, "neu im parent")
+    assert parent.episodes is not store
+    assert [e.text for e in fork.episodes] == [f"eintrag {i}" for i in range(5)] + ["nur im fork"]
+    assert [e.text for e in grandchild.episodes] == [f"eintrag {i}" for i in range(5)]
+    assert fork.episodes.ts_slice(3, 6).tolist() == [e.ts for e in fork.episodes[3:6]]
+    assert PersonaState.model_validate_json(fork.model_dump_json()).episodes == fork.episodes
+    fork.episodes.drop_front(2)
+    assert [e.text for e in fork.episodes] == [f"eintrag {i}" for i in range(2, 5)] + ["nur im fork"]
+
+def test_planner_prefers_action_that_closes_the_gap():
+    state = PersonaState()
+    state.needs.connection = 10
+    plans = LookaheadPlanner(depth=3, budget_ms=1000).plan(
+        state, [("10-Min ordnungsecke", "10-Min"), ("nachricht an freund", "2-Min")])
+    assert [p["label"] for p in plans] == ["nachricht an freund", "10-Min ordnungsecke"]
+    assert all(p["depth"] == 3 for p in plans)
+    assert state.needs.connection == 10 and state.turn == 0 and not state.episodes
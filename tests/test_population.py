@@ -0,0 +1,43 @@
+import random
+import numpy as np
+from echo_lifesim.engine import LifeSimEngine
+from echo_lifesim.models import PersonaState, Item, NEED_KEYS, TIME_BLOCKS
+from echo_lifesim.population import Population
+
+def _random_state(rng):
+    s = PersonaState()
+    for k in NEED_KEYS:
+        setattr(s.needs, k, rng.randint(0, 100))
+    s.time_block = rng.choice(TIME_BLOCKS)
+    if rng.random() < 0.5:
+        s.buffs["klarer_kopf"] = rng.randint(1, 4)
+    if rng.random() < 0.3:
+        s.debuffs["überreizt"] = rng.randint(1, 6)
+    for _ in range(rng.randint(0, 2)):
+        s.items.append(Item(
+            name="ding",
+            passive_need_delta={rng.choice(NEED_KEYS): rng.randint(-9, 9)},
+            effect_buffs={"ordnung_plus": rng.randint(0, 3)} if rng.random() < 0.5 else {},
+        ))
+    return s
+
+def test_population_kernel_matches_scalar_semantics():
+    rng = random.Random(3)
+    states = [_random_state(rng) for _ in range(60)]
+    pop = Population.from_states(states)
+    engines = [LifeSimEngine(s) for s in states]
+    for turn in range(40):
+        deltas = np.array([[rng.randint(-15, 15) for _ in NEED_KEYS] for _ in states])
+        for eng, d in zip(engines, deltas):
+            eng.state.needs.apply_delta(**dict(zip(NEED_KEYS, map(int, d))))
+            eng.state.advance_time()
+            eng._apply_status_effects()
+        pop.step(deltas)
+        for i, s in enumerate(states):
+            assert pop.export(i) == {
+                "needs": s.needs.model_dump(),
+                "time_block": s.time_block,
+                "day_counter": s.day_counter,
+                "buffs": s.buffs,
+                "debuffs": s.debuffs,
+            }, (turn, i)
@@ -0,0 +1,38 @@
+import itertools
+from echo_lifesim.engine import LifeSimEngine
+from echo_lifesim.models import PersonaState
+from echo_lifesim.replay import SessionRecorder, replay, state_digest
+
+def test_recorded_session_replays_to_identical_state(tmp_path, monkeypatch):
+    state = PersonaState(max_episode_history=20, archive_path=str(tmp_path / "arch.jsonl"))
+    state.thought_interval_ms = 1
+    eng = LifeSimEngine(state)
+    trace = tmp_path / "trace.jsonl"
+    llm = itertools.cycle(["angereichert eins", None])
+    monkeypatch.setattr(eng, "_enrich", lambda u, r: next(llm))  # stand-in for the LLM
+    with SessionRecorder(eng, trace, seed=42):
+        for i in range(30):
+            r = eng.persona_reply(f"runde {i} arbeit fokus", event_key="regen" if i % 7 == 0 else None)
+            if i % 3:
+                eng.apply_action_result(r["actions"][0][0])
+            else:
+                eng.reject_action()
+            eng.autonomous_tick()
+            if i % 10 == 9:
+                eng.advance_epoch()
+    expected = state_digest(eng.state)
+    report = replay(trace)
+    assert report["calls"] == 30 * 3 + 3
+    assert report["identical"] and report["expected"] == expected
+    assert report["clock_drift"] == 0
+    assert set(report["latency_ms"]) == {"persona_reply", "apply_action_result", "reject_action", "autonomous_tick", "advance_epoch"}
+    assert report["latency_ms"]["persona_reply"]["n"] == 30
+    assert any(ep.text == "angereichert eins" for ep in eng.state.episodes)
+
+def test_traces_from_older_state_format_are_rejected(tmp_path):
+    import orjson
+    import pytest
+    path = tmp_path / "old.jsonl"
+    path.write_bytes(orjson.dumps({"trace": 1, "seed": 1, "state": {}}) + b"\n")
+    with pytest.raises(ValueError, match="record the session again"):
+        replay(path)
@@ -0,0 +1,73 @@
+import threading
+import time
+
+from echo_lifesim.engine import LifeSimEngine
+from echo_lifesim.models import PersonaState
+from echo_lifesim.scheduler import EngineJobs, Scheduler, Timer, TimerWheel
+
+
+def test_timer_wheel_fires_on_exact_tick_across_rotations():
+    wheel = TimerWheel(slots=8)
+    fired = {}
+    timers = {d: Timer(lambda: None, None) for d in (1, 7, 8, 9, 30)}
+    for d, t in timers.items():
+        wheel.add(t, d)
+    cancelled = Timer(lambda: None, None)
+    wheel.add(cancelled, 5)
+    cancelled.cancelled = True
+    for tick in range(1, 40):
+        for t in wheel.advance():
+            fired[next(d for d, x in timers.items() if x is t)] = tick
+    assert fired == {1: 1, 7: 7, 8: 8, 9: 9, 30: 30}
+    assert wheel.size == 0
+
+def test_scheduler_drives_engine_jobs_and_overmind_reschedules_thoughts():
+    sched = Scheduler(tick_ms=5).start()
+    try:
+        done = threading.Event()
+        t0 = time.monotonic()
+        sched.call_later(30, done.set)
+        assert done.wait(1.0) and time.monotonic() - t0 >= 0.03
+
+        state = PersonaState()
+        state.thought_interval_ms = 10_000
+        eng = LifeSimEngine(state)
+        eng.persona_reply("bin müde")
+        jobs = EngineJobs(sched, eng, tick_ms=None, dream_ms=None)
+        before = jobs.timers["thought"]
+        eng.on_thought_interval(20)  # what overmind_step does when it changes the interval
+        assert before.cancelled and jobs.timers["thought"] is not before
+        deadline = time.monotonic() + 1.0
+        while not state.thoughts and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert state.thoughts and state.thoughts[0].text.startswith("Fokus")
+        jobs.detach()
+        assert eng.on_thought_interval is None
+    finally:
+        sched.stop()
+    assert sched.errors == 0
+
+def test_failing_jobs_are_recorded_not_printed(tmp_path, capsys):
+    sched = Scheduler(tick_ms=5)
+    sched.start()
+    try:
+        jobs = EngineJobs(sched, LifeSimEngine(PersonaState()), tick_ms=None, dream_ms=None,
+                          autosave_path=tmp_path, autosave_ms=10)  # a directory: saving fails
+        deadline = time.monotonic() + 1.0
+        while not jobs.failures and time.monotonic() < deadline:
+            time.sleep(0.005)
+        jobs.detach()
+    finally:
+        sched.stop()
+    assert jobs.failures.get("autosave", 0) >= 1 and jobs.last_error.startswith("autosave: ")
+    assert sched.errors >= 1 and sched.last_error is not None
+    assert capsys.readouterr().err == ""
+
+def test_overmind_step_reports_interval_changes():
+    eng = LifeSimEngine(PersonaState())
+    seen = []
+    eng.on_thought_interval = seen.append
+    eng.state.needs.clarity = 20
+    eng.overmind_step()
+    eng.overmind_step()
+    assert seen == [7500, 7000]